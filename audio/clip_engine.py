@@ -0,0 +1,197 @@
+# audio/clip_engine.py
+#
+# Game clips cut on demand from full tracks, so every song in songs.db
+# with a source MP3 and stored spectrograms is playable without a folder
+# of pre-cut clips under GAME_SONGS_DIR.
+#
+# Offsets are chosen from the clean spectrograms written by
+# audio.audio_processor.process_audio: each frame is scored by loudness
+# plus spectral flux (onsets, changes), and the best-scoring windows of
+# the clip length are kept as candidates.  Encoded clips share the
+# ClipCache budget with file-based clips.
+
+import os
+import glob
+import ntpath
+import random
+import threading
+import base64
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from pydub import AudioSegment
+
+from audio.clip_transcoder import encode_clip
+from game.clip_cache import get_clip_cache
+from settings import (
+    AUDIO_FOLDER_PATH, SPECTROGRAM_DIR, CLIP_SECONDS, CLIP_ENGINE_CANDIDATES
+)
+
+# Must match audio.audio_processor (not imported: it pulls in torch)
+SAMPLE_RATE = 22050
+HOP_LENGTH = 512
+SEGMENT_SECONDS = 5.0      # process_audio segment_length
+SEGMENT_HOP_SECONDS = 2.5  # segment_length * (1 - overlap)
+FRAME_SECONDS = HOP_LENGTH / SAMPLE_RATE
+
+
+def _part_index(path: str) -> int:
+    # ".../part12_clean.npy" -> 12
+    return int(os.path.basename(path)[4:].split("_", 1)[0])
+
+
+def frame_scores(spec_dir: str) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    (start time in seconds, score) for every spectrogram frame of a track.
+
+    Parts overlap by half and are Hann-windowed, so only the centre half
+    of each part is used; those centres tile the track end to end.
+    Score = z(mean dB) + z(positive spectral flux).
+    """
+    parts = sorted(glob.glob(os.path.join(spec_dir, "part*_clean.npy")), key=_part_index)
+    times, energy, flux = [], [], []
+    for path in parts:
+        spec = np.load(path, mmap_mode="r")
+        n = spec.shape[1]
+        lo, hi = n // 4, n - n // 4
+        centre = np.asarray(spec[:, lo:hi], dtype=np.float32)
+        start = (_part_index(path) - 1) * SEGMENT_HOP_SECONDS
+        times.append(start + (lo + np.arange(centre.shape[1])) * FRAME_SECONDS)
+        energy.append(centre.mean(axis=0))
+        diff = np.diff(centre, axis=1, prepend=centre[:, :1])
+        flux.append(np.maximum(diff, 0.0).mean(axis=0))
+    if not parts:
+        return np.zeros(0), np.zeros(0)
+
+    def z(x: np.ndarray) -> np.ndarray:
+        std = x.std()
+        return (x - x.mean()) / std if std > 0 else np.zeros_like(x)
+
+    return np.concatenate(times), z(np.concatenate(energy)) + z(np.concatenate(flux))
+
+
+def best_offsets(times: np.ndarray, scores: np.ndarray,
+                 clip_seconds: float, count: int) -> List[float]:
+    """
+    Start times of the `count` best non-overlapping windows of
+    `clip_seconds`, ranked by summed frame score.
+    """
+    if len(scores) == 0:
+        return []
+    width = max(1, int(round(clip_seconds / FRAME_SECONDS)))
+    if len(scores) <= width:
+        return [float(times[0])]
+    window = np.convolve(scores, np.ones(width), mode="valid")
+    chosen: List[int] = []
+    for i in np.argsort(window)[::-1]:
+        if all(abs(i - j) >= width for j in chosen):
+            chosen.append(int(i))
+            if len(chosen) == count:
+                break
+    return [round(float(times[i]), 2) for i in chosen]
+
+
+class ClipEngine:
+    """
+    Picks and cuts game clips from full tracks:
+      - sources(song)  -> (spectrogram dir, source MP3) or None
+      - offsets(song)  -> cached candidate start times
+      - get_clip_b64() -> base64 MP3 clip, cached in the ClipCache
+
+    Songs are looked up in `songs_db` (anything with get_song_by_name).
+    """
+
+    def __init__(self, songs_db, audio_dir: str = AUDIO_FOLDER_PATH,
+                 spectrogram_dir: Optional[str] = SPECTROGRAM_DIR,
+                 clip_seconds: float = CLIP_SECONDS,
+                 candidates: int = CLIP_ENGINE_CANDIDATES):
+        self.songs_db = songs_db
+        self.audio_dir = audio_dir
+        self.spectrogram_dir = spectrogram_dir
+        self.clip_seconds = clip_seconds
+        self.candidates = candidates
+        self._lock = threading.Lock()
+        self._offsets: Dict[Tuple[str, float], List[float]] = {}
+
+    def _spec_dir(self, stored: str) -> Optional[str]:
+        # songs.db may hold paths from the machine that built it
+        if os.path.isdir(stored):
+            return stored
+        if self.spectrogram_dir:
+            local = os.path.join(self.spectrogram_dir, ntpath.basename(stored))
+            if os.path.isdir(local):
+                return local
+        return None
+
+    def sources(self, song_name: str) -> Optional[Tuple[str, str]]:
+        """(spectrogram dir, source MP3) for a song, or None if either is missing."""
+        row = self.songs_db.get_song_by_name(song_name)
+        if not row or not row["spectrograms"]:
+            return None
+        spec_dir = self._spec_dir(row["spectrograms"])
+        if spec_dir is None:
+            return None
+        # process_audio names the folder after the downloaded file's stem
+        stem = ntpath.basename(spec_dir)[:-len(".spectrograms")]
+        audio_path = os.path.join(self.audio_dir, stem + ".mp3")
+        if not os.path.isfile(audio_path):
+            return None
+        return spec_dir, audio_path
+
+    def can_play(self, song_name: str) -> bool:
+        return self.sources(song_name) is not None
+
+    def offsets(self, song_name: str, clip_seconds: Optional[float] = None) -> List[float]:
+        """Candidate clip start times (seconds), best first; computed once per song."""
+        clip_seconds = clip_seconds or self.clip_seconds
+        key = (song_name, clip_seconds)
+        with self._lock:
+            cached = self._offsets.get(key)
+        if cached is not None:
+            return cached
+
+        src = self.sources(song_name)
+        if src is None:
+            raise FileNotFoundError(f"No source audio/spectrograms for '{song_name}'")
+        times, scores = frame_scores(src[0])
+        found = best_offsets(times, scores, clip_seconds, self.candidates) or [0.0]
+        with self._lock:
+            self._offsets[key] = found
+        return found
+
+    def cut(self, song_name: str, offset: float, clip_seconds: float) -> bytes:
+        """Decode only the needed span of the source and encode it as a game clip."""
+        _, audio_path = self.sources(song_name)
+        audio = AudioSegment.from_file(audio_path, start_second=offset, duration=clip_seconds)
+        return encode_clip(audio)
+
+    def get_clip_b64(self, song_name: str, clip_seconds: Optional[float] = None,
+                     offset: Optional[float] = None) -> str:
+        """
+        Base64 MP3 clip of `song_name`.
+        1) Offset: the given one, else a random pick among the best candidates
+        2) Served from the ClipCache, cutting it from the source on a miss
+        """
+        clip_seconds = clip_seconds or self.clip_seconds
+        if offset is None:
+            offset = random.choice(self.offsets(song_name, clip_seconds))
+        key = ("engine", song_name, offset, clip_seconds)
+        return get_clip_cache().get_or_build(
+            key,
+            lambda: base64.b64encode(self.cut(song_name, offset, clip_seconds)).decode("utf-8"),
+        )
+
+
+# Process-wide engine, created on first use
+_clip_engine: Optional[ClipEngine] = None
+_clip_engine_lock = threading.Lock()
+
+
+def get_clip_engine() -> ClipEngine:
+    global _clip_engine
+    if _clip_engine is None:
+        with _clip_engine_lock:
+            if _clip_engine is None:
+                from database.song_catalogue import get_song_catalogue
+                _clip_engine = ClipEngine(get_song_catalogue())
+    return _clip_engine
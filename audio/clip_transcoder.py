@@ -0,0 +1,110 @@
+# audio/clip_transcoder.py
+#
+# Ingest step for game clips: re-encodes every clip under GAME_SONGS_DIR
+# to one compact, consistent format (mono, CLIP_SAMPLE_RATE, CLIP_BITRATE
+# MP3, loudness-normalised) into the same folder layout under
+# GAME_CLIPS_DIR.  The clip catalogue prefers these copies when present.
+#
+#   python -m audio.clip_transcoder [--overwrite]
+
+import io
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Tuple
+
+from pydub import AudioSegment
+
+from settings import (
+    GAME_SONGS_DIR, GAME_CLIPS_DIR, CLIP_BITRATE, CLIP_SAMPLE_RATE, CLIP_TARGET_DBFS
+)
+
+CLIP_EXTENSIONS = (".mp3", ".wav")
+PEAK_CEILING_DBFS = -1.0  # headroom left after loudness gain
+
+
+def transcoded_path(src_path: str) -> str:
+    """GAME_SONGS_DIR/<song>/<clip>.wav -> GAME_CLIPS_DIR/<song>/<clip>.mp3"""
+    song = os.path.basename(os.path.dirname(src_path))
+    name = os.path.splitext(os.path.basename(src_path))[0]
+    return os.path.join(GAME_CLIPS_DIR, song, name + ".mp3")
+
+
+def is_transcoded(src_path: str) -> bool:
+    """True if an up-to-date transcoded copy of `src_path` exists."""
+    dest = transcoded_path(src_path)
+    try:
+        return os.path.getmtime(dest) >= os.path.getmtime(src_path)
+    except OSError:
+        return False
+
+
+def normalize_clip(audio: AudioSegment) -> AudioSegment:
+    """
+    1) Downmix to mono and resample to CLIP_SAMPLE_RATE
+    2) Gain to CLIP_TARGET_DBFS average loudness, keeping peaks
+       under PEAK_CEILING_DBFS
+    """
+    audio = audio.set_channels(1).set_frame_rate(CLIP_SAMPLE_RATE)
+    if audio.dBFS != float("-inf"):  # leave silent clips alone
+        audio = audio.apply_gain(CLIP_TARGET_DBFS - audio.dBFS)
+        if audio.max_dBFS > PEAK_CEILING_DBFS:
+            audio = audio.apply_gain(PEAK_CEILING_DBFS - audio.max_dBFS)
+    return audio
+
+
+def encode_clip(audio: AudioSegment) -> bytes:
+    """Normalise and encode to CLIP_BITRATE MP3 bytes, in memory."""
+    buf = io.BytesIO()
+    normalize_clip(audio).export(buf, format="mp3", bitrate=CLIP_BITRATE)
+    return buf.getvalue()
+
+
+def transcode_clip(src_path: str, dest_path: str) -> int:
+    """
+    Re-encode one clip (see normalize_clip) and return the size of the
+    written file; written to a temp file, then renamed.
+    """
+    audio = normalize_clip(AudioSegment.from_file(src_path))
+
+    os.makedirs(os.path.dirname(dest_path), exist_ok=True)
+    tmp_path = dest_path + ".tmp"
+    audio.export(tmp_path, format="mp3", bitrate=CLIP_BITRATE)
+    os.replace(tmp_path, dest_path)
+    return os.path.getsize(dest_path)
+
+
+def find_clips(songs_dir: str = GAME_SONGS_DIR) -> List[str]:
+    clips = []
+    for song in sorted(os.listdir(songs_dir)):
+        song_dir = os.path.join(songs_dir, song)
+        if os.path.isdir(song_dir):
+            clips.extend(os.path.join(song_dir, f) for f in sorted(os.listdir(song_dir))
+                         if f.endswith(CLIP_EXTENSIONS))
+    return clips
+
+
+def transcode_all(overwrite: bool = False, workers: int = None) -> Tuple[int, int, int]:
+    """
+    Transcode every clip that has no up-to-date copy yet.
+    Returns (clips written, source bytes, transcoded bytes).
+    """
+    todo = [c for c in find_clips() if overwrite or not is_transcoded(c)]
+
+    def work(src: str) -> Tuple[int, int]:
+        try:
+            return os.path.getsize(src), transcode_clip(src, transcoded_path(src))
+        except Exception as e:
+            print(f"[ERROR] Could not transcode {src}: {e}")
+            return 0, 0
+
+    # ffmpeg does the work in a subprocess, so threads are enough
+    with ThreadPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+        sizes = [s for s in pool.map(work, todo) if s[1]]
+    return len(sizes), sum(s[0] for s in sizes), sum(s[1] for s in sizes)
+
+
+if __name__ == "__main__":
+    written, src_bytes, out_bytes = transcode_all(overwrite="--overwrite" in sys.argv[1:])
+    print(f"Transcoded {written} clips into {GAME_CLIPS_DIR}: "
+          f"{src_bytes / 1024:.0f} KB -> {out_bytes / 1024:.0f} KB")
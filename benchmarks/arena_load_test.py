@@ -0,0 +1,152 @@
+# benchmarks/arena_load_test.py
+#
+# Round-end latency in a large room: from GameRound.end() until every
+# player's socket has received both its personal result and the
+# standings.  Compares the previous round end (full sort, one awaited
+# send per player) with the current one (incremental leaderboard,
+# batched queued sends, top-N standings in an arena).
+# Also reports the longest the event loop went without a turn, since a
+# stalled loop delays every other game on the server.
+#
+#   python -m benchmarks.arena_load_test [--players 500] [--latency-ms 1] [--repeat 3]
+
+import json
+import time
+import random
+import asyncio
+import argparse
+
+import game.game_round as game_round
+from game.player import Player
+from game.song import Song
+from game.game_round import GameRound
+from game.game_server import GameServer
+from database.song_catalogue import get_song_catalogue
+
+
+class _Delivery:
+    """Counts frames written across all sockets; `done` is set at `expected`."""
+
+    def __init__(self, expected: int):
+        self.expected = expected
+        self.frames = 0
+        self.done = asyncio.Event()
+
+    def written(self) -> None:
+        self.frames += 1
+        if self.frames >= self.expected:
+            self.done.set()
+
+
+class _FakeSocket:
+    def __init__(self, latency_s: float, delivery: _Delivery):
+        self.latency_s = latency_s
+        self.delivery = delivery
+
+    async def send(self, frame: str) -> None:
+        await asyncio.sleep(self.latency_s)
+        self.delivery.written()
+
+
+class _LoopStall:
+    """Longest gap between turns of a 1 ms ticker while active."""
+
+    def __init__(self):
+        self.max_gap = 0.0
+        self._task = None
+
+    async def _tick(self):
+        last = time.perf_counter()
+        while True:
+            await asyncio.sleep(0.001)
+            now = time.perf_counter()
+            self.max_gap = max(self.max_gap, now - last - 0.001)
+            last = now
+
+    def __enter__(self):
+        self._task = asyncio.create_task(self._tick())
+        return self
+
+    def __exit__(self, *exc):
+        self._task.cancel()
+
+
+async def _legacy_round_end(rnd: GameRound) -> None:
+    """The previous implementation: re-sort everyone, await each send in turn."""
+    await rnd.calculate_points()
+    info = Song(rnd.correct_song_name, rnd.songs_db).to_dict()
+    info.pop("id", None)
+    players = rnd.game_server.players
+    for p in players:
+        await p.websocket.send(json.dumps({"type": "your_result", "data": {
+            "correct_answer": info, "correct": p.guessed_correctly,
+            "guess_time": p.guess_time, "points_earned": p.current_round_points,
+            "total_score": p.score}}))
+    placements = [{"placement": i, "username": p.username,
+                   "points_this_round": p.current_round_points, "total_score": p.score}
+                  for i, p in enumerate(sorted(players, key=lambda p: p.score, reverse=True), 1)]
+    frame = json.dumps({"type": "round_end", "data": {
+        "round_number": rnd.round_number, "placements_table": placements}})
+    for p in players:
+        await p.websocket.send(frame)
+
+
+async def _current_round_end(rnd: GameRound) -> None:
+    await rnd.end()
+
+
+def _make_round(count: int, latency_s: float, mode: str, song_name: str,
+                delivery: _Delivery) -> GameRound:
+    players = [Player(f"p{i}", _FakeSocket(latency_s, delivery)) for i in range(count)]
+    server = GameServer("bench", players[0], get_song_catalogue(), mode=mode)
+    for p in players:
+        p.score = random.randint(0, 5000)
+        server.players.append(p)
+    server.leaderboard.reset(players)
+    rnd = GameRound(1, server.players, server.songs_db, round_time=30)
+    rnd.game_server = server
+    rnd.correct_song_name = song_name
+    for p in players:
+        p.reset_round()
+        p.has_guessed = True
+        p.guess_time = random.uniform(1, 30)
+        p.guessed_correctly = random.random() < 0.4
+        if p.guessed_correctly:
+            rnd.correct_guessers.append(p)
+    return rnd
+
+
+async def _time(fn, count, latency_s, mode, song_name, repeat):
+    best, stall = float("inf"), 0.0
+    for _ in range(repeat):
+        # every player gets its result and the standings
+        delivery = _Delivery(expected=2 * count)
+        rnd = _make_round(count, latency_s, mode, song_name, delivery)
+        with _LoopStall() as loop_stall:
+            t0 = time.perf_counter()
+            await fn(rnd)
+            await delivery.done.wait()
+            elapsed = time.perf_counter() - t0
+        best = min(best, elapsed)
+        stall = max(stall, loop_stall.max_gap)
+    return best * 1000.0, stall * 1000.0
+
+
+async def run(counts, latency_ms: float, repeat: int) -> None:
+    game_round.RESULTS_PAUSE = 0  # time the work, not the pause for the UI
+    song_name = get_song_catalogue().song_names()[0]
+    latency_s = latency_ms / 1000.0
+    print(f"{'players':>8}{'sequential':>14}{'(stall)':>10}{'arena':>12}{'(stall)':>10}")
+    for count in counts:
+        old, old_stall = await _time(_legacy_round_end, count, latency_s, "classic", song_name, repeat)
+        new, new_stall = await _time(_current_round_end, count, latency_s, "arena", song_name, repeat)
+        print(f"{count:>8}{old:>11.1f} ms{old_stall:>7.1f} ms{new:>9.1f} ms{new_stall:>7.1f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--players", type=int, nargs="+", default=[8, 100, 500])
+    parser.add_argument("--latency-ms", type=float, default=1.0)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    asyncio.run(run(args.players, args.latency_ms, args.repeat))
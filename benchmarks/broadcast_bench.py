@@ -0,0 +1,86 @@
+# benchmarks/broadcast_bench.py
+#
+# Fan-out latency of GameServer.broadcast vs player count, comparing the
+# old sequential loop (json.dumps + await send per player) with the
+# encode-once version feeding per-player send queues (timed until every
+# queue has drained).  Sockets are in-memory stand-ins
+# that sleep for --latency-ms per send to mimic network writes.
+#
+#   python -m benchmarks.broadcast_bench [--latency-ms 1] [--repeat 5]
+
+import time
+import base64
+import asyncio
+import argparse
+
+from game.player import Player
+from game.game_server import GameServer
+
+PLAYER_COUNTS = (2, 8, 32, 128, 500)
+
+
+class _FakeSocket:
+    def __init__(self, latency_s: float):
+        self.latency_s = latency_s
+        self.bytes_sent = 0
+
+    async def send(self, frame: str) -> None:
+        await asyncio.sleep(self.latency_s)
+        self.bytes_sent += len(frame)
+
+
+async def _legacy_broadcast(server: GameServer, message: dict) -> None:
+    """The previous implementation: one json.dumps and one awaited send per player."""
+    stale = []
+    for p in server.players:
+        ok = await p.send_message(message["type"], message.get("data", {}))
+        if not ok:
+            stale.append(p)
+    for p in stale:
+        await server.remove_player(p)
+
+
+async def _queued_broadcast(server: GameServer, message: dict) -> None:
+    await server.broadcast(message)
+    await asyncio.gather(*[p.drain() for p in server.players])
+
+
+def _round_start_message() -> dict:
+    # roughly the size of a real round_start: a ~100 KB clip plus 4 options
+    clip_b64 = base64.b64encode(bytes(100_000)).decode("ascii")
+    options = [{"song_name": f"Song {i}", "artist_name": "Artist", "album_cover_id": "0" * 16}
+               for i in range(4)]
+    return {"type": "round_start",
+            "data": {"round_number": 1, "round_time": 30, "options": options, "clip_b64": clip_b64}}
+
+
+async def _time(fn, server, message, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        await fn(server, message)
+        best = min(best, time.perf_counter() - t0)
+    return best * 1000.0
+
+
+async def run(latency_ms: float, repeat: int) -> None:
+    message = _round_start_message()
+    print(f"{'players':>8}{'sequential':>16}{'encode once + queues':>24}"
+          f"{'broadcast returns':>20}")
+    for count in PLAYER_COUNTS:
+        players = [Player(f"p{i}", _FakeSocket(latency_ms / 1000.0)) for i in range(count)]
+        server = GameServer("bench", players[0], songs_db=None)
+        server.players = list(players)
+        old = await _time(_legacy_broadcast, server, message, repeat)
+        new = await _time(_queued_broadcast, server, message, repeat)
+        enqueue = await _time(GameServer.broadcast, server, message, 1)
+        await asyncio.gather(*[p.drain() for p in players])
+        print(f"{count:>8}{old:>13.1f} ms{new:>21.1f} ms{enqueue:>17.1f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--latency-ms", type=float, default=1.0)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(run(args.latency_ms, args.repeat))
@@ -0,0 +1,80 @@
+# benchmarks/db_bench.py
+#
+# Queries/second for the SongDatabase hot paths, comparing the old
+# connection-per-query behaviour with the pooled WAL connections.
+#
+#   python -m benchmarks.db_bench [--seconds 3]
+
+import os
+import time
+import shutil
+import sqlite3
+import argparse
+import tempfile
+
+from database.base_database import BaseDatabase
+from database.song_database import SongDatabase
+from settings import SONGS_DB_PATH
+
+
+class _ConnectPerQuery:
+    """Mixin reproducing the previous behaviour: fresh connection per call, DDL per construct."""
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path)
+        conn.execute("PRAGMA foreign_keys = ON;")
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def create_table(self, create_sql: str) -> None:
+        with self._connect() as conn:
+            conn.execute(create_sql.format(table_name=self.table_name))
+            conn.commit()
+
+
+class LegacySongDatabase(_ConnectPerQuery, SongDatabase):
+    def __init__(self, db_path: str):
+        super().__init__(db_path)
+        self.history = type("LegacyHistory", (_ConnectPerQuery, BaseDatabase), {})(
+            db_path, "song_history")
+
+
+def _rate(fn, seconds: float) -> float:
+    n, deadline = 0, time.perf_counter() + seconds
+    start = time.perf_counter()
+    while time.perf_counter() < deadline:
+        fn()
+        n += 1
+    return n / (time.perf_counter() - start)
+
+
+def run(seconds: float) -> None:
+    tmp_dir = tempfile.mkdtemp()
+    db_path = os.path.join(tmp_dir, "songs.db")
+    shutil.copy(SONGS_DB_PATH, db_path)
+    try:
+        names = [r[0] for r in sqlite3.connect(db_path).execute("SELECT song_name FROM songs")]
+        results = {}
+        for label, cls in (("connect-per-query", LegacySongDatabase),
+                           ("pooled WAL", SongDatabase)):
+            db = cls(db_path)
+            i = iter(range(10**12))
+            results[label] = {
+                "get_song_by_name": _rate(lambda: db.get_song_by_name(names[next(i) % len(names)]), seconds),
+                "construct + lookup": _rate(lambda: cls(db_path).get_song_by_name(names[0]), seconds),
+                "get_user_history": _rate(lambda: db.get_user_history("nadav"), seconds),
+            }
+        print(f"{'query':<22}" + "".join(f"{label:>22}" for label in results))
+        for query in next(iter(results.values())):
+            print(f"{query:<22}" + "".join(f"{r[query]:>18,.0f} q/s" for r in results.values()))
+    finally:
+        for conn in getattr(BaseDatabase._local, "conns", {}).values():
+            conn.close()
+        BaseDatabase._local.conns = {}
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--seconds", type=float, default=3.0)
+    run(parser.parse_args().seconds)
@@ -9,10 +9,10 @@ from concurrent.futures import ThreadPoolExecutor
 
 from spotify.playlist_builder import (
     get_artists_from_playlist,
-    build_song_playlist
+    build_song_playlist,
+    download_album_image
 )
 from spotify.spotify_api import get_playlist_tracks, get_track_metadata
-from spotify.spotify_api import download_album_image
 from spotify.spotify_api import download_track_mp3
 from audio.audio_processor import process_audio
 from database.song_database import SongDatabase
@@ -26,6 +26,9 @@ from settings import (
     MAX_SONG_THREADS
 )
 
+UPLOAD_BATCH_SIZE   = 200   # songs per upsert transaction
+UPLOAD_BATCH_LINGER = 0.5   # seconds to wait for more songs before flushing a batch
+
 # Single queue and event to coordinate processing vs uploading
 db = SongDatabase(db_path=SONGS_DB_PATH)
 upload_queue = Queue()
@@ -71,9 +74,21 @@ def process_and_queue_song(song_name: str, audio_path: str):
         print(f"[ERROR] Failed to process {song_name}: {e}")
 
 
+def _drain_batch(first: dict) -> list:
+    """Collect `first` plus whatever else is queued, up to UPLOAD_BATCH_SIZE."""
+    batch = [first]
+    while len(batch) < UPLOAD_BATCH_SIZE:
+        try:
+            batch.append(upload_queue.get(block=True, timeout=UPLOAD_BATCH_LINGER))
+        except Empty:
+            break
+    return batch
+
+
 def upload_worker():
     """
-    Worker thread that takes song_data from the queue and writes to DB.
+    Worker thread that drains song_data from the queue in batches and
+    upserts each batch into the DB in a single transaction.
     """
     while True:
         try:
@@ -84,13 +99,20 @@ def upload_worker():
             time.sleep(0.1)
             continue
 
+        batch = _drain_batch(song_data)
         try:
-            # add_song now accepts full metadata dict
-            db.add_song(song_data)
+            db.upsert_songs(batch)
         except Exception as e:
-            print(f"[ERROR] Upload failed for {song_data.get('song_name')}: {e}")
+            # isolate the bad row(s) so one failure doesn't drop the batch
+            print(f"[ERROR] Batch upload of {len(batch)} songs failed ({e}); retrying one by one")
+            for row in batch:
+                try:
+                    db.upsert_songs([row])
+                except Exception as e:
+                    print(f"[ERROR] Upload failed for {row.get('song_name')}: {e}")
         finally:
-            upload_queue.task_done()
+            for _ in batch:
+                upload_queue.task_done()
 
 
 def run_initial_setup():
@@ -0,0 +1,80 @@
+# database/async_database.py
+
+import time
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict
+
+
+class AsyncDatabase:
+    """
+    Awaitable facade over a synchronous database object (UsersDatabase,
+    SongDatabase, ...).  Every call is queued onto a small dedicated
+    thread pool, so a slow disk never stalls the event loop:
+
+        row = await users.get_user_by_username("bob")
+
+    Per-query latency is recorded split into queue wait (time spent behind
+    other queries) and execution time on the DB thread.
+    """
+
+    def __init__(self, db: Any, name: str = "db", workers: int = 1):
+        self._db = db
+        self.name = name
+        self._executor = ThreadPoolExecutor(max_workers=workers,
+                                            thread_name_prefix=f"db-{name}")
+        self._stats: Dict[str, Dict[str, float]] = {}
+        self._stats_lock = threading.Lock()
+
+    def _record(self, query: str, wait_s: float, exec_s: float) -> None:
+        with self._stats_lock:
+            s = self._stats.setdefault(query, {
+                "count": 0, "wait_ms": 0.0, "exec_ms": 0.0, "max_exec_ms": 0.0
+            })
+            s["count"] += 1
+            s["wait_ms"] += wait_s * 1000.0
+            s["exec_ms"] += exec_s * 1000.0
+            s["max_exec_ms"] = max(s["max_exec_ms"], exec_s * 1000.0)
+
+    async def run(self, query: str, fn: Callable, *args, **kwargs) -> Any:
+        """
+        Run `fn(*args, **kwargs)` on the DB thread and await its result,
+        recording its latency under the label `query`.
+        """
+        loop = asyncio.get_running_loop()
+        enqueued = time.perf_counter()
+
+        def job():
+            started = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                self._record(query, started - enqueued, time.perf_counter() - started)
+
+        return await loop.run_in_executor(self._executor, job)
+
+    def __getattr__(self, name: str):
+        attr = getattr(self._db, name)
+        if not callable(attr):
+            return attr
+
+        async def method(*args, **kwargs):
+            return await self.run(name, attr, *args, **kwargs)
+        return method
+
+    def latency_report(self) -> Dict[str, Dict[str, float]]:
+        """Per-query count and mean/max latencies in milliseconds."""
+        with self._stats_lock:
+            return {
+                query: {
+                    "count": int(s["count"]),
+                    "mean_wait_ms": round(s["wait_ms"] / s["count"], 3),
+                    "mean_exec_ms": round(s["exec_ms"] / s["count"], 3),
+                    "max_exec_ms": round(s["max_exec_ms"], 3),
+                }
+                for query, s in self._stats.items()
+            }
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._executor.shutdown(wait=wait)
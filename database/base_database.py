@@ -1,39 +1,101 @@
 # database/base_database.py
 
 import sqlite3
+import threading
 from typing import Any, List, Optional, Tuple
 
+# Size of sqlite3's per-connection prepared statement cache
+STATEMENT_CACHE_SIZE = 256
+
+
 class BaseDatabase:
     """
     A simple SQLite-backed base class providing:
       - Table creation (with a {table_name} placeholder)
+      - Other schema scripts (triggers, seed rows)
       - Insertion
       - Single-row and multi-row queries
       - Convenience methods for common patterns
+
+    Connections are pooled per thread and per database file, so every
+    instance on the same thread reuses one open WAL-mode connection (and
+    its prepared statement cache) instead of reconnecting per query.
     """
 
+    _local = threading.local()          # thread -> {db_path: Connection}
+    _schema_done = set()                # {(db_path, sql)} already executed
+    _schema_lock = threading.Lock()
+
     def __init__(self, db_path: str, table_name: str):
         self.db_path = db_path
         self.table_name = table_name
 
     def _connect(self) -> sqlite3.Connection:
-        """Open a new connection with foreign keys enabled and dict-like row access."""
-        conn = sqlite3.connect(self.db_path)
-        # enforce foreign key constraints
-        conn.execute("PRAGMA foreign_keys = ON;")
-        # return rows as sqlite3.Row for column access by name
-        conn.row_factory = sqlite3.Row
+        """
+        Return this thread's connection to db_path, opening it on first use
+        with WAL journaling, foreign keys enabled and dict-like row access.
+        """
+        conns = getattr(self._local, "conns", None)
+        if conns is None:
+            conns = self._local.conns = {}
+        conn = conns.get(self.db_path)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, cached_statements=STATEMENT_CACHE_SIZE)
+            # readers never block the writer and vice versa
+            conn.execute("PRAGMA journal_mode = WAL;")
+            # safe with WAL; avoids an fsync on every commit
+            conn.execute("PRAGMA synchronous = NORMAL;")
+            # enforce foreign key constraints
+            conn.execute("PRAGMA foreign_keys = ON;")
+            # return rows as sqlite3.Row for column access by name
+            conn.row_factory = sqlite3.Row
+            conns[self.db_path] = conn
         return conn
 
+    def close(self) -> None:
+        """Close the calling thread's pooled connection to this database."""
+        conns = getattr(self._local, "conns", {})
+        conn = conns.pop(self.db_path, None)
+        if conn is not None:
+            conn.close()
+
     def create_table(self, create_sql: str) -> None:
         """
         Runs a CREATE TABLE IF NOT EXISTS.  `create_sql` may contain
-        "{table_name}" which will be replaced.
+        "{table_name}" which will be replaced.  Each statement runs at most
+        once per process and database file.
         """
         sql = create_sql.format(table_name=self.table_name)
-        with self._connect() as conn:
-            conn.execute(sql)
-            conn.commit()
+        self._run_schema_once(sql, lambda conn: conn.execute(sql))
+
+    def executescript(self, script: str) -> None:
+        """
+        Runs schema statements that are not a table (CREATE TRIGGER, seed
+        INSERT OR IGNORE, ...), separated by ";".  Like create_table,
+        "{table_name}" is replaced and the script runs at most once per
+        process and database file.
+        """
+        sql = script.format(table_name=self.table_name)
+        self._run_schema_once(sql, lambda conn: conn.executescript(sql))
+
+    def _run_schema_once(self, sql: str, run) -> None:
+        key = (self.db_path, sql)
+        with self._schema_lock:
+            if key in self._schema_done:
+                return
+            with self._connect() as conn:
+                run(conn)
+                conn.commit()
+            self._schema_done.add(key)
+
+    def create_index(self, index_name: str, columns: str) -> None:
+        """
+        CREATE INDEX IF NOT EXISTS on this table, once per process like
+        create_table.  `columns` is the raw column list, e.g. "a, b DESC".
+        """
+        self.create_table(
+            f"CREATE INDEX IF NOT EXISTS {index_name} ON {{table_name}} ({columns})"
+        )
 
     def insert(self, data: dict) -> int:
         """
@@ -50,6 +112,27 @@ class BaseDatabase:
             conn.commit()
             return cursor.lastrowid
 
+    def upsert_many(self, rows: List[dict], conflict_column: str) -> int:
+        """
+        Insert many rows in a single transaction with executemany.  A row
+        whose `conflict_column` (a UNIQUE column) already exists updates
+        the existing row instead of failing.  All rows must share the
+        first row's keys.  Returns the number of rows written.
+        """
+        if not rows:
+            return 0
+        columns = list(rows[0].keys())
+        cols = ", ".join(columns)
+        placeholders = ", ".join("?" for _ in columns)
+        updates = ", ".join(f"{c} = excluded.{c}" for c in columns if c != conflict_column)
+        sql = (f"INSERT INTO {self.table_name} ({cols}) VALUES ({placeholders}) "
+               f"ON CONFLICT({conflict_column}) DO UPDATE SET {updates}")
+        values = [tuple(row[c] for c in columns) for row in rows]
+
+        with self._connect() as conn:
+            conn.executemany(sql, values)
+        return len(values)
+
     def get_row(self, column: str, value: Any) -> Optional[Tuple]:
         """
         Fetch exactly one row where `column = value`, or None if not found.
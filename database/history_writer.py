@@ -0,0 +1,98 @@
+# database/history_writer.py
+
+import time
+import atexit
+import threading
+from typing import List, Set, Tuple
+
+from database.song_database import SongDatabase
+
+
+class HistoryWriteBuffer:
+    """
+    Write-behind buffer for song_history.  add() only appends to memory;
+    a background thread coalesces everything queued in the last
+    `flush_interval` seconds into one SongDatabase.add_history_batch
+    transaction (inserts plus one trim per affected user).
+    Pending plays are flushed on close() and at interpreter exit.
+    A failed write is retried with the next flush; after `max_attempts`
+    failures in a row the queued plays are dropped.
+    """
+
+    def __init__(self, db: SongDatabase, catalogue,
+                 flush_interval: float = 0.25, max_batch: int = 1000,
+                 max_attempts: int = 5):
+        self.db = db
+        self.catalogue = catalogue  # name -> id lookups without SQL
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+        self.max_attempts = max_attempts
+        self._failures = 0  # flushes failed in a row
+        self._pending: List[Tuple[str, int, str]] = []
+        self._pending_users: Set[str] = set()
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+
+        self._thread = threading.Thread(target=self._run, name="history-writer", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def add(self, username: str, song_name: str) -> bool:
+        """Queue a confirmed play. Returns False if the song is unknown."""
+        row = self.catalogue.get_song_by_name(song_name)
+        if not row:
+            return False
+        played_at = time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime())
+        with self._lock:
+            self._pending.append((username, row['id'], played_at))
+            self._pending_users.add(username)
+            if len(self._pending) >= self.max_batch:
+                self._wake.set()
+        return True
+
+    def has_pending(self, username: str) -> bool:
+        with self._lock:
+            return username in self._pending_users
+
+    def flush(self) -> int:
+        """Write everything queued so far in one transaction; returns rows written."""
+        with self._flush_lock:
+            with self._lock:
+                batch, self._pending = self._pending, []
+                users, self._pending_users = self._pending_users, set()
+            if not batch:
+                return 0
+            try:
+                self.db.add_history_batch(batch)
+            except Exception as e:
+                self._failures += 1
+                if self._failures >= self.max_attempts:
+                    print(f"[ERROR] History flush failed {self._failures} times; "
+                          f"dropping {len(batch)} plays: {e}")
+                    self._failures = 0
+                    return 0
+                print(f"[ERROR] History flush of {len(batch)} plays failed: {e}")
+                with self._lock:
+                    # keep them for the next attempt, oldest first
+                    self._pending[:0] = batch
+                    self._pending_users |= users
+                return 0
+            self._failures = 0
+            return len(batch)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
+
+    def close(self) -> None:
+        """Stop the background thread and flush whatever is still queued."""
+        if self._stop.is_set():
+            return
+        self._stop.set()
+        self._wake.set()
+        self._thread.join(timeout=5)
+        self.flush()
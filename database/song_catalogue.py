@@ -0,0 +1,113 @@
+# database/song_catalogue.py
+
+import threading
+from typing import Dict, List, NamedTuple, Optional
+
+from database.song_database import SongDatabase
+from settings import SONGS_DB_PATH
+
+
+class SongRecord(NamedTuple):
+    """One songs-table row, in column order, so it unpacks like a sqlite3.Row."""
+    id:                int
+    song_name:         str
+    artist_name:       str
+    album_name:        Optional[str]
+    album_cover_image: Optional[str]
+    album_type:        str
+    release_date:      Optional[str]
+    spotify_url:       Optional[str]
+    spectrograms:      str
+
+    def __getitem__(self, key):
+        # allow row['column'] access like sqlite3.Row as well as row[index]
+        if isinstance(key, str):
+            return getattr(self, key)
+        return tuple.__getitem__(self, key)
+
+
+class SongCatalogue:
+    """
+    Read-mostly in-memory copy of the songs table with indexed lookups:
+      - song_name -> SongRecord
+      - id        -> SongRecord
+      - artist    -> [song ids]
+    Exposes the same lookup methods as SongDatabase, so it can be passed
+    anywhere a `db` is used only for song metadata (e.g. Song(name, db)).
+    Songs written through SongDatabase in this process reload it right
+    away; refresh() picks up writes made by another process, such as the
+    setup worker, from the songs_version counter.
+    """
+
+    def __init__(self, db: SongDatabase):
+        self.db = db
+        self._lock = threading.Lock()
+        self._by_name: Dict[str, SongRecord] = {}
+        self._by_id: Dict[int, SongRecord] = {}
+        self._by_artist: Dict[str, List[int]] = {}
+        self.version = -1
+        self.reload()
+        SongDatabase.on_songs_change(self._on_songs_change)
+
+    def _on_songs_change(self, db_path: str) -> None:
+        if db_path == self.db.db_path:
+            self.reload()
+
+    def reload(self) -> None:
+        """Re-read every song from the database and swap in fresh indexes."""
+        # read the version first: a write racing with this reload bumps it
+        # again, so the next refresh() picks that write up
+        version = self.db.songs_version()
+        by_name, by_id, by_artist = {}, {}, {}
+        for row in self.db.list_all_songs():
+            record = SongRecord(*row)
+            by_name[record.song_name] = record
+            by_id[record.id] = record
+            # "Miles Davis, John Coltrane" is indexed under both artists
+            for artist in {record.artist_name, *record.artist_name.split(", ")}:
+                by_artist.setdefault(artist, []).append(record.id)
+        with self._lock:
+            self._by_name, self._by_id, self._by_artist = by_name, by_id, by_artist
+            self.version = version
+
+    def refresh(self) -> bool:
+        """Reload if the songs table changed since the last load; True if it did."""
+        if self.db.songs_version() == self.version:
+            return False
+        self.reload()
+        return True
+
+    def get_song_by_name(self, song_name: str) -> Optional[SongRecord]:
+        return self._by_name.get(song_name)
+
+    def get_song_by_id(self, song_id: int) -> Optional[SongRecord]:
+        return self._by_id.get(song_id)
+
+    def get_song_ids_by_artist(self, artist_name: str) -> List[int]:
+        return list(self._by_artist.get(artist_name, ()))
+
+    def list_all_songs(self) -> List[SongRecord]:
+        return list(self._by_id.values())
+
+    def song_names(self) -> List[str]:
+        return list(self._by_name)
+
+    def __contains__(self, song_name: str) -> bool:
+        return song_name in self._by_name
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+
+# Process-wide catalogue, loaded on first use
+_catalogue: Optional[SongCatalogue] = None
+_catalogue_lock = threading.Lock()
+
+
+def get_song_catalogue() -> SongCatalogue:
+    global _catalogue
+    if _catalogue is None:
+        with _catalogue_lock:
+            if _catalogue is None:
+                _catalogue = SongCatalogue(SongDatabase(SONGS_DB_PATH))
+    return _catalogue
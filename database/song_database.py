@@ -1,10 +1,17 @@
 # database/song_database.py
 
 import sqlite3
-from typing import Optional, List, Dict
+from typing import Optional, List, Dict, Tuple
 from database.base_database import BaseDatabase
 
+HISTORY_LIMIT = 20  # plays kept per user
+
 class SongDatabase(BaseDatabase):
+    # callbacks(usernames) run after any committed history change
+    _history_listeners = []
+    # callbacks(db_path) run after songs are written through this class
+    _songs_listeners = []
+
     def __init__(self, db_path: str):
         super().__init__(db_path, 'songs')
         self.create_table("""
@@ -20,6 +27,23 @@ class SongDatabase(BaseDatabase):
                 spectrograms         TEXT    NOT NULL
             )
         """)
+        # songs_version is bumped by triggers on every songs write, so a
+        # long-lived catalogue in another process can tell it is stale
+        self.create_table("""
+            CREATE TABLE IF NOT EXISTS songs_version (
+                id       INTEGER PRIMARY KEY CHECK (id = 0),
+                version  INTEGER NOT NULL
+            )
+        """)
+        self.executescript("""
+            INSERT OR IGNORE INTO songs_version (id, version) VALUES (0, 0);
+        """ + "".join(f"""
+            CREATE TRIGGER IF NOT EXISTS songs_version_{event.lower()}
+            AFTER {event} ON {{table_name}}
+            BEGIN
+                UPDATE songs_version SET version = version + 1;
+            END;
+        """ for event in ("INSERT", "UPDATE", "DELETE")))
         self.history = BaseDatabase(db_path, 'song_history')
         self.history.create_table("""
             CREATE TABLE IF NOT EXISTS {table_name} (
@@ -29,10 +53,46 @@ class SongDatabase(BaseDatabase):
                 played_at   DATETIME DEFAULT CURRENT_TIMESTAMP
             )
         """)
+        # makes the per-user trim and get_user_history index range scans,
+        # with id so their ORDER BY played_at, id needs no sort
+        self.history.create_index("idx_song_history_user_played_id",
+                                  "username, played_at, id")
+        self.history.executescript("DROP INDEX IF EXISTS idx_song_history_user_played;")
 
     def add_song(self, song_data: Dict) -> int:
         """Insert full metadata dict; returns song_id."""
-        return self.insert(song_data)
+        song_id = self.insert(song_data)
+        self._songs_changed()
+        return song_id
+
+    def upsert_songs(self, songs: List[Dict]) -> int:
+        """
+        Bulk insert full metadata dicts in one transaction; songs whose
+        song_name already exists are updated in place.  Returns rows written.
+        """
+        written = self.upsert_many(songs, 'song_name')
+        if written:
+            self._songs_changed()
+        return written
+
+    def _songs_changed(self) -> None:
+        for callback in self._songs_listeners:
+            callback(self.db_path)
+
+    @classmethod
+    def on_songs_change(cls, callback) -> None:
+        """
+        Register `callback(db_path)` to run after songs are written through
+        add_song/upsert_songs in this process.  Writes from other processes
+        only show up in songs_version().
+        """
+        cls._songs_listeners.append(callback)
+
+    def songs_version(self) -> int:
+        """Counter that changes whenever any songs row is written."""
+        with self._connect() as conn:
+            row = conn.execute("SELECT version FROM songs_version WHERE id = 0").fetchone()
+        return row['version'] if row else 0
 
     def get_song_by_name(self, song_name: str) -> Optional[sqlite3.Row]:
         """Fetch by unique name."""
@@ -47,19 +107,38 @@ class SongDatabase(BaseDatabase):
         row = self.get_song_by_name(song_name)
         if not row:
             return
-        song_id = row['id']
-        self.history.insert({'username': username, 'song_id': song_id})
+        self.add_history_batch([(username, row['id'], None)])
+
+    def add_history_batch(self, entries: List[Tuple[str, int, Optional[str]]]) -> None:
+        """
+        Insert many (username, song_id, played_at) plays and trim each
+        affected user to their HISTORY_LIMIT most recent, all in one
+        transaction.  played_at=None means "now".
+        """
+        if not entries:
+            return
+        usernames = {e[0] for e in entries}
         with self.history._connect() as conn:
-            conn.execute("""
+            conn.executemany("""
+                INSERT INTO song_history (username, song_id, played_at)
+                VALUES (?, ?, COALESCE(?, CURRENT_TIMESTAMP))
+            """, entries)
+            conn.executemany("""
                 DELETE FROM song_history
                  WHERE id IN (
                    SELECT id FROM song_history
                     WHERE username = ?
-                    ORDER BY played_at DESC
-                    LIMIT -1 OFFSET 20
+                    ORDER BY played_at DESC, id DESC
+                    LIMIT -1 OFFSET ?
                  )
-            """, (username,))
-            conn.commit()
+            """, [(username, HISTORY_LIMIT) for username in usernames])
+        for callback in self._history_listeners:
+            callback(usernames)
+
+    @classmethod
+    def on_history_change(cls, callback) -> None:
+        """Register `callback(usernames)` to run after each history write."""
+        cls._history_listeners.append(callback)
 
     def get_user_history(self, username: str) -> List[Dict]:
         """
@@ -71,11 +150,30 @@ class SongDatabase(BaseDatabase):
                   FROM song_history h
                   JOIN songs s ON s.id = h.song_id
                  WHERE h.username = ?
-                 ORDER BY h.played_at DESC
+                 ORDER BY h.played_at DESC, h.id DESC
             """, (username,))
             rows = cur.fetchall()
         return [{'song_name': r['song_name'], 'played_at': r['played_at']} for r in rows]
 
+    def get_user_history_details(self, username: str) -> List[sqlite3.Row]:
+        """
+        Newest→oldest plays for this user with full song metadata, in a
+        single JOIN.  Each row has the songs columns (minus spectrograms)
+        plus history_id and played_at.
+        """
+        with self.history._connect() as conn:
+            cur = conn.execute("""
+                SELECT h.id AS history_id, h.played_at,
+                       s.song_name, s.artist_name, s.album_name,
+                       s.album_cover_image, s.album_type,
+                       s.release_date, s.spotify_url
+                  FROM song_history h
+                  JOIN songs s ON s.id = h.song_id
+                 WHERE h.username = ?
+                 ORDER BY h.played_at DESC, h.id DESC
+            """, (username,))
+            return cur.fetchall()
+
     def list_all_songs(self) -> List[sqlite3.Row]:
         """Fetch every metadata row."""
         return self.get_all()
@@ -33,6 +33,14 @@ class UsersDatabase(BaseDatabase):
         """
         return self.insert({'username': username, 'password_hash': password_hash})
 
+    def update_password_hash(self, username: str, password_hash: str) -> None:
+        """Replace a user's stored hash (e.g. after a bcrypt cost change)."""
+        with self._connect() as conn:
+            conn.execute(
+                f"UPDATE {self.table_name} SET password_hash = ? WHERE username = ?",
+                (password_hash, username)
+            )
+
     def list_usernames(self) -> List[str]:
         """Return all usernames."""
         rows = self.get_columns('username')
@@ -0,0 +1,232 @@
+# game/album_art.py
+
+import os
+import sys
+import base64
+import ntpath
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from settings import ALBUM_IMAGES_DIR, ALBUM_ART_CACHE_BYTES
+
+COVER_ID_LENGTH = 16
+MAX_COVERS_PER_REQUEST = 32
+
+# The image download_album_image stores (150x150) is the "full" variant;
+# smaller ones are generated next to it, in ALBUM_IMAGES_DIR/<variant>/
+FULL = "full"
+THUMB = "thumb"
+COVER_VARIANTS: Dict[str, Tuple[Tuple[int, int], int]] = {
+    THUMB: ((80, 80), 70),  # (size, JPEG quality) - option tiles, history list
+}
+
+
+def variant_file(cover_path: str, variant: str) -> str:
+    """Where the `variant` rendition of the full-size `cover_path` is stored."""
+    return os.path.join(ALBUM_IMAGES_DIR, variant, ntpath.basename(cover_path))
+
+
+def build_cover_variants(cover_path: str, overwrite: bool = False) -> List[str]:
+    """
+    Render every COVER_VARIANTS size of the full-size image at `cover_path`.
+    Called at ingest time; returns the paths written.
+    """
+    from PIL import Image  # only the offline/ingest side needs Pillow
+
+    written = []
+    with Image.open(cover_path) as src:
+        img = src.convert("RGB")
+        for variant, (size, quality) in COVER_VARIANTS.items():
+            dest = variant_file(cover_path, variant)
+            if os.path.exists(dest) and not overwrite:
+                continue
+            os.makedirs(os.path.dirname(dest), exist_ok=True)
+            img.resize(size, Image.LANCZOS).save(dest, format="JPEG",
+                                                 quality=quality, optimize=True)
+            written.append(dest)
+    return written
+
+
+class AlbumArtCache:
+    """
+    Loads each album cover from disk once and identifies it by a short
+    hash of its bytes.  Messages carry `album_cover_id` instead of the
+    image; clients fetch unknown ids with the `get_cover` action and keep
+    them by id.  Because the id changes whenever the image does, a cover a
+    client already holds is always current and never needs re-fetching;
+    a file whose mtime or size has changed is hashed again, so a replaced
+    cover gets its new id.
+
+    Each cover may exist in several variants (see COVER_VARIANTS); callers
+    pick the smallest one suitable for the message they are building, and
+    fall back to the full image where a variant has not been generated.
+
+    Base64 bodies live in an LRU bounded by total size; an evicted cover
+    is re-read from its file the next time it is requested.
+    """
+
+    def __init__(self, max_bytes: int = ALBUM_ART_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        # (cover_path, variant) -> ((file, mtime_ns, size), cover_id)
+        self._id_by_path: Dict[Tuple[str, str], Tuple[Tuple[str, int, int], str]] = {}
+        self._path_by_id: Dict[str, str] = {}
+        self._b64: "OrderedDict[str, str]" = OrderedDict()
+        self._size = 0
+
+    @staticmethod
+    def resolve_path(cover_path: Optional[str]) -> Optional[str]:
+        """
+        songs.db may hold paths written on another machine (e.g. a Windows
+        drive path); fall back to the file of the same name in ALBUM_IMAGES_DIR.
+        """
+        if not cover_path:
+            return None
+        if os.path.isfile(cover_path):
+            return cover_path
+        local = os.path.join(ALBUM_IMAGES_DIR, ntpath.basename(cover_path))
+        return local if os.path.isfile(local) else None
+
+    @staticmethod
+    def _read(path: str):
+        with open(path, 'rb') as f:
+            raw = f.read()
+        cover_id = hashlib.sha1(raw).hexdigest()[:COVER_ID_LENGTH]
+        return cover_id, base64.b64encode(raw).decode('ascii')
+
+    def _store(self, cover_id: str, b64: str) -> None:
+        # caller holds self._lock
+        if cover_id in self._b64:
+            self._b64.move_to_end(cover_id)
+            return
+        self._b64[cover_id] = b64
+        self._size += len(b64)
+        while self._size > self.max_bytes and len(self._b64) > 1:
+            _, evicted = self._b64.popitem(last=False)
+            self._size -= len(evicted)
+
+    def cover_id(self, cover_path: Optional[str],
+                 variant: str = FULL) -> Optional[str]:
+        """
+        Id of the `variant` rendition of the cover stored at `cover_path`,
+        or None if there is no file.  Stats the file; it is only read and
+        hashed when first seen or changed since.
+        """
+        if not cover_path:
+            return None
+
+        # 1) Which file, and is the id we have for it still current?
+        path = self.resolve_path(cover_path)
+        if path is None:
+            return None
+        if variant != FULL and os.path.isfile(variant_file(path, variant)):
+            path = variant_file(path, variant)
+        try:
+            st = os.stat(path)
+        except OSError as e:
+            print(f"[ERROR] Could not read album cover {path}: {e}")
+            return None
+        stamp = (path, st.st_mtime_ns, st.st_size)
+        key = (cover_path, variant)
+        with self._lock:
+            known = self._id_by_path.get(key)
+        if known is not None and known[0] == stamp:
+            return known[1]
+
+        # 2) New or changed file: read, hash and cache the bytes
+        try:
+            cover_id, b64 = self._read(path)
+        except OSError as e:
+            print(f"[ERROR] Could not read album cover {path}: {e}")
+            return None
+
+        # 3) Remember both directions so evicted bodies can be re-read
+        with self._lock:
+            self._id_by_path[key] = (stamp, cover_id)
+            self._path_by_id[cover_id] = path
+            self._store(cover_id, b64)
+        return cover_id
+
+    def get_b64(self, cover_id: str) -> Optional[str]:
+        """Base64 body of a cover previously handed out by cover_id()."""
+        with self._lock:
+            b64 = self._b64.get(cover_id)
+            if b64 is not None:
+                self._b64.move_to_end(cover_id)
+                return b64
+            path = self._path_by_id.get(cover_id)
+        if path is None:
+            return None
+        try:
+            current_id, b64 = self._read(path)
+        except OSError as e:
+            print(f"[ERROR] Could not read album cover {path}: {e}")
+            return None
+        if current_id != cover_id:
+            # file was replaced on disk; the old id no longer exists, and
+            # cover_id() hands out the new one from now on
+            with self._lock:
+                if self._path_by_id.get(cover_id) == path:
+                    del self._path_by_id[cover_id]
+            return None
+        with self._lock:
+            self._store(cover_id, b64)
+        return b64
+
+    def get_covers(self, cover_ids: Iterable[str]) -> Dict[str, Optional[str]]:
+        """Bodies for a `get_cover` request; unknown ids map to None."""
+        covers = {}
+        for cover_id in list(cover_ids)[:MAX_COVERS_PER_REQUEST]:
+            if isinstance(cover_id, str):
+                covers[cover_id] = self.get_b64(cover_id)
+        return covers
+
+    def attach(self, info: Dict, variant: str = FULL) -> Dict:
+        """
+        Replace a song dict's 'album_cover_image' file path with the
+        'album_cover_id' of its `variant` rendition.
+        """
+        info['album_cover_id'] = self.cover_id(info.pop('album_cover_image', None),
+                                               variant)
+        return info
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {"known": len(self._path_by_id), "cached": len(self._b64),
+                    "cached_bytes": self._size}
+
+
+# Process-wide cache, created on first use
+_album_art: Optional[AlbumArtCache] = None
+_album_art_lock = threading.Lock()
+
+
+def get_album_art() -> AlbumArtCache:
+    global _album_art
+    if _album_art is None:
+        with _album_art_lock:
+            if _album_art is None:
+                _album_art = AlbumArtCache()
+    return _album_art
+
+
+def build_all_variants(overwrite: bool = False) -> int:
+    """Offline step: generate variants for every cover already in ALBUM_IMAGES_DIR."""
+    written = 0
+    for name in sorted(os.listdir(ALBUM_IMAGES_DIR)):
+        path = os.path.join(ALBUM_IMAGES_DIR, name)
+        if not os.path.isfile(path):
+            continue
+        try:
+            written += len(build_cover_variants(path, overwrite=overwrite))
+        except OSError as e:
+            print(f"[ERROR] Could not build variants for {path}: {e}")
+    return written
+
+
+if __name__ == "__main__":
+    # python -m game.album_art [--overwrite]
+    count = build_all_variants(overwrite="--overwrite" in sys.argv[1:])
+    print(f"Wrote {count} cover variants under {ALBUM_IMAGES_DIR}")
@@ -0,0 +1,85 @@
+# game/clip_cache.py
+
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from game.game_utils import clip_to_base64
+from settings import CLIP_CACHE_BYTES
+
+
+class ClipCache:
+    """
+    LRU of ready-to-send base64 clip bodies, bounded by total size, so
+    a clip used again (another round, another game) is not re-read and
+    re-encoded.  File entries are keyed by path and checked against the
+    file's mtime, so a re-transcoded clip is picked up; clips generated
+    in memory (see audio.clip_engine) share the same budget by key.
+    """
+
+    def __init__(self, max_bytes: int = CLIP_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Hashable, Tuple[Any, str]]" = OrderedDict()
+        self._size = 0
+        self.hits = 0
+        self.misses = 0
+
+    def _lookup(self, key: Hashable, version: Any) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == version:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+            return None
+
+    def _store(self, key: Hashable, version: Any, b64: str) -> None:
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._size -= len(old[1])
+            if len(b64) <= self.max_bytes:
+                self._entries[key] = (version, b64)
+                self._size += len(b64)
+                while self._size > self.max_bytes:
+                    _, (_, evicted) = self._entries.popitem(last=False)
+                    self._size -= len(evicted)
+
+    def get_b64(self, path: str) -> str:
+        """Base64 body of the clip at `path`, from memory when possible."""
+        mtime = os.path.getmtime(path)
+        b64 = self._lookup(path, mtime)
+        if b64 is None:
+            b64 = clip_to_base64(path)
+            self._store(path, mtime, b64)
+        return b64
+
+    def get_or_build(self, key: Hashable, build: Callable[[], str]) -> str:
+        """Cached base64 clip for `key`, calling build() on a miss."""
+        b64 = self._lookup(key, None)
+        if b64 is None:
+            b64 = build()
+            self._store(key, None, b64)
+        return b64
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {"clips": len(self._entries), "bytes": self._size,
+                    "hits": self.hits, "misses": self.misses}
+
+
+# Process-wide cache, created on first use
+_clip_cache: Optional[ClipCache] = None
+_clip_cache_lock = threading.Lock()
+
+
+def get_clip_cache() -> ClipCache:
+    global _clip_cache
+    if _clip_cache is None:
+        with _clip_cache_lock:
+            if _clip_cache is None:
+                _clip_cache = ClipCache()
+    return _clip_cache
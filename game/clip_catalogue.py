@@ -0,0 +1,175 @@
+# game/clip_catalogue.py
+
+import os
+import time
+import random
+import threading
+from typing import Dict, List, Optional, Set, Tuple
+
+from audio.clip_transcoder import CLIP_EXTENSIONS, is_transcoded, transcoded_path
+from settings import GAME_SONGS_DIR, GAME_CLIPS_DIR
+
+REFRESH_MIN_INTERVAL = 5.0  # seconds between directory mtime checks
+
+
+class ClipCatalogue:
+    """
+    Index of playable game clips, built once instead of listing
+    GAME_SONGS_DIR on every round:
+      - song_name -> tuple of clip paths (GAME_SONGS_DIR/<song_name>/*.mp3|wav)
+      - a list of song names for O(1) random picks
+
+    Folders with no clips, or whose name is not a song in `songs_db`
+    (anything with get_song_by_name, e.g. the SongCatalogue), are skipped.
+    Where audio.clip_transcoder has produced an up-to-date compact copy
+    under GAME_CLIPS_DIR, that copy is used instead of the original.
+    With an `engine` (audio.clip_engine), songs.db songs without a clip
+    folder are playable too when the engine can cut clips for them; they
+    are listed with no clip paths and random_clip() returns None.
+    refresh_if_changed() re-scans only when a directory mtime moved.
+    """
+
+    def __init__(self, songs_dir: str = GAME_SONGS_DIR, songs_db=None,
+                 clips_dir: str = GAME_CLIPS_DIR, engine=None):
+        self.songs_dir = songs_dir
+        self.clips_dir = clips_dir
+        self.songs_db = songs_db
+        self.engine = engine
+        self._lock = threading.Lock()
+        self._clips: Dict[str, Tuple[str, ...]] = {}
+        self._names: List[str] = []
+        self._mtimes: Dict[str, float] = {}
+        self._checked_at = 0.0
+        self.reload()
+
+    def _dir_mtimes(self) -> Dict[str, float]:
+        # both roots and every song folder under them
+        mtimes = {}
+        for root in (self.songs_dir, self.clips_dir):
+            if not os.path.isdir(root):
+                continue
+            mtimes[root] = os.stat(root).st_mtime
+            with os.scandir(root) as songs:
+                for song in songs:
+                    if song.is_dir():
+                        mtimes[song.path] = song.stat().st_mtime
+        # new source tracks for the engine show up in its audio folder
+        if self.engine is not None and os.path.isdir(self.engine.audio_dir):
+            mtimes[self.engine.audio_dir] = os.stat(self.engine.audio_dir).st_mtime
+        return mtimes
+
+    def _scan(self):
+        clips, mtimes = {}, self._dir_mtimes()
+        with os.scandir(self.songs_dir) as songs:
+            for song in songs:
+                if not song.is_dir():
+                    continue
+                if self.songs_db is not None and not self.songs_db.get_song_by_name(song.name):
+                    print(f"[ERROR] Clip folder '{song.name}' has no song in songs.db; skipped")
+                    continue
+                with os.scandir(song.path) as files:
+                    paths = sorted(f.path for f in files
+                                   if f.is_file() and f.name.endswith(CLIP_EXTENSIONS))
+                if paths:
+                    clips[song.name] = tuple(transcoded_path(p) if is_transcoded(p) else p
+                                             for p in paths)
+        if self.engine is not None and self.songs_db is not None:
+            for row in self.songs_db.list_all_songs():
+                name = row["song_name"]
+                if name not in clips and self.engine.can_play(name):
+                    clips[name] = ()
+        return clips, mtimes
+
+    def reload(self) -> None:
+        """Re-scan GAME_SONGS_DIR and swap in the new index."""
+        clips, mtimes = self._scan()
+        with self._lock:
+            self._clips, self._names, self._mtimes = clips, list(clips), mtimes
+            self._checked_at = time.monotonic()
+
+    def refresh_if_changed(self, force: bool = False) -> bool:
+        """
+        Reload if a song folder was added, removed or had clips changed.
+        Checks at most once per REFRESH_MIN_INTERVAL unless `force`.
+        Returns True if the index was rebuilt.
+        """
+        now = time.monotonic()
+        if not force and now - self._checked_at < REFRESH_MIN_INTERVAL:
+            return False
+        self._checked_at = now
+        try:
+            current = self._dir_mtimes()
+        except OSError as e:
+            print(f"[ERROR] Could not check {self.songs_dir}: {e}")
+            return False
+        if current == self._mtimes:
+            return False
+        self.reload()
+        return True
+
+    # ---------------- Lookups ----------------
+
+    def song_names(self) -> List[str]:
+        return list(self._names)
+
+    def clips_for(self, song_name: str) -> Tuple[str, ...]:
+        return self._clips.get(song_name, ())
+
+    def __contains__(self, song_name: str) -> bool:
+        return song_name in self._clips
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    # ---------------- Random selection ----------------
+
+    def random_song(self, exclude: Optional[Set[str]] = None) -> Optional[str]:
+        """
+        A random song not in `exclude`, or None if every song is excluded.
+        Rejection sampling keeps this O(1) while most songs are still
+        available; past half excluded it falls back to one filtering pass.
+        """
+        names = self._names
+        if not names:
+            return None
+        exclude = exclude or set()
+        if len(exclude) * 2 < len(names):
+            while True:
+                name = random.choice(names)
+                if name not in exclude:
+                    return name
+        remaining = [n for n in names if n not in exclude]
+        return random.choice(remaining) if remaining else None
+
+    def random_clip(self, song_name: str) -> Optional[str]:
+        """A random clip file of the song, or None if the engine cuts its clips."""
+        paths = self._clips[song_name]
+        return random.choice(paths) if paths else None
+
+    def distractors(self, correct: str, k: int = 3) -> List[str]:
+        """Up to `k` distinct random songs other than `correct`."""
+        names = self._names
+        k = min(k, len(names) - (1 if correct in self._clips else 0))
+        picked: List[str] = []
+        while len(picked) < k:
+            name = random.choice(names)
+            if name != correct and name not in picked:
+                picked.append(name)
+        return picked
+
+
+# Process-wide catalogue, built on first use
+_clip_catalogue: Optional[ClipCatalogue] = None
+_clip_catalogue_lock = threading.Lock()
+
+
+def get_clip_catalogue() -> ClipCatalogue:
+    global _clip_catalogue
+    if _clip_catalogue is None:
+        with _clip_catalogue_lock:
+            if _clip_catalogue is None:
+                from database.song_catalogue import get_song_catalogue
+                from audio.clip_engine import get_clip_engine
+                _clip_catalogue = ClipCatalogue(songs_db=get_song_catalogue(),
+                                                engine=get_clip_engine())
+    return _clip_catalogue
@@ -2,19 +2,24 @@
 
 import uuid
 import asyncio
-from typing import Dict, Optional, Tuple
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
 import websockets
 from websockets.legacy.server import WebSocketServerProtocol
 from game.game_server import GameServer
 from game.player      import Player
+from game.scheduler   import get_scheduler, Timer
+from settings         import GAME_PRUNE_DELAY
 
 class GameHub:
     def __init__(self, songs_db, max_games: int = 100):
         self.songs_db      = songs_db
         self._games        = {}     # game_id -> GameServer
-        self._user_games   = {}     # player.id -> game_id
+        # Routing indexes, kept in step with every game's player list:
+        self._by_ws: Dict[Any, Tuple[GameServer, Player]] = {}      # websocket -> ...
+        self._by_player: Dict[str, Tuple[GameServer, Player]] = {}  # player.id -> ...
         self.max_games     = max_games
         self._lock         = asyncio.Lock()
+        self._prune_timers: Dict[str, Timer] = {}   # game_id -> pending prune
 
     def _make_unique_id(self) -> str:
         gid = uuid.uuid4().hex[:8]
@@ -22,60 +27,115 @@ class GameHub:
             gid = uuid.uuid4().hex[:8]
         return gid
 
-    async def create_game(self, host_player: Player) -> Optional[GameServer]:
+    # ---------------- Indexes ----------------
+
+    def _index(self, gs: GameServer, player: Player) -> None:
+        # GameServer.on_player_added: runs on the game's actor
+        self._by_ws[player.websocket] = (gs, player)
+        self._by_player[player.id] = (gs, player)
+
+    def _unindex(self, gs: GameServer, player: Player) -> None:
+        # GameServer.on_player_removed: kicks, stale sockets, disconnects
+        if self._by_player.get(player.id, (None, None))[1] is player:
+            del self._by_player[player.id]
+        if self._by_ws.get(player.websocket, (None, None))[1] is player:
+            del self._by_ws[player.websocket]
+
+    def lookup(self, ws) -> Optional[Tuple[GameServer, Player]]:
+        """The (GameServer, Player) this connection is playing in, if any."""
+        return self._by_ws.get(ws)
+
+    def lookup_player(self, player_id: str) -> Optional[Tuple[GameServer, Player]]:
+        return self._by_player.get(player_id)
+
+    async def _as_host(self, ws, command: Callable[[GameServer], Awaitable]):
+        """
+        Run `command(gs)` on the actor of the game `ws` is in, provided that
+        connection is still the host when the command runs; else None.
+        """
+        entry = self._by_ws.get(ws)
+        if not entry:
+            return None
+        gs, player = entry
+
+        async def run():
+            if gs.host is not player:
+                return None
+            return await command(gs)
+        return await gs.call(run)
+
+    async def _leave_current_game(self, ws) -> None:
+        # a connection plays in at most one game at a time
+        entry = self._by_ws.get(ws)
+        if entry:
+            gs, player = entry
+            await gs.call(gs.remove_player, player)
+
+    # ---------------- Lobby ----------------
+    # The hub lock only guards the game registry; everything that touches
+    # a game (and may await the network) runs on that game's actor.
+
+    async def create_game(self, host_player: Player, mode: str = "classic") -> Optional[GameServer]:
+        await self._leave_current_game(host_player.websocket)
         async with self._lock:
             if len(self._games) >= self.max_games:
                 return None
             gid = self._make_unique_id()
-            gs = GameServer(gid, host_player, self.songs_db)
-            await gs.add_player(host_player)
+            gs = GameServer(gid, host_player, self.songs_db, mode=mode)
+            gs.on_player_added = self._index
+            gs.on_player_removed = self._unindex
+            gs.on_finished = self._schedule_prune
             self._games[gid] = gs
-            self._user_games[host_player.id] = gid
-            return gs
+        await gs.call(gs.add_player, host_player)  # indexed by on_player_added
+        return gs
 
     async def join_game(self, player: Player, game_id: str) -> Tuple[bool, str]:
-        async with self._lock:
-            gs = self._games.get(game_id)
-            if not gs:               return False, "game_not_found"
-            if gs.state != "lobby":  return False, "game_already_started"
-            if len(gs.players) >= 8: return False, "game_full"
-            await gs.add_player(player)
-            self._user_games[player.id] = game_id
-            return True, ""
+        gs = self._games.get(game_id)
+        if not gs:               return False, "game_not_found"
+        if gs.state != "lobby":  return False, "game_already_started"
+        if len(gs.players) >= gs.max_players: return False, "game_full"
+        await self._leave_current_game(player.websocket)
+        # add_player re-checks state and capacity on the actor, and
+        # indexes the player there through on_player_added
+        if not await gs.call(gs.add_player, player):
+            return False, "game_full" if gs.state == "lobby" else "game_already_started"
+        return True, ""
 
     async def kick_player_by_username(self, host_ws, target_username: str) -> Tuple[bool,str]:
-        async with self._lock:
-            for gid, gs in self._games.items():
-                if gs.host.websocket == host_ws:
-                    target = next((p for p in gs.players if p.username == target_username), None)
-                    if not target: return False, "player_not_found"
-                    # notify & remove
-                    await target.send_message("kicked", {"reason":"removed_by_host"})
-                    await gs.remove_player(target)
-                    self._user_games.pop(target.id, None)
-                    return True, ""
-        return False, "not_host"
+        async def kick(gs: GameServer):
+            target = next((p for p in gs.players if p.username == target_username), None)
+            if not target: return False, "player_not_found"
+            # notify & remove (remove_player drops it from the indexes)
+            await target.send_message("kicked", {"reason":"removed_by_host"})
+            await gs.remove_player(target)
+            return True, ""
+        result = await self._as_host(host_ws, kick)
+        return result if result is not None else (False, "not_host")
 
     async def update_lobby_settings(self, host_ws, data: Dict) -> Tuple[bool,str]:
-        async with self._lock:
-            # find server by host socket
-            for gs in self._games.values():
-                if gs.host.websocket == host_ws and gs.state=="lobby":
-                    # prepare new_settings
-                    new = {}
-                    if "num_rounds" in data:  new["num_rounds"] = data["num_rounds"]
-                    if "round_time" in data:  new["round_time"] = data["round_time"]
-                    ok = await gs.update_settings(new)
-                    return (True,"") if ok else (False,"invalid_settings")
-        return False, "not_host_or_not_lobby"
+        # prepare new_settings
+        new = {}
+        if "num_rounds" in data:  new["num_rounds"] = data["num_rounds"]
+        if "round_time" in data:  new["round_time"] = data["round_time"]
+
+        async def update(gs: GameServer):
+            if gs.state != "lobby":
+                return None
+            ok = await gs.update_settings(new)
+            return (True,"") if ok else (False,"invalid_settings")
+        result = await self._as_host(host_ws, update)
+        return result if result is not None else (False, "not_host_or_not_lobby")
 
     async def start_game(self, host_ws) -> Tuple[bool,str]:
-        async with self._lock:
-            for gs in self._games.values():
-                if gs.host.websocket == host_ws and gs.state=="lobby":
-                    ok = await gs.start_game()
-                    return (True,"") if ok else (False,"cannot_start")
-        return False, "not_host_or_not_lobby"
+        async def start(gs: GameServer):
+            if gs.state != "lobby":
+                return None
+            ok = await gs.start_game()
+            return (True,"") if ok else (False,"cannot_start")
+        result = await self._as_host(host_ws, start)
+        return result if result is not None else (False, "not_host_or_not_lobby")
+
+    # ---------------- In game ----------------
 
     async def handle_guess(self,
                            ws: WebSocketServerProtocol,
@@ -84,42 +144,73 @@ class GameHub:
         """
         Find the GameServer & Player instance by websocket, then forward the guess.
         """
-        # 1) Find the server that holds this ws
-        for server in self._games.values():
-            for p in server.players:
-                if p.websocket is ws:
-                    # 2) Dispatch straight to GameServer
-                    await server.process_guess(p, guess_msg)
-                    return True, ""
-        return False, "not_in_game"
+        entry = self._by_ws.get(ws)
+        if not entry:
+            return False, "not_in_game"
+        server, player = entry
+        await server.call(server.process_guess, player, guess_msg)
+        return True, ""
 
     async def handle_next_round(self,ws: WebSocketServerProtocol,) -> Tuple[bool, str]:
         """
         Only the host may trigger the next round.
-        Finds the GameServer for `username` and calls its private _next_round().
+        Runs the host's GameServer._next_round() on that game's actor.
         """
-        for gs in self._games.values():
-            if gs.host.websocket == ws:
-                # start the next round
-                await gs._next_round()
-                return True, ""
-
-        return False, "not host"
-
-    async def prune_finished(self):
-        while True:
-            await asyncio.sleep(60)
-            async with self._lock:
-                for gid, gs in list(self._games.items()):
-                    if gs.state == "ended":
-                        for pid, g in list(self._user_games.items()):
-                            if g == gid: del self._user_games[pid]
-                        del self._games[gid]
+        async def next_round(gs: GameServer):
+            await gs._next_round()
+            return True, ""
+        result = await self._as_host(ws, next_round)
+        return result if result is not None else (False, "not host")
+
+    async def disconnect(self, ws) -> None:
+        """Connection closed: take its player out of whatever game it was in."""
+        entry = self._by_ws.get(ws)
+        if entry:
+            server, player = entry
+            await server.call(server.remove_player, player)
+            # remove_player is a no-op if the player already left
+            self._unindex(server, player)
+
+    # ---------------- Pruning ----------------
+
+    def _schedule_prune(self, gs: GameServer) -> None:
+        # GameServer.on_finished: game ended or left empty
+        old = self._prune_timers.pop(gs.game_id, None)
+        if old is not None:
+            old.cancel()
+        self._prune_timers[gs.game_id] = get_scheduler().call_later(
+            GAME_PRUNE_DELAY, self._prune, gs)
+
+    async def _prune(self, gs: GameServer) -> None:
+        self._prune_timers.pop(gs.game_id, None)
+        if self._games.get(gs.game_id) is not gs:
+            return
+        if gs.state != "ended" and gs.players:
+            return  # someone joined the empty lobby meanwhile
+        if not gs.idle:
+            self._schedule_prune(gs)  # still finishing up; look again later
+            return
+        async with self._lock:
+            for p in list(gs.players):
+                self._unindex(gs, p)
+            del self._games[gs.game_id]
+
+    def outbound_stats(self) -> Dict[str, Dict]:
+        """Per-game send-queue metrics, keyed by game id."""
+        return {gid: gs.outbound_stats() for gid, gs in list(self._games.items())}
 
     async def get_players(self, ws: WebSocketServerProtocol):
-        for server in self._games.values():
-            for p in server.players:
-                if p.websocket is ws:
-                    await server.get_players(p)
-                    return
+        entry = self._by_ws.get(ws)
+        if entry:
+            server, player = entry
+            await server.call(server.get_players, player)
+
+    async def resync(self, ws: WebSocketServerProtocol, version: int) -> Tuple[bool, str]:
+        """Catch a client up from `version` (-1: send the full state)."""
+        entry = self._by_ws.get(ws)
+        if not entry:
+            return False, "not_in_game"
+        server, player = entry
+        await server.call(server.resync, player, version)
+        return True, ""
 
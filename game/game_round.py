@@ -1,14 +1,17 @@
 # project/game/game_round.py
 
-import os
 import random
 import asyncio
-from typing import Set, List, Dict, Any
-from game.game_utils import clip_to_base64
+from typing import Set, List, Dict, Any, Optional
+from game.clip_cache import get_clip_cache
 from game.player import Player
 from game.song import Song
-from settings import GAME_SONGS_DIR
-import base64
+from game.album_art import get_album_art, THUMB
+from game.clip_catalogue import get_clip_catalogue
+from audio.clip_engine import get_clip_engine
+from game.scheduler import get_scheduler, Timer
+
+RESULTS_PAUSE = 2  # seconds between personal results and the standings
 
 
 class GameRound:
@@ -29,83 +32,120 @@ class GameRound:
 
         # Populated in setup()
         self.correct_song_name: str = ""
-        self.clip_path: str = ""
+        self.clip_path: Optional[str] = ""  # None: cut by the clip engine
         self.options: List[str] = []
 
+        # Populated in prepare() (or lazily by start() / end())
+        self.start_payload: Optional[Dict[str, Any]] = None
+        self.answer_info: Optional[Dict[str, Any]] = None  # correct song for the results
+
         # Runtime state
         self.start_ts: float = 0.0
+        self._deadline: Optional[Timer] = None
+        self._standings: Optional[Timer] = None
         self.guesses: int = 0
         self.correct_guessers: List[Player] = []
 
     async def setup(self, used_songs: set[str]) -> None:
         """
-        Selects a song folder not in used_songs,
-        picks a random clip within it, and builds 4 options.
+        Selects a song not in used_songs, picks a random clip of it,
+        and builds 4 options, all from the prebuilt clip catalogue.
         """
-        # 1) List all songs
-        all_songs = [d for d in os.listdir(GAME_SONGS_DIR)
-                     if os.path.isdir(os.path.join(GAME_SONGS_DIR, d))]
-        # 2) Filter out used
-        choices = [s for s in all_songs if s not in used_songs]
-        if not choices:
+        clips = get_clip_catalogue()
+        # 1) Pick correct song among those not used yet
+        self.correct_song_name = clips.random_song(exclude=used_songs)
+        if self.correct_song_name is None:
             used_songs.clear()
-            choices = all_songs
-        # 3) Pick correct song
-        self.correct_song_name = random.choice(choices)
+            self.correct_song_name = clips.random_song()
         used_songs.add(self.correct_song_name)
 
-        # 4) Pick random clip file
-        song_dir = os.path.join(GAME_SONGS_DIR, self.correct_song_name)
-        clips = [f for f in os.listdir(song_dir) if f.endswith((".mp3",".wav"))]
-        self.clip_path = os.path.join(song_dir, random.choice(clips))
+        # 2) Pick random clip file (None if the song has none: cut on demand)
+        self.clip_path = clips.random_clip(self.correct_song_name)
 
-        # 5) Build options list (1 correct + 3 random wrong)
-        wrong = [s for s in all_songs if s != self.correct_song_name]
-        self.options = random.sample(wrong, k=min(3, len(wrong)))
+        # 3) Build options list (1 correct + 3 random wrong)
+        self.options = clips.distractors(self.correct_song_name, k=3)
         self.options.append(self.correct_song_name)
         random.shuffle(self.options)
 
-    async def start(self) -> None:
+    async def prepare(self) -> None:
         """
-        Broadcasts 'round_start', then waits self.round_time seconds
-        or until all players have guessed, then calls end().
+        Builds the 'round_start' payload (clip read + base64, option
+        metadata and covers) and the correct answer's info on a worker
+        thread, so it can be done ahead of time while the previous round
+        is still being played.
         """
-        # Reset per-round state on each player
-        for p in self.players:
-            p.reset_round()
+        if self.start_payload is None:
+            self.start_payload = await asyncio.to_thread(self._build_start_payload)
 
-        clip_b64 = clip_to_base64(self.clip_path)
+    def _build_start_payload(self) -> Dict[str, Any]:
+        # transcoded clips are small and reused across games: keep them hot
+        if self.clip_path:
+            clip_b64 = get_clip_cache().get_b64(self.clip_path)
+        else:
+            clip_b64 = get_clip_engine().get_clip_b64(self.correct_song_name)
 
         options_payload = []
         for option in self.options:
             song = Song(option, self.songs_db)
             info = song.to_dict()
             info.pop("id", None)
-            cover_path = info['album_cover_image']
-            if cover_path and os.path.isfile(cover_path):
-                with open(cover_path, 'rb') as f:
-                    raw_bytes = f.read()
-                info['album_cover_image'] = base64.b64encode(raw_bytes).decode('ascii')
-            options_payload.append(info)
-
-        # Broadcast start message including clip path & options
-        payload = {
+            # clients fetch the image itself once per cover via get_cover;
+            # option tiles are small, so send the thumbnail rendition
+            options_payload.append(get_album_art().attach(info, THUMB))
+
+        # the results show the full-size cover: read and hash it here too
+        self.answer_info = self._build_answer_info()
+
+        return {
             "round_number": self.round_number,
             "round_time":   self.round_time,
             "options":      options_payload,
             # Clip path could be streamed via server file logic
             "clip_b64":    clip_b64
         }
-        await asyncio.gather(*[p.send_message("round_start", payload)
-                               for p in self.players])
+
+    def _build_answer_info(self) -> Dict[str, Any]:
+        info = Song(self.correct_song_name, self.songs_db).to_dict()
+        info.pop("id", None)
+        return get_album_art().attach(info)
+
+    async def start(self) -> None:
+        """
+        Broadcasts 'round_start', then waits self.round_time seconds
+        or until all players have guessed, then calls end().
+        """
+        # Reset per-round state on each player
+        for p in self.players:
+            p.reset_round()
+
+        # Normally already built by prepare(); build now if not
+        if self.start_payload is None:
+            self.start_payload = self._build_start_payload()
+        # sent once; don't keep the clip alive for the rest of the game
+        payload, self.start_payload = self.start_payload, None
+
+        # Broadcast start message including clip & options
+        await self.game_server.broadcast({"type": "round_start", "data": payload})
 
         self.start_ts = asyncio.get_event_loop().time()
-        # Schedule automatic end
-        asyncio.create_task(self._timer())
+        # Schedule automatic end (cancelled if the round ends early)
+        self._deadline = get_scheduler().call_later(self.round_time, self._on_deadline)
 
-    async def _timer(self) -> None:
-        await asyncio.sleep(self.round_time)
-        await self.end()
+    def _on_deadline(self):
+        # through the game's actor, so it cannot interleave with a guess
+        return self.game_server.call(self.end)
+
+    def cancel_deadline(self) -> None:
+        if self._deadline is not None:
+            self._deadline.cancel()
+            self._deadline = None
+
+    def cancel_timers(self) -> None:
+        """Drop the deadline and any standings not sent yet (the game moved on)."""
+        self.cancel_deadline()
+        if self._standings is not None:
+            self._standings.cancel()
+            self._standings = None
 
     async def register_guess(self, player: Player, guess: str, guess_time: float) -> None:
         """
@@ -127,49 +167,50 @@ class GameRound:
 
     async def end(self):
         """
-        Ends the round: calculates points, sends each player their personal results,
-        then broadcasts the placements table to all players.
+        Ends the round: calculates points, sends each player their personal results
+        (with their rank), and schedules the placements table for RESULTS_PAUSE
+        seconds later. Returns straight away, so the game's actor keeps taking
+        commands during the pause.
         """
         # Prevent multiple end calls
         if hasattr(self, "_ended") and self._ended:
             return
         self._ended = True
+        self.cancel_deadline()
 
         # 1) Calculate and assign points
         await self.calculate_points()
 
-        # 2) Prepare per-player results and send individually
-        for player in self.game_server.players:
-            correct_song = Song(self.correct_song_name, self.songs_db)
-            correct_info = correct_song.to_dict()
-            correct_info.pop("id", None)
-            cover_path = correct_info['album_cover_image']
-            if cover_path and os.path.isfile(cover_path):
-                with open(cover_path, 'rb') as f:
-                    raw_bytes = f.read()
-                correct_info['album_cover_image'] = base64.b64encode(raw_bytes).decode('ascii')
-            else:
-                correct_info['album_cover_image'] = None
-            data = {
-                "correct_answer": correct_info,
+        # 2) Per-player results, queued in batches;
+        # the answer was normally built (cover included) by prepare()
+        correct_info = self.answer_info or self._build_answer_info()
+        leaderboard = self.game_server.leaderboard
+        player_count = len(self.game_server.players)
+        await self.game_server.send_personal(
+            "your_result", {"correct_answer": correct_info}, lambda player: {
                 "correct": player.guessed_correctly,
                 "guess_time": player.guess_time,
                 "points_earned": player.current_round_points,
-                "total_score": player.score
-            }
-            await player.send_message("your_result", data)
+                "total_score": player.score,
+                "rank": leaderboard.rank(player),
+                "player_count": player_count
+            })
 
-        # 3) Short pause before broadcasting the full placements
-        await asyncio.sleep(2)
+        # 3) Placements after a short pause, run on the actor when it fires
+        self._standings = get_scheduler().call_later(
+            RESULTS_PAUSE, self.game_server.call, self.send_standings)
+
+    async def send_standings(self) -> None:
+        """
+        Broadcasts 'round_end' with the placements table to all players
+        (top-N only in an arena).
+        """
+        self._standings = None
+        leaderboard = self.game_server.leaderboard
 
-        # 4) Build placements table sorted by total_score desc
-        sorted_players = sorted(
-            self.game_server.players,
-            key=lambda p: p.score,
-            reverse=True
-        )
+        # 1) Placements straight from the leaderboard (already sorted)
         placements = []
-        for rank, p in enumerate(sorted_players, start=1):
+        for rank, p in leaderboard.top(self.game_server.standings_size):
             placements.append({
                 "placement": rank,
                 "username": p.username,
@@ -177,12 +218,13 @@ class GameRound:
                 "total_score": p.score
             })
 
-        # 5) Broadcast round_end with the placements table
+        # 2) Broadcast round_end with the placements table
         await self.game_server.broadcast({
             "type": "round_end",
             "data": {
                 "round_number": self.round_number,
                 "placements_table": placements,
+                "player_count": len(self.game_server.players),
                 "waiting_for_host": True
             }
         })
@@ -229,4 +271,6 @@ class GameRound:
 
             # 5) Assign
             player.current_round_points = pts
-            player.score += pts
\ No newline at end of file
+            player.score += pts
+            self.game_server.leaderboard.update(player)
+            self.game_server.record("score_changed", player_id=player.id, score=player.score)
\ No newline at end of file
@@ -1,77 +1,243 @@
 # game/game_server.py
 
+import json
 import asyncio
 import random
-from typing import List, Dict, Optional
+from collections import deque
+from typing import Any, Callable, List, Dict, Optional, Tuple
 
 from game.player     import Player
 from game.game_round import GameRound
-from settings        import GAME_SONGS_DIR
+from game.leaderboard import Leaderboard
+from game.clip_catalogue import get_clip_catalogue
+from game.scheduler  import get_scheduler, Timer
+from settings        import (
+    GAME_SONGS_DIR, LOBBY_IDLE_TIMEOUT, GAME_MAX_PLAYERS, ARENA_MAX_PLAYERS,
+    ARENA_TOP_N, RESULT_BATCH_SIZE, DELTA_LOG_SIZE, DELTA_FLUSH_INTERVAL
+)
+
+GAME_MODES = ("classic", "arena")
 
 class GameServer:
-    def __init__(self, game_id, host_player, songs_db):
+    def __init__(self, game_id, host_player, songs_db, mode: str = "classic"):
         self.game_id     = game_id
         self.host        = host_player
         self.players     = []
         self.songs_db    = songs_db
         self.state       = "lobby"   # lobby | playing | ended
+        # arena: hundreds of players, results as top-N plus your own rank
+        self.mode        = mode
+        self.max_players = ARENA_MAX_PLAYERS if mode == "arena" else GAME_MAX_PLAYERS
+        self.leaderboard = Leaderboard()
         self.settings    = {"num_rounds": 10, "round_time": 30}
         self.current_round: Optional[GameRound] = None
         self.round_number = 0
         self.used_songs   = set()
+        # Whole-game plan made at start_game; round n is self._schedule[n-1]
+        self._schedule: List[GameRound] = []
+        self._prepared: Dict[int, asyncio.Task] = {}   # round_number -> prepare()
+        self._kickoff: Optional[asyncio.Task] = None   # round 1, queued by start_game
+        # Called as fn(game_server, player) on this game's actor whenever a
+        # player joins, and whenever one leaves (kick, disconnect, dead
+        # socket); GameHub uses them for its indexes
+        self.on_player_added: Optional[Callable[["GameServer", Player], None]] = None
+        self.on_player_removed: Optional[Callable[["GameServer", Player], None]] = None
+        # Called as fn(game_server) when the game ends or is left empty;
+        # GameHub uses it to schedule pruning
+        self.on_finished: Optional[Callable[["GameServer"], None]] = None
+        # Lobby closes after LOBBY_IDLE_TIMEOUT without joins/leaves/settings
+        self._lobby_idle: Optional[Timer] = None
+        # Versioned state: every change is an op {"v", "op", ...}; ops go out
+        # batched as 'state_delta' and the last DELTA_LOG_SIZE are kept so a
+        # client that missed some can catch up (see resync)
+        self.version = 0
+        self._deltas: deque = deque(maxlen=DELTA_LOG_SIZE)
+        self._pending: List[Dict] = []
+        self._flush_timer: Optional[Timer] = None
+        self._snapshot: Optional[Tuple[int, str]] = None  # (version, encoded game_state)
+        # player.id -> version that client has; players not in here have
+        # not loaded the state yet and get it whole via resync
+        self._synced: Dict[str, int] = {}
+        # Actor: commands for this game run one at a time through call()
+        self._mailbox: deque = deque()
+        self._actor: Optional[asyncio.Task] = None
 
-    # ---------------- Lobby Methods ----------------
+    # ---------------- Actor ----------------
 
-    async def add_player(self, player: Player) -> bool:
-        if self.state != "lobby" or len(self.players) >= 8:
-            return False
-        self.players.append(player)
-        await self.broadcast({
-            "type": "player_joined",
-            "data": {
-                "player_id": player.id,
-                "username": player.username,
-                "player_count": len(self.players)
-            }
-        })
-        # Send the new player the lobby state
-        await player.send_message("game_state", {
+    async def call(self, fn: Callable, *args) -> Any:
+        """
+        Run `await fn(*args)` on this game's actor and return its result.
+        Commands for one game run one at a time in arrival order, so they
+        never interleave, while other games proceed independently.
+        """
+        if self._actor is not None and asyncio.current_task() is self._actor:
+            return await fn(*args)  # already on the actor; queueing would deadlock
+        future = asyncio.get_running_loop().create_future()
+        self._mailbox.append((fn, args, future))
+        if self._actor is None:
+            self._actor = asyncio.create_task(self._run_mailbox())
+        return await future
+
+    async def _run_mailbox(self) -> None:
+        # Runs while commands are queued, then exits; call() restarts it
+        try:
+            while self._mailbox:
+                fn, args, future = self._mailbox.popleft()
+                try:
+                    result = await fn(*args)
+                except Exception as e:
+                    if future.cancelled():
+                        print(f"[ERROR] Game {self.game_id}: {fn.__name__} failed: {e}")
+                    else:
+                        future.set_exception(e)
+                else:
+                    if not future.cancelled():
+                        future.set_result(result)
+        finally:
+            self._actor = None
+
+    @property
+    def idle(self) -> bool:
+        """True when no command is queued or running."""
+        return self._actor is None
+
+    # ---------------- Versioned state ----------------
+
+    def record(self, op: str, **fields) -> None:
+        """
+        Record one state change as the next version and queue it for the
+        next 'state_delta' (sent within DELTA_FLUSH_INTERVAL, or before
+        any other broadcast, whichever is first).
+        """
+        self.version += 1
+        entry = {"v": self.version, "op": op, **fields}
+        self._deltas.append(entry)
+        self._pending.append(entry)
+        if self._flush_timer is None:
+            self._flush_timer = get_scheduler().call_later(
+                DELTA_FLUSH_INTERVAL, self.call, self.flush_deltas)
+
+    async def flush_deltas(self) -> None:
+        """Send every pending op to all players as one 'state_delta'."""
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+            self._flush_timer = None
+        if not self._pending:
+            return
+        ops, self._pending = self._pending, []
+        last = ops[-1]["v"]
+        # skip clients whose full state already covers these ops
+        targets = [p for p in self.players if self._synced.get(p.id, last) < last]
+        for p in targets:
+            self._synced[p.id] = last
+        await self._send_all(json.dumps({"type": "state_delta", "data": {
+            "from_version": ops[0]["v"] - 1,
+            "version": last,
+            "ops": ops
+        }}), "state_delta", targets)
+
+    def snapshot(self) -> Dict:
+        """Full game state at the current version."""
+        return {
+            "version": self.version,
             "game_id": self.game_id,
             "host": self.host.username,
+            "host_id": self.host.id,
             "state": self.state,
+            "mode": self.mode,
+            "max_players": self.max_players,
             "settings": self.settings,
-            "players": [{"id": p.id, "username": p.username} for p in self.players]
-        })
+            "players": [self._player_entry(p) for p in self.players]
+        }
+
+    @staticmethod
+    def _player_entry(player: Player) -> Dict:
+        return {"id": player.id, "username": player.username, "score": player.score}
+
+    async def resync(self, player: Player, version: int) -> None:
+        """
+        Bring a client at `version` up to date: the ops it missed if they
+        are still in the delta log, else a full 'game_state' (encoded once
+        per version, so a burst of joiners shares it).
+        """
+        self._synced[player.id] = self.version
+        oldest = self._deltas[0]["v"] if self._deltas else self.version + 1
+        if 0 <= version <= self.version and oldest <= version + 1:
+            await player.send_message("state_delta", {
+                "from_version": version,
+                "version": self.version,
+                "ops": [d for d in self._deltas if d["v"] > version]
+            })
+            return
+        if self._snapshot is None or self._snapshot[0] != self.version:
+            self._snapshot = (self.version, json.dumps({"type": "game_state",
+                                                        "data": self.snapshot()}))
+        await player.send_raw(self._snapshot[1], "game_state")
+
+    def _set_state(self, state: str) -> None:
+        self.state = state
+        self.record("state_changed", state=state)
+
+    # ---------------- Lobby Methods ----------------
+
+    def _touch_lobby(self) -> None:
+        """Restart the lobby idle timeout after any lobby activity."""
+        if self._lobby_idle is not None:
+            self._lobby_idle.cancel()
+            self._lobby_idle = None
+        if self.state == "lobby" and self.players and LOBBY_IDLE_TIMEOUT > 0:
+            self._lobby_idle = get_scheduler().call_later(
+                LOBBY_IDLE_TIMEOUT, self.call, self._close_idle_lobby)
+
+    async def _close_idle_lobby(self) -> None:
+        self._lobby_idle = None
+        if self.state != "lobby":
+            return
+        self._set_state("ended")
+        await self.flush_deltas()  # clients see the lobby close before the kick
+        for p in list(self.players):
+            await p.send_message("kicked", {"reason": "lobby_idle"})
+            await self.remove_player(p)  # the last one triggers on_finished
+
+    def _finished(self) -> None:
+        if self.on_finished:
+            self.on_finished(self)
+
+    async def add_player(self, player: Player) -> bool:
+        if self.state != "lobby" or len(self.players) >= self.max_players:
+            return False
+        self.players.append(player)
+        self.leaderboard.add(player)
+        if self.on_player_added:
+            self.on_player_added(self, player)
+        self._touch_lobby()
+        # everyone else gets a small delta; the new player pulls the full
+        # state with resync once its lobby page is up
+        self.record("player_added", player=self._player_entry(player))
         return True
 
     async def get_players(self, player: Player):
         await player.send_message("players",{
-            "players": [
-                {"id": p.id, "username": p.username}
-                for p in self.players
-            ]
+            "version": self.version,
+            "players": [self._player_entry(p) for p in self.players]
         })
 
     async def remove_player(self, player: Player):
         if player in self.players:
             self.players.remove(player)
-            await self.broadcast({
-                "type": "player_left",
-                "data": {
-                    "player_id": player.id,
-                    "username": player.username,
-                    "player_count": len(self.players)
-                }
-            })
+            self.leaderboard.remove(player)
+            self._synced.pop(player.id, None)
+            if self.on_player_removed:
+                self.on_player_removed(self, player)
+            self.record("player_removed", player_id=player.id)
             if player == self.host and self.players:
                 self.host = random.choice(self.players)
-                await self.broadcast({
-                    "type": "new_host",
-                    "data": {
-                        "host_id": self.host.id,
-                        "host_username": self.host.username
-                    }
-                })
+                self.record("host_changed", host_id=self.host.id,
+                            host_username=self.host.username)
+            if not self.players:
+                self._finished()
+            elif self.state == "lobby":
+                self._touch_lobby()
 
     async def update_settings(self, new_settings: Dict[str, int]) -> bool:
         if self.state != "lobby":
@@ -87,11 +253,11 @@ class GameServer:
                 valid["round_time"] = rt
         if not valid:
             return False
-        self.settings.update(valid)
-        await self.broadcast({
-            "type": "settings_updated",
-            "data": {"settings": self.settings}
-        })
+        for key, value in valid.items():
+            if self.settings[key] != value:
+                self.settings[key] = value
+                self.record("setting_changed", key=key, value=value)
+        self._touch_lobby()
         return True
 
     # ---------------- Game Lifecycle ----------------
@@ -99,11 +265,22 @@ class GameServer:
     async def start_game(self) -> bool:
         if self.state != "lobby" or not self.players:
             return False
-        self.state = "playing"
+        self._set_state("playing")
+        self._touch_lobby()  # not a lobby any more: drops the idle timeout
         self.round_number = 0
         self.used_songs.clear()
+        # pick up clip folders added/removed since the last game; the
+        # check stats the clip trees (and may rescan), so not on the loop
+        await asyncio.to_thread(get_clip_catalogue().refresh_if_changed)
         for p in self.players:
-            p.score = 0
+            if p.score:
+                p.score = 0
+                self.record("score_changed", player_id=p.id, score=0)
+        self.leaderboard.reset(self.players)
+
+        # Pick every round up front and start building round 1 right away
+        self._schedule = await self._plan_rounds()
+        self._prefetch(1)
 
         await self.broadcast({
             "type": "game_started",
@@ -113,63 +290,151 @@ class GameServer:
                 "players":     [{"id": p.id, "username": p.username} for p in self.players]
             }
         })
-        # kickoff first round
-        asyncio.create_task(self._next_round())
+        # kickoff first round (queued behind this command on the actor);
+        # referenced so it is not collected, and its errors are logged
+        self._kickoff = asyncio.create_task(self.call(self._next_round))
+        self._kickoff.add_done_callback(self._kickoff_done)
         return True
 
+    def _kickoff_done(self, task: asyncio.Task) -> None:
+        self._kickoff = None
+        if not task.cancelled() and task.exception() is not None:
+            print(f"[ERROR] Starting round 1 of game {self.game_id} failed: {task.exception()}")
+
+    async def _plan_rounds(self) -> List[GameRound]:
+        """Choose the song, clip and options of every round of the game."""
+        schedule = []
+        for number in range(1, self.settings["num_rounds"] + 1):
+            rnd = GameRound(
+                round_number=number,
+                players=self.players,
+                songs_db=self.songs_db,
+                round_time=self.settings["round_time"]
+            )
+            # make sure GameRound can reference back to us
+            rnd.game_server = self
+            await rnd.setup(self.used_songs)
+            schedule.append(rnd)
+        return schedule
+
+    def _prefetch(self, number: int) -> None:
+        """Start building round `number`'s assets in the background."""
+        if 1 <= number <= len(self._schedule) and number not in self._prepared:
+            self._prepared[number] = asyncio.create_task(
+                self._schedule[number - 1].prepare())
+
     async def _next_round(self):
+        # the host may move on before the round's timer fires; that timer
+        # must not end whichever round is being played by then
+        if self.current_round is not None:
+            self.current_round.cancel_timers()
         self.round_number += 1
-        if self.round_number > self.settings["num_rounds"]:
+        if self.round_number > len(self._schedule):
             await self.end_game()
             return
 
-        # instantiate and setup
-        self.current_round = GameRound(
-            round_number=self.round_number,
-            players=self.players,
-            songs_db=self.songs_db,
-            round_time=self.settings["round_time"]
-        )
-        # make sure GameRound can reference back to us
-        self.current_round.game_server = self
-
-        await self.current_round.setup(self.used_songs)
-        # start it
+        self.current_round = self._schedule[self.round_number - 1]
+        # normally finished while the previous round was being played
+        self._prefetch(self.round_number)
+        try:
+            await self._prepared.pop(self.round_number)
+        except Exception as e:
+            print(f"[ERROR] Preparing round {self.round_number} failed: {e}")
+
+        # build the following round while this one is played
+        self._prefetch(self.round_number + 1)
         await self.current_round.start()
 
     async def finish_round(self):
-        # called by round.end()
+        # brief inter-round pause on the scheduler, not on the actor
         if self.state == "playing":
-            await asyncio.sleep(1)  # brief inter-round pause
-            await self._next_round()
+            get_scheduler().call_later(1, self.call, self._next_round)
 
     async def end_game(self):
-        self.state = "ended"
-        standings = sorted(self.players, key=lambda p: p.score, reverse=True)
+        self._set_state("ended")
+        if self.current_round is not None:
+            self.current_round.cancel_timers()
+        for task in self._prepared.values():
+            task.cancel()
+        self._prepared.clear()
+        self._finished()
+        standings = self.leaderboard.top(self.standings_size)
         data = {
             "rankings": [
-                {"rank": i+1, "username": p.username, "score": p.score}
-                for i, p in enumerate(standings)
+                {"rank": rank, "username": p.username, "score": p.score}
+                for rank, p in standings
             ],
             "winner": {
-                "username": standings[0].username,
-                "score": standings[0].score
-            } if standings else None
+                "username": standings[0][1].username,
+                "score": standings[0][1].score
+            } if standings else None,
+            "player_count": len(self.players)
         }
-        await self.broadcast({"type": "game_ended", "data": data})
-        await asyncio.sleep(5)
+        await self.send_personal("game_ended", data, lambda p: {
+            "you": {"rank": self.leaderboard.rank(p), "score": p.score}
+        })
+
+    @property
+    def standings_size(self) -> int:
+        """Rows of the standings sent to everyone: all of them, or top-N in an arena."""
+        return ARENA_TOP_N if self.mode == "arena" else len(self.players)
 
     # ---------------- Messaging ----------------
 
     async def broadcast(self, message: Dict):
+        """
+        Encode `message` once and queue it for every player (send_raw only
+        enqueues, so no task per player is needed); players whose socket
+        is closed are removed afterwards.
+        """
+        # state changes recorded before this message must reach clients first
+        if self._pending:
+            await self.flush_deltas()
+        frame = json.dumps({"type": message["type"], "data": message.get("data", {})})
+        await self._send_all(frame, message["type"])
+
+    async def _send_all(self, frame: str, message_type: str,
+                        players: Optional[List[Player]] = None) -> None:
+        players = list(self.players) if players is None else players
+        stale = [p for p in players if not await p.send_raw(frame, message_type)]
+        for p in stale:
+            await self.remove_player(p)
+
+    async def send_personal(self, message_type: str, shared: Dict,
+                            personal: Callable[[Player], Dict]) -> None:
+        """
+        Send each player `shared` plus its own personal(player) fields
+        (personal fields win on a clash).  Frames are queued
+        RESULT_BATCH_SIZE players at a time, yielding to the event loop
+        in between so a big room doesn't stall it.
+        """
+        if self._pending:
+            await self.flush_deltas()
+        players = list(self.players)
         stale = []
-        for p in self.players:
-            ok = await p.send_message(message["type"], message.get("data", {}))
-            if not ok:
-                stale.append(p)
+        for start in range(0, len(players), RESULT_BATCH_SIZE):
+            if start:
+                await asyncio.sleep(0)
+            for p in players[start:start + RESULT_BATCH_SIZE]:
+                frame = json.dumps({"type": message_type,
+                                    "data": {**shared, **personal(p)}})
+                if not await p.send_raw(frame, message_type):
+                    stale.append(p)
         for p in stale:
             await self.remove_player(p)
 
+    def outbound_stats(self) -> Dict:
+        """Send-queue depth and lag across this game's players."""
+        players = list(self.players)
+        return {
+            "players":         len(players),
+            "queue_depth":     sum(p.queue_depth for p in players),
+            "max_queue_depth": max((p.stats["max_queue_depth"] for p in players), default=0),
+            "max_lag_ms":      max((p.stats["max_lag_ms"] for p in players), default=0.0),
+            "dropped":         sum(p.stats["dropped"] for p in players),
+            "coalesced":       sum(p.stats["coalesced"] for p in players),
+        }
+
     async def process_guess(self, player: Player, msg: Dict):
         """
         msg must include:
@@ -0,0 +1,71 @@
+# game/leaderboard.py
+
+from bisect import bisect_left, insort
+from typing import Dict, List, Tuple
+
+from game.player import Player
+
+
+class Leaderboard:
+    """
+    Standings kept sorted as scores change, instead of re-sorting every
+    player at each round end.  Entries are (-score, joined_order,
+    player_id), so a score update is a bisect + list insert and a rank
+    lookup is one bisect.  Tied players share a rank (1, 2, 2, 4).
+    """
+
+    def __init__(self):
+        self._keys: List[Tuple[int, int, str]] = []
+        self._by_id: Dict[str, Tuple[int, int, str]] = {}
+        self._players: Dict[str, Player] = {}
+        self._order = 0
+
+    def add(self, player: Player) -> None:
+        if player.id in self._by_id:
+            return
+        self._order += 1
+        key = (-player.score, self._order, player.id)
+        insort(self._keys, key)
+        self._by_id[player.id] = key
+        self._players[player.id] = player
+
+    def remove(self, player: Player) -> None:
+        key = self._by_id.pop(player.id, None)
+        if key is not None:
+            del self._keys[bisect_left(self._keys, key)]
+            del self._players[player.id]
+
+    def update(self, player: Player) -> None:
+        """Re-position `player` after its score changed."""
+        key = self._by_id.get(player.id)
+        if key is None or -key[0] == player.score:
+            return
+        del self._keys[bisect_left(self._keys, key)]
+        key = (-player.score, key[1], player.id)
+        insort(self._keys, key)
+        self._by_id[player.id] = key
+
+    def reset(self, players: List[Player]) -> None:
+        """Start over with `players` (scores as they are now), in this order."""
+        self._keys, self._by_id, self._players, self._order = [], {}, {}, 0
+        for p in players:
+            self.add(p)
+
+    def rank(self, player: Player) -> int:
+        """1-based rank, or 0 if the player is not on the board."""
+        key = self._by_id.get(player.id)
+        if key is None:
+            return 0
+        return bisect_left(self._keys, (key[0],)) + 1
+
+    def top(self, n: int) -> List[Tuple[int, Player]]:
+        """[(rank, player)] for the first `n` places."""
+        result = []
+        for i, key in enumerate(self._keys[:n]):
+            # shared rank: same score as the previous entry
+            rank = result[-1][0] if result and self._keys[i - 1][0] == key[0] else i + 1
+            result.append((rank, self._players[key[2]]))
+        return result
+
+    def __len__(self) -> int:
+        return len(self._keys)
@@ -1,17 +1,38 @@
 # game/player.py
 
 import uuid
+import time
 import asyncio
 import json
-from typing import Any, Dict
+from collections import deque
+from typing import Any, Dict, Optional
+
+from settings import OUTBOUND_QUEUE_SIZE, OUTBOUND_MAX_LAG
+
+# Only the latest one matters: a newer message replaces a queued older one
+# and goes to the back of the queue, after any deltas queued meanwhile
+COALESCE_TYPES = {"game_state", "players"}
+# May be dropped when a player's queue is full: a missing state_delta
+# shows up as a version gap and the client resyncs
+DROPPABLE_TYPES = {"state_delta"}
+
 
 class Player:
     """
     Represents a connected game participant.
     Tracks identity, connection, and per-round state.
+
+    Outgoing messages go through a bounded per-player queue drained by
+    the player's own writer task, so one slow connection never holds up
+    a broadcast or the round timeline.  When the queue is full, droppable
+    state deltas are discarded; if that is not enough, or the
+    oldest queued message has waited longer than OUTBOUND_MAX_LAG, the
+    player is disconnected.
     """
 
-    def __init__(self, username: str, websocket: Any):
+    def __init__(self, username: str, websocket: Any,
+                 max_queue: int = OUTBOUND_QUEUE_SIZE,
+                 max_lag: float = OUTBOUND_MAX_LAG):
         # Unique per‐connection player ID
         self.id: str = str(uuid.uuid4())
         self.username: str = username
@@ -29,18 +50,120 @@ class Player:
         self.guessed_correctly: bool = False
         self.current_round_points: int = 0
 
+        # Outbound queue: entries are [message_type, frame, enqueued_at]
+        self.max_queue = max_queue
+        self.max_lag = max_lag
+        self.connected: bool = True
+        self._outbox: deque = deque()
+        self._writer: Optional[asyncio.Task] = None
+        self._closing: Optional[asyncio.Task] = None
+        self.stats: Dict[str, float] = {
+            "sent": 0, "dropped": 0, "coalesced": 0,
+            "max_queue_depth": 0, "last_lag_ms": 0.0, "max_lag_ms": 0.0,
+        }
+
     async def send_message(self, message_type: str, data: Dict[str, Any] = {}) -> bool:
         """
-        Send a typed JSON message to this player over their websocket.
-        Returns True on success, False if the connection is closed.
+        Queue a typed JSON message for this player.
+        Returns False if the connection is closed (or was just dropped).
         """
         packet = {"type": message_type, "data": data}
-        try:
-            await self.websocket.send(json.dumps(packet))
-            return True
-        except Exception:
+        return await self.send_raw(json.dumps(packet), message_type)
+
+    async def send_raw(self, frame: str, message_type: Optional[str] = None) -> bool:
+        """
+        Queue an already-encoded JSON frame (lets a broadcast encode once).
+        Returns without waiting for the network; False means the player
+        is disconnected and should be removed.
+        """
+        if not self.connected:
+            return False
+        now = time.monotonic()
+
+        # 1) Slow consumer: oldest message has waited too long
+        if self.max_lag and self._outbox and now - self._outbox[0][2] > self.max_lag:
+            self.disconnect("send_lag")
             return False
 
+        # 2) Coalesce state snapshots still waiting to go out: drop the
+        # stale one; the new one is queued last, as the latest state
+        if message_type in COALESCE_TYPES:
+            for entry in self._outbox:
+                if entry[0] == message_type:
+                    self._outbox.remove(entry)
+                    self.stats["coalesced"] += 1
+                    break
+
+        # 3) Full: make room by dropping state deltas, else give up
+        if len(self._outbox) >= self.max_queue:
+            if message_type in DROPPABLE_TYPES:
+                self.stats["dropped"] += 1
+                return True
+            if not self._drop_one_droppable():
+                self.disconnect("queue_full")
+                return False
+
+        self._outbox.append([message_type, frame, now])
+        self.stats["max_queue_depth"] = max(self.stats["max_queue_depth"], len(self._outbox))
+        if self._writer is None:
+            self._writer = asyncio.create_task(self._write_loop())
+        return True
+
+    def _drop_one_droppable(self) -> bool:
+        for entry in self._outbox:
+            if entry[0] in DROPPABLE_TYPES:
+                self._outbox.remove(entry)
+                self.stats["dropped"] += 1
+                return True
+        return False
+
+    async def _write_loop(self) -> None:
+        # Runs while there is something to send, then exits; send_raw
+        # starts a new one on the next message
+        try:
+            while self._outbox and self.connected:
+                _, frame, enqueued_at = self._outbox.popleft()
+                try:
+                    await self.websocket.send(frame)
+                except Exception:
+                    self.connected = False
+                    self._outbox.clear()
+                    return
+                lag_ms = (time.monotonic() - enqueued_at) * 1000.0
+                self.stats["sent"] += 1
+                self.stats["last_lag_ms"] = round(lag_ms, 2)
+                self.stats["max_lag_ms"] = round(max(self.stats["max_lag_ms"], lag_ms), 2)
+        finally:
+            self._writer = None
+
+    async def drain(self) -> None:
+        """Wait until everything queued so far has been written."""
+        while self._writer is not None:
+            await asyncio.wait({self._writer})
+
+    def disconnect(self, reason: str) -> None:
+        """Drop a player whose connection cannot keep up."""
+        if not self.connected:
+            return
+        print(f"[ERROR] Disconnecting slow player {self.username} ({reason}, "
+              f"{len(self._outbox)} queued)")
+        self.connected = False
+        self._outbox.clear()
+        if self._writer is not None:
+            self._writer.cancel()
+        # referenced until done, so the close is not collected mid-way
+        self._closing = asyncio.create_task(self.websocket.close(code=1013, reason=reason))
+        self._closing.add_done_callback(self._close_done)
+
+    def _close_done(self, task: asyncio.Task) -> None:
+        self._closing = None
+        if not task.cancelled() and task.exception() is not None:
+            print(f"[ERROR] Closing connection of {self.username} failed: {task.exception()}")
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._outbox)
+
     def reset_round(self) -> None:
         """
         Clears all per‐round state in preparation for the next round.
@@ -54,4 +177,4 @@ class Player:
         """
         Call whenever a ping/pong is received to mark the connection as alive.
         """
-        self.last_heartbeat = asyncio.get_event_loop().time()
\ No newline at end of file
+        self.last_heartbeat = asyncio.get_event_loop().time()
@@ -0,0 +1,141 @@
+# game/scheduler.py
+
+import heapq
+import asyncio
+import itertools
+import threading
+from typing import Any, Callable, Dict, List, Optional
+
+
+class Timer:
+    """A scheduled callback; cancel() before it fires to drop it."""
+
+    __slots__ = ("when", "seq", "callback", "args", "cancelled", "_scheduler")
+
+    def __init__(self, when: float, seq: int, callback: Callable, args: tuple,
+                 scheduler: "Scheduler"):
+        self.when = when
+        self.seq = seq
+        self.callback = callback
+        self.args = args
+        self.cancelled = False
+        self._scheduler = scheduler
+
+    def __lt__(self, other: "Timer") -> bool:
+        return (self.when, self.seq) < (other.when, other.seq)
+
+    def cancel(self) -> None:
+        if not self.cancelled:
+            self.cancelled = True
+            self._scheduler._cancelled(self)
+
+
+class Scheduler:
+    """
+    One heap of deadlines for the whole server (round ends, lobby idle
+    timeouts, game pruning, session expiry), instead of a sleeping task
+    or thread per timer.  Only the earliest deadline is armed on the
+    event loop; cancelled timers are dropped lazily and the heap is
+    compacted once they make up most of it.
+
+    Callbacks run on the event loop; if one returns an awaitable it is
+    run as a task, so a slow callback never delays the next deadline.
+    Must be used from the event loop thread.
+    """
+
+    def __init__(self):
+        self._heap: List[Timer] = []
+        self._seq = itertools.count()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._armed: Optional[asyncio.TimerHandle] = None
+        self._armed_at = float("inf")
+        self._dead = 0  # cancelled timers still in the heap
+        self._tasks = set()
+        self.fired = 0
+        self.cancelled = 0
+
+    def time(self) -> float:
+        return asyncio.get_running_loop().time()
+
+    def call_at(self, when: float, callback: Callable, *args) -> Timer:
+        """Run callback(*args) at loop time `when`."""
+        if self._loop is None:
+            self._loop = asyncio.get_running_loop()
+        timer = Timer(when, next(self._seq), callback, args, self)
+        heapq.heappush(self._heap, timer)
+        if when < self._armed_at:
+            self._arm()
+        return timer
+
+    def call_later(self, delay: float, callback: Callable, *args) -> Timer:
+        """Run callback(*args) `delay` seconds from now."""
+        return self.call_at(self.time() + delay, callback, *args)
+
+    def _cancelled(self, timer: Timer) -> None:
+        self.cancelled += 1
+        self._dead += 1
+        if self._dead > 64 and self._dead * 2 > len(self._heap):
+            self._heap = [t for t in self._heap if not t.cancelled]
+            heapq.heapify(self._heap)
+            self._dead = 0
+
+    def _arm(self) -> None:
+        # 1) Drop cancelled timers sitting at the top
+        while self._heap and self._heap[0].cancelled:
+            heapq.heappop(self._heap)
+            self._dead -= 1
+        # 2) Re-arm the single loop timer on the earliest deadline
+        if self._armed is not None:
+            self._armed.cancel()
+            self._armed, self._armed_at = None, float("inf")
+        if self._heap:
+            self._armed_at = self._heap[0].when
+            self._armed = self._loop.call_at(self._armed_at, self._fire)
+
+    def _fire(self) -> None:
+        self._armed, self._armed_at = None, float("inf")
+        now = self._loop.time()
+        while self._heap and self._heap[0].when <= now:
+            timer = heapq.heappop(self._heap)
+            if timer.cancelled:
+                self._dead -= 1
+                continue
+            timer.cancelled = True  # fired: a late cancel() is a no-op
+            self.fired += 1
+            try:
+                result = timer.callback(*timer.args)
+                if asyncio.iscoroutine(result) or isinstance(result, asyncio.Future):
+                    task = asyncio.ensure_future(result)
+                    self._tasks.add(task)
+                    task.add_done_callback(self._task_done)
+            except Exception as e:
+                print(f"[ERROR] Timer {getattr(timer.callback, '__name__', timer.callback)} failed: {e}")
+        self._arm()
+
+    def _task_done(self, task: asyncio.Task) -> None:
+        self._tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            print(f"[ERROR] Timer task failed: {task.exception()}")
+
+    @property
+    def live(self) -> int:
+        """Timers scheduled and neither fired nor cancelled."""
+        return len(self._heap) - self._dead
+
+    def stats(self) -> Dict[str, Any]:
+        return {"live": self.live, "running": len(self._tasks),
+                "fired": self.fired, "cancelled": self.cancelled}
+
+
+# Process-wide scheduler, created on first use
+_scheduler: Optional[Scheduler] = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler() -> Scheduler:
+    global _scheduler
+    if _scheduler is None:
+        with _scheduler_lock:
+            if _scheduler is None:
+                _scheduler = Scheduler()
+    return _scheduler
@@ -14,7 +14,8 @@ class Song:
                  song_name: str,
                  db: SongDatabase):
         """
-        Load the song record by its unique name.
+        Load the song record by its unique name.  `db` may be a
+        SongDatabase or the in-memory SongCatalogue.
         Raises ValueError if not found.
         """
         row = db.get_song_by_name(song_name)
@@ -5,7 +5,7 @@ class Song {
   final String songName;
   final String artistName;
   final String? albumName;
-  final String? albumCoverImage;
+  final String? albumCoverId;
   final String albumType;
   final String? releaseDate;
   final String? spotifyUrl;
@@ -15,7 +15,7 @@ class Song {
     required this.songName,
     required this.artistName,
     this.albumName,
-    this.albumCoverImage,
+    this.albumCoverId,
     required this.albumType,
     this.releaseDate,
     this.spotifyUrl,
@@ -26,7 +26,7 @@ class Song {
         songName: json['song_name'] as String,
         artistName: json['artist_name'] as String,
         albumName: json['album_name'] as String?,
-        albumCoverImage: json['album_cover_image'] as String?,
+        albumCoverId: json['album_cover_id'] as String?,
         albumType: json['album_type'] as String,
         releaseDate: json['release_date'] as String?,
         spotifyUrl: json['spotify_url'] as String?,
@@ -1,9 +1,9 @@
 // lib/pages/answer_page.dart
 
 import 'dart:async';
-import 'dart:convert';
 import 'package:flutter/material.dart';
 import '../services/api_service.dart';
+import '../widgets/cover_image.dart';
 
 class AnswerPage extends StatefulWidget {
   const AnswerPage({super.key});
@@ -19,6 +19,8 @@ class _AnswerPageState extends State<AnswerPage> {
   late bool _correct;
   late int _pointsEarned;
   late int _totalScore;
+  int? _rank;
+  int? _playerCount;
   late Map<String, dynamic> _correctSong;
 
   @override
@@ -32,6 +34,8 @@ class _AnswerPageState extends State<AnswerPage> {
     _correct = data['correct'] as bool;
     _pointsEarned = data['points_earned'] as int;
     _totalScore = data['total_score'] as int;
+    _rank = data['rank'] as int?;
+    _playerCount = data['player_count'] as int?;
     _correctSong = Map<String, dynamic>.from(data['correct_answer'] as Map);
 
     // subscribe to round_end exactly once
@@ -56,11 +60,11 @@ class _AnswerPageState extends State<AnswerPage> {
 
   @override
   Widget build(BuildContext context) {
-    final b64 = _correctSong['album_cover_image'] as String?;
-    final Widget img = (b64 != null && b64.isNotEmpty)
-        ? Image.memory(base64Decode(b64),
-            width: 140, height: 140, fit: BoxFit.cover)
-        : const Icon(Icons.music_note, size: 140);
+    final Widget img = CoverImage(
+        coverId: _correctSong['album_cover_id'] as String?,
+        width: 140,
+        height: 140,
+        placeholder: const Icon(Icons.music_note, size: 140));
 
     return Scaffold(
       appBar: AppBar(title: const Text('Answer')),
@@ -97,6 +101,11 @@ class _AnswerPageState extends State<AnswerPage> {
             ],
             Text('Total score: $_totalScore',
                 style: const TextStyle(fontSize: 18)),
+            if (_rank != null && _playerCount != null) ...[
+              const SizedBox(height: 8),
+              Text('Rank: $_rank of $_playerCount',
+                  style: const TextStyle(fontSize: 18)),
+            ],
             const Spacer(),
             const Text(
               'Waiting for next round...',
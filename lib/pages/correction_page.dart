@@ -1,10 +1,9 @@
 // lib/pages/correction_page.dart
 
-import 'dart:convert';
-import 'dart:typed_data';
 import 'package:flutter/material.dart';
 import '../theme.dart';
 import '../services/prediction_service.dart';
+import '../widgets/cover_image.dart';
 
 class CorrectionPage extends StatelessWidget {
   const CorrectionPage({super.key});
@@ -15,12 +14,7 @@ class CorrectionPage extends StatelessWidget {
         ModalRoute.of(context)!.settings.arguments as Map<String, dynamic>;
     final song = data['song_name'] as String;
     final artist = data['artist_name'] as String;
-    final b64 = data['album_cover_image'] as String?;
-
-    Uint8List? bytes;
-    if (b64 != null && b64.isNotEmpty) {
-      bytes = base64Decode(b64);
-    }
+    final coverId = data['album_cover_id'] as String?;
 
     return Scaffold(
       appBar: AppBar(title: const Text('Was this correct?')),
@@ -35,11 +29,15 @@ class CorrectionPage extends StatelessWidget {
             CircleAvatar(
               radius: 60,
               backgroundColor: Colors.grey.shade200,
-              backgroundImage: bytes != null ? MemoryImage(bytes) : null,
-              child: bytes == null
-                  ? const Icon(Icons.music_note,
-                      size: 48, color: Colors.black54)
-                  : null,
+              child: ClipOval(
+                child: CoverImage(
+                  coverId: coverId,
+                  width: 120,
+                  height: 120,
+                  placeholder: const Icon(Icons.music_note,
+                      size: 48, color: Colors.black54),
+                ),
+              ),
             ),
             const SizedBox(height: 24),
             Text(song,
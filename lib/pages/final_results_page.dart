@@ -12,6 +12,9 @@ class FinalResultsPage extends StatelessWidget {
         ModalRoute.of(context)!.settings.arguments as Map<String, dynamic>;
     final rankings = List<Map<String, dynamic>>.from(args['rankings'] as List);
     final winner = args['winner'] as Map<String, dynamic>?;
+    // arena rooms send only the top places plus your own standing
+    final you = args['you'] as Map<String, dynamic>?;
+    final playerCount = args['player_count'] as int?;
 
     return Scaffold(
       appBar: AppBar(title: const Text('Game Over')),
@@ -37,6 +40,14 @@ class FinalResultsPage extends StatelessWidget {
               ),
               const SizedBox(height: 24),
             ],
+            if (you != null && playerCount != null) ...[
+              Text(
+                'Your place: ${you['rank']} of $playerCount (${you['score']} pts)',
+                style: const TextStyle(fontSize: 18),
+                textAlign: TextAlign.center,
+              ),
+              const SizedBox(height: 16),
+            ],
             Expanded(
               child: SingleChildScrollView(
                 scrollDirection: Axis.horizontal,
@@ -83,6 +83,49 @@ class GameHubPage extends StatelessWidget {
               // Space between buttons
               const SizedBox(height: verticalSpacing),
 
+              // Create Arena button (large rooms for events)
+              Center(
+                child: SizedBox(
+                  width: buttonWidth,
+                  height: buttonHeight,
+                  child: ElevatedButton(
+                    style: ElevatedButton.styleFrom(
+                      backgroundColor: AppTheme.primaryColor,
+                      shape: RoundedRectangleBorder(
+                        borderRadius: BorderRadius.circular(12),
+                      ),
+                    ),
+                    onPressed: () async {
+                      final res = await GameService.createGame(mode: 'arena');
+                      if (res.success && res.gameId != null) {
+                        Navigator.pushReplacementNamed(
+                          context,
+                          '/lobby',
+                          arguments: {
+                            'gameId': res.gameId!,
+                            'isHost': true,
+                          },
+                        );
+                      } else {
+                        ScaffoldMessenger.of(context).showSnackBar(
+                          SnackBar(content: Text(res.error ?? 'Create failed')),
+                        );
+                      }
+                    },
+                    child: const Text(
+                      'Create Arena',
+                      style: TextStyle(
+                        fontSize: 18,
+                        color: Colors.white,
+                      ),
+                    ),
+                  ),
+                ),
+              ),
+
+              // Space between buttons
+              const SizedBox(height: verticalSpacing),
+
               // Join Game button
               Center(
                 child: SizedBox(
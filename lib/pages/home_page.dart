@@ -1,9 +1,9 @@
 // lib/pages/home_page.dart
 
-import 'dart:convert';
 import 'package:flutter/material.dart';
 import '../theme.dart';
 import '../services/api_service.dart';
+import '../widgets/cover_image.dart';
 
 class HomePage extends StatefulWidget {
   const HomePage({super.key});
@@ -178,37 +178,23 @@ class _HomePageState extends State<HomePage> {
                       itemCount: history.length,
                       itemBuilder: (context, i) {
                         final item = history[i];
-                        final b64 = item['album_cover_image'] as String?;
-                        final imageBytes = (b64 != null && b64.isNotEmpty)
-                            ? base64Decode(b64)
-                            : null;
-
-                        Widget avatar = (imageBytes != null)
-                            ? Container(
-                                width: 72,
-                                height: 72,
-                                decoration: BoxDecoration(
-                                  image: DecorationImage(
-                                    image: MemoryImage(imageBytes),
-                                    fit: BoxFit.cover,
-                                  ),
-                                  borderRadius: BorderRadius.circular(4),
-                                  border:
-                                      Border.all(color: Colors.grey.shade300),
-                                ),
-                              )
-                            : Container(
-                                width: 72,
-                                height: 72,
-                                decoration: BoxDecoration(
-                                  color: Colors.grey.shade200,
-                                  borderRadius: BorderRadius.circular(4),
-                                  border:
-                                      Border.all(color: Colors.grey.shade300),
-                                ),
-                                child: const Icon(Icons.music_note,
-                                    size: 28, color: Colors.black54),
-                              );
+                        Widget avatar = Container(
+                          width: 72,
+                          height: 72,
+                          clipBehavior: Clip.antiAlias,
+                          decoration: BoxDecoration(
+                            color: Colors.grey.shade200,
+                            borderRadius: BorderRadius.circular(4),
+                            border: Border.all(color: Colors.grey.shade300),
+                          ),
+                          child: CoverImage(
+                            coverId: item['album_cover_id'] as String?,
+                            width: 72,
+                            height: 72,
+                            placeholder: const Icon(Icons.music_note,
+                                size: 28, color: Colors.black54),
+                          ),
+                        );
 
                         // Wrap the tile in InkWell:
                         return InkWell(
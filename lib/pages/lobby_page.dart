@@ -19,6 +19,16 @@ class _LobbyPageState extends State<LobbyPage> {
   StreamSubscription<Map<String, dynamic>>? _sub;
   List<Map<String, dynamic>> _players = [];
   Map<String, int> _settings = {'num_rounds': 10, 'round_time': 30};
+  // Version of the game state shown; null until the first game_state
+  int? _version;
+  bool _resyncPending = false;
+  // Host and lobby state as the server sees them (the host can change)
+  String? _hostId;
+  String _state = 'lobby';
+  bool _leaving = false;
+
+  bool get _isHost => _players
+      .any((p) => p['id'] == _hostId && p['username'] == _api.username);
 
   @override
   void initState() {
@@ -34,11 +44,9 @@ class _LobbyPageState extends State<LobbyPage> {
         //_api.joinLobby(_gameId!);
       }
 
-      // In either case, start listening once
+      // In either case, start listening once, then pull the full state
       _sub = _api.messages.listen(_onMessage);
-      _api.getLobbyPlayers().then((players) {
-        if (mounted) setState(() => _players = players);
-      });
+      _resync(-1);
       setState(() {}); // fire a rebuild so build() sees non-null _gameId
     });
   }
@@ -49,6 +57,49 @@ class _LobbyPageState extends State<LobbyPage> {
     super.dispose();
   }
 
+  void _resync(int fromVersion) {
+    if (_resyncPending) return;
+    _resyncPending = true;
+    _api.resyncGame(fromVersion);
+  }
+
+  void _leaveLobby(String message) {
+    if (_leaving || !mounted) return;
+    _leaving = true;
+    ScaffoldMessenger.of(context).showSnackBar(
+      SnackBar(content: Text(message)),
+    );
+    Navigator.pushReplacementNamed(context, '/game_hub');
+  }
+
+  /// Apply one state op from a `state_delta`.
+  void _applyOp(Map<String, dynamic> op) {
+    switch (op['op'] as String) {
+      case 'player_added':
+        final p = Map<String, dynamic>.from(op['player'] as Map);
+        _players.removeWhere((e) => e['id'] == p['id']);
+        _players.add(p);
+        break;
+      case 'player_removed':
+        _players.removeWhere((e) => e['id'] == op['player_id']);
+        break;
+      case 'setting_changed':
+        _settings[op['key'] as String] = op['value'] as int;
+        break;
+      case 'score_changed':
+        for (final p in _players) {
+          if (p['id'] == op['player_id']) p['score'] = op['score'];
+        }
+        break;
+      case 'host_changed':
+        _hostId = op['host_id'] as String;
+        break;
+      case 'state_changed':
+        _state = op['state'] as String;
+        break;
+    }
+  }
+
   void _onMessage(Map<String, dynamic> msg) {
     final action = (msg['action'] as String?)?.toLowerCase() ??
         (msg['type'] as String?)?.toLowerCase() ??
@@ -56,7 +107,7 @@ class _LobbyPageState extends State<LobbyPage> {
     final data = msg['data'] as Map<String, dynamic>? ?? {};
 
     switch (action) {
-      // Initial full state
+      // Full state (first load, or too far behind for deltas)
       case 'game_state':
         final s = data['settings'] as Map<String, dynamic>;
         final list = List<Map<String, dynamic>>.from(data['players'] as List);
@@ -66,39 +117,33 @@ class _LobbyPageState extends State<LobbyPage> {
             'round_time': s['round_time'] as int,
           };
           _players = list;
+          _hostId = data['host_id'] as String;
+          _state = data['state'] as String;
+          _version = data['version'] as int;
+          _resyncPending = false;
         });
+        if (_state == 'ended') _leaveLobby('This lobby has closed');
         break;
 
-      // Add one
-      case 'player_joined':
-        final newPlayer = {
-          'id': data['player_id'],
-          'username': data['username'],
-        };
-        setState(() {
-          // avoid dupes
-          _players.removeWhere((p) => p['id'] == newPlayer['id']);
-          _players.add(newPlayer);
-        });
-        break;
-
-      // Remove one
-      case 'player_left':
-        final leftId = data['player_id'];
-        setState(() {
-          _players.removeWhere((p) => p['id'] == leftId);
-        });
-        break;
-
-      // Settings change
-      case 'settings_updated':
-        final s = data['settings'] as Map<String, dynamic>;
+      // Changes since from_version; ops at or below our version are old
+      case 'state_delta':
+        final version = _version;
+        if (version == null) break; // full state still on its way
+        if ((data['from_version'] as int) > version) {
+          _resync(version); // missed some: fetch what's missing
+          break;
+        }
+        _resyncPending = false;
+        final ops = List<Map<String, dynamic>>.from(data['ops'] as List);
         setState(() {
-          _settings = {
-            'num_rounds': s['num_rounds'] as int,
-            'round_time': s['round_time'] as int,
-          };
+          for (final op in ops) {
+            final v = op['v'] as int;
+            if (v <= _version!) continue;
+            _applyOp(op);
+            _version = v;
+          }
         });
+        if (_state == 'ended') _leaveLobby('This lobby has closed');
         break;
 
       // Round start
@@ -108,10 +153,9 @@ class _LobbyPageState extends State<LobbyPage> {
 
       // Kicked out
       case 'kicked':
-        ScaffoldMessenger.of(context).showSnackBar(
-          const SnackBar(content: Text('You were removed from the lobby')),
-        );
-        Navigator.pushReplacementNamed(context, '/game_hub');
+        _leaveLobby(data['reason'] == 'lobby_idle'
+            ? 'The lobby closed after being idle'
+            : 'You were removed from the lobby');
         break;
     }
   }
@@ -181,7 +225,8 @@ class _LobbyPageState extends State<LobbyPage> {
               _buildSettingCircle('Time', 'round_time'),
               const SizedBox(width: 32),
               ElevatedButton(
-                onPressed: _startGame,
+                // only the current host may start; others wait for round_start
+                onPressed: _isHost ? _startGame : null,
                 style: ElevatedButton.styleFrom(
                   backgroundColor: AppTheme.primaryColor,
                   padding:
@@ -202,9 +247,12 @@ class _LobbyPageState extends State<LobbyPage> {
                   final username = p['username'] as String;
                   final isSelf = username == _api.username;
                   return ListTile(
+                    leading: p['id'] == _hostId
+                        ? const Icon(Icons.star, color: AppTheme.primaryColor)
+                        : null,
                     title: Text(username, style: const TextStyle(fontSize: 16)),
                     tileColor: isSelf ? AppTheme.primaryLightColor : null,
-                    trailing: isSelf
+                    trailing: isSelf || !_isHost
                         ? null
                         : IconButton(
                             icon: const Icon(Icons.person_remove,
@@ -223,7 +271,7 @@ class _LobbyPageState extends State<LobbyPage> {
 
   Widget _buildSettingCircle(String label, String key) {
     return GestureDetector(
-      onTap: () => _updateSetting(key),
+      onTap: _isHost ? () => _updateSetting(key) : null,
       child: Column(
         children: [
           CircleAvatar(
@@ -9,6 +9,8 @@ import 'package:path_provider/path_provider.dart';
 import 'package:audioplayers/audioplayers.dart';
 
 import '../services/api_service.dart';
+import '../services/cover_service.dart';
+import '../widgets/cover_image.dart';
 
 class RoundPage extends StatefulWidget {
   const RoundPage({super.key});
@@ -44,21 +46,15 @@ class _RoundPageState extends State<RoundPage> {
     _clipBase64 = args['clip_b64'] as String;
     _rawOptions = List<Map<String, dynamic>>.from(args['options'] as List);
 
-    // Decode options into typed list with cached images
+    // Typed options; covers already seen this session come from the cache
     _songOptions = _rawOptions.map((opt) {
-      final b64 = opt['album_cover_image'] as String?;
-      ImageProvider img;
-      if (b64 != null && b64.isNotEmpty) {
-        img = MemoryImage(base64Decode(b64));
-      } else {
-        img = const AssetImage('assets/default_album.png');
-      }
       return _SongOption(
         songName: opt['song_name'] as String,
         artistName: opt['artist_name'] as String,
-        albumArt: img,
+        albumCoverId: opt['album_cover_id'] as String?,
       );
     }).toList();
+    CoverService().prefetch(_songOptions.map((o) => o.albumCoverId));
 
     // Prepare and play the clip
     _prepareClip(_clipBase64).then((path) {
@@ -175,10 +171,14 @@ class _RoundPageState extends State<RoundPage> {
                           Expanded(
                             child: ClipRRect(
                               borderRadius: BorderRadius.circular(8),
-                              child: Image(
-                                  image: opt.albumArt,
-                                  fit: BoxFit.cover,
-                                  width: double.infinity),
+                              child: CoverImage(
+                                  coverId: opt.albumCoverId,
+                                  width: double.infinity,
+                                  placeholder: const Image(
+                                      image: AssetImage(
+                                          'assets/default_album.png'),
+                                      fit: BoxFit.cover,
+                                      width: double.infinity)),
                             ),
                           ),
                           const SizedBox(height: 12),
@@ -206,10 +206,10 @@ class _RoundPageState extends State<RoundPage> {
 class _SongOption {
   final String songName;
   final String artistName;
-  final ImageProvider albumArt;
+  final String? albumCoverId;
   _SongOption({
     required this.songName,
     required this.artistName,
-    required this.albumArt,
+    required this.albumCoverId,
   });
 }
@@ -1,10 +1,10 @@
 // lib/pages/song_page.dart
 
-import 'dart:convert';
 import 'package:flutter/material.dart';
 import 'package:url_launcher/url_launcher.dart';
 import '../theme.dart';
 import '../services/api_service.dart';
+import '../widgets/cover_image.dart';
 
 class SongPage extends StatefulWidget {
   const SongPage({Key? key}) : super(key: key);
@@ -68,7 +68,6 @@ class _SongPageState extends State<SongPage> {
             itemCount: history.length,
             itemBuilder: (context, index) {
               final song = history[index];
-              final b64 = song['album_cover_image'] as String?;
               Widget cover = Container(
                 width: 240,
                 height: 240,
@@ -76,21 +75,21 @@ class _SongPageState extends State<SongPage> {
                   color: Colors.grey.shade200,
                   borderRadius: BorderRadius.circular(12),
                 ),
-                child: (b64 != null && b64.isNotEmpty)
-                    ? ClipRRect(
-                        borderRadius: BorderRadius.circular(12),
-                        child: Image.memory(
-                          base64Decode(b64),
-                          fit: BoxFit.cover,
-                        ),
-                      )
-                    : const Center(
-                        child: Icon(
-                          Icons.music_note,
-                          size: 64,
-                          color: Colors.grey,
-                        ),
-                      ),
+                child: ClipRRect(
+                  borderRadius: BorderRadius.circular(12),
+                  child: CoverImage(
+                    // large card: the full image, not the list thumbnail
+                    coverId: (song['album_cover_full_id'] ??
+                        song['album_cover_id']) as String?,
+                    width: 240,
+                    height: 240,
+                    placeholder: const Icon(
+                      Icons.music_note,
+                      size: 64,
+                      color: Colors.grey,
+                    ),
+                  ),
+                ),
               );
 
               // Fields
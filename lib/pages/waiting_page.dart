@@ -1,9 +1,9 @@
 // lib/pages/waiting_page.dart
 
 import 'dart:async';
-import 'dart:convert';
 import 'package:flutter/material.dart';
 import '../services/api_service.dart';
+import '../widgets/cover_image.dart';
 
 class WaitingPage extends StatefulWidget {
   const WaitingPage({super.key});
@@ -52,11 +52,11 @@ class _WaitingPageState extends State<WaitingPage> {
 
   @override
   Widget build(BuildContext context) {
-    final b64 = _selectedRaw['album_cover_image'] as String?;
-    final Widget img = (b64 != null && b64.isNotEmpty)
-        ? Image.memory(base64Decode(b64),
-            width: 120, height: 120, fit: BoxFit.cover)
-        : const Icon(Icons.music_note, size: 120);
+    final Widget img = CoverImage(
+        coverId: _selectedRaw['album_cover_id'] as String?,
+        width: 120,
+        height: 120,
+        placeholder: const Icon(Icons.music_note, size: 120));
 
     return Scaffold(
       appBar: AppBar(title: Text('Round $_roundNumber')),
@@ -91,12 +91,16 @@ class ApiService {
 
   // -------------------- History -------------------- //
 
-  Future<Map<String, dynamic>> getHistory() async {
+  /// [since] is the highest `history_id` already held, so only newer
+  /// entries are returned; [offset]/[limit] page through the result.
+  Future<Map<String, dynamic>> getHistory(
+      {int? since, int? offset, int? limit}) async {
     if (_token == null) throw Exception('Not authenticated');
-    await send({
-      'action': 'get_history',
-      'data': {'token': _token}
-    });
+    final Map<String, dynamic> data = {'token': _token};
+    if (since != null) data['since'] = since;
+    if (offset != null) data['offset'] = offset;
+    if (limit != null) data['limit'] = limit;
+    await send({'action': 'get_history', 'data': data});
     return await messages.firstWhere((m) => m.containsKey('status'));
   }
 
@@ -125,11 +129,12 @@ class ApiService {
 
   // -------------------- Game -------------------- //
 
-  Future<Map<String, dynamic>> createGame() async {
+  /// [mode] is 'classic' (up to 8 players) or 'arena' (large rooms).
+  Future<Map<String, dynamic>> createGame({String mode = 'classic'}) async {
     if (_token == null) throw Exception('Not authenticated');
     await send({
       'action': 'create_game',
-      'data': {'token': _token}
+      'data': {'token': _token, 'mode': mode}
     });
     return await messages.firstWhere((m) => m.containsKey('status'));
   }
@@ -164,16 +169,15 @@ class ApiService {
     });
   }
 
-  /// Fetch the current lobby’s players list.
-  Future<List<Map<String, dynamic>>> getLobbyPlayers() async {
+  /// Ask for game state changes since [version]; the reply arrives on
+  /// [messages] as a `state_delta`, or a full `game_state` when
+  /// [version] is -1 or too old.
+  Future<void> resyncGame(int version) async {
     if (_token == null) throw Exception('Not authenticated');
     await send({
-      'action': 'get_players',
-      'data': {'token': _token},
+      'action': 'resync',
+      'data': {'token': _token, 'version': version},
     });
-    final msg = await messages.firstWhere((m) => m['type'] == 'players');
-    final data = msg['data'] as Map<String, dynamic>;
-    return List<Map<String, dynamic>>.from(data['players'] as List);
   }
 
   /// Update number of rounds and/or round duration
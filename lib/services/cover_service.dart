@@ -0,0 +1,101 @@
+// lib/services/cover_service.dart
+
+import 'dart:async';
+import 'dart:convert';
+import 'dart:typed_data';
+
+import 'api_service.dart';
+
+/// Client-side album-art cache.
+///
+/// Server messages carry an `album_cover_id` (a hash of the image bytes)
+/// instead of the image itself. Each id is fetched once with the
+/// `get_cover` action and kept for the session; the id changes whenever
+/// the image does, so a cached cover is never stale.
+class CoverService {
+  // Singleton
+  static final CoverService _instance = CoverService._internal();
+  factory CoverService() => _instance;
+  CoverService._internal();
+
+  static const int _maxEntries = 512;
+  static const int _maxIdsPerRequest = 32; // server-side cap
+
+  final ApiService _api = ApiService();
+  final Map<String, Uint8List> _cache = {};
+  final Map<String, Completer<Uint8List?>> _pending = {};
+  final List<String> _queued = [];
+  StreamSubscription<Map<String, dynamic>>? _sub;
+
+  /// Bytes for [id] if already held, without touching the network.
+  Uint8List? cached(String? id) => id == null ? null : _cache[id];
+
+  /// Bytes for [id], fetching them if needed. Completes with null when
+  /// the cover is unknown or the request could not be sent.
+  Future<Uint8List?> get(String? id) {
+    if (id == null || id.isEmpty) return Future.value(null);
+    final hit = _cache[id];
+    if (hit != null) return Future.value(hit);
+    final pending = _pending[id];
+    if (pending != null) return pending.future;
+
+    final completer = Completer<Uint8List?>();
+    _pending[id] = completer;
+    // Batch every id requested in the same frame into one get_cover call
+    if (_queued.isEmpty) scheduleMicrotask(_flush);
+    _queued.add(id);
+    return completer.future;
+  }
+
+  /// Start fetching covers that are about to be shown.
+  void prefetch(Iterable<String?> ids) {
+    for (final id in ids) {
+      get(id);
+    }
+  }
+
+  Future<void> _flush() async {
+    final ids = List<String>.from(_queued);
+    _queued.clear();
+    final token = _api.token;
+    if (token == null) {
+      _fail(ids);
+      return;
+    }
+    _sub ??= _api.messages.listen(_onMessage, onDone: () => _sub = null);
+    for (var i = 0; i < ids.length; i += _maxIdsPerRequest) {
+      final chunk = ids.sublist(
+          i, i + _maxIdsPerRequest > ids.length ? ids.length : i + _maxIdsPerRequest);
+      try {
+        await _api.send({
+          'action': 'get_cover',
+          'data': {'token': token, 'cover_ids': chunk},
+        });
+      } catch (_) {
+        _fail(chunk);
+      }
+    }
+  }
+
+  void _onMessage(Map<String, dynamic> msg) {
+    if (msg['type'] != 'covers') return;
+    final covers = (msg['data']?['covers'] as Map?) ?? const {};
+    covers.forEach((id, b64) {
+      Uint8List? bytes;
+      if (b64 is String && b64.isNotEmpty) {
+        bytes = base64Decode(b64);
+        _cache[id as String] = bytes;
+        if (_cache.length > _maxEntries) {
+          _cache.remove(_cache.keys.first);
+        }
+      }
+      _pending.remove(id)?.complete(bytes);
+    });
+  }
+
+  void _fail(Iterable<String> ids) {
+    for (final id in ids) {
+      _pending.remove(id)?.complete(null);
+    }
+  }
+}
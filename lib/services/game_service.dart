@@ -21,10 +21,11 @@ class GameService {
   static final ApiService _api = ApiService();
 
   /// Connects (if needed) and sends the create_game request.
-  static Future<CreateGameResult> createGame() async {
+  /// [mode] is 'classic' or 'arena'.
+  static Future<CreateGameResult> createGame({String mode = 'classic'}) async {
     try {
       await _api.connect();
-      final resp = await _api.createGame(); // calls ApiService.createGame()
+      final resp = await _api.createGame(mode: mode); // calls ApiService.createGame()
       print('[GameService] createGame response → $resp');
       if (resp['status'] == 'ok' && resp['game_id'] is String) {
         return CreateGameResult(
@@ -4,12 +4,22 @@ import 'dart:io';
 import '../services/api_service.dart';
 
 class PredictionService {
+  static const int _warmupRetries = 5;
+  static const Duration _warmupRetryDelay = Duration(seconds: 2);
+
   /// Ensures WS is connected, sends the WAV bytes, and returns the song payload.
   static Future<Map<String, dynamic>> predict(File wavFile) async {
     final api = ApiService();
     await api.connect();
     final bytes = await wavFile.readAsBytes();
-    final resp = await api.predict(bytes, format: 'wav');
+    var resp = await api.predict(bytes, format: 'wav');
+    // Server is still loading the model right after startup; retry briefly.
+    for (var attempt = 0;
+        resp['status'] == 'warming_up' && attempt < _warmupRetries;
+        attempt++) {
+      await Future.delayed(_warmupRetryDelay);
+      resp = await api.predict(bytes, format: 'wav');
+    }
     if (resp['status'] == 'ok' && resp['song'] is Map<String, dynamic>) {
       return Map<String, dynamic>.from(resp['song'] as Map);
     }
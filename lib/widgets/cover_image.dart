@@ -0,0 +1,41 @@
+// lib/widgets/cover_image.dart
+
+import 'dart:typed_data';
+import 'package:flutter/material.dart';
+import '../services/cover_service.dart';
+
+/// Album cover looked up by `album_cover_id` through [CoverService].
+/// Shows [placeholder] while the image is loading or when there is none.
+class CoverImage extends StatelessWidget {
+  final String? coverId;
+  final double? width;
+  final double? height;
+  final BoxFit fit;
+  final Widget placeholder;
+
+  const CoverImage({
+    super.key,
+    required this.coverId,
+    this.width,
+    this.height,
+    this.fit = BoxFit.cover,
+    this.placeholder = const Icon(Icons.music_note),
+  });
+
+  @override
+  Widget build(BuildContext context) {
+    final covers = CoverService();
+    return FutureBuilder<Uint8List?>(
+      future: covers.get(coverId),
+      initialData: covers.cached(coverId),
+      builder: (context, snapshot) {
+        final bytes = snapshot.data;
+        if (bytes == null) {
+          return SizedBox(width: width, height: height, child: Center(child: placeholder));
+        }
+        return Image.memory(bytes, width: width, height: height, fit: fit,
+            gaplessPlayback: true);
+      },
+    );
+  }
+}
@@ -0,0 +1,146 @@
+# model/checkpoint_format.py
+
+import os
+import sys
+import json
+import struct
+import threading
+from typing import Dict, Tuple
+
+import torch
+
+# File layout:
+#   MAGIC (8 bytes) | header length (uint64 LE) | JSON header | padding | tensor data
+# Every tensor starts on an ALIGNMENT boundary so it can be viewed in place
+# from a single read-only mapping of the file.
+MAGIC     = b"FMTCKPT1"
+ALIGNMENT = 64
+
+_DTYPES = {
+    "float32": torch.float32,
+    "float16": torch.float16,
+    "bfloat16": torch.bfloat16,
+    "int64":   torch.int64,
+    "int32":   torch.int32,
+    "uint8":   torch.uint8,
+}
+
+# path -> (mtime, checkpoint); lets every pool member in a process share one mapping
+_cache: Dict[str, Tuple[float, dict]] = {}
+_cache_lock = threading.Lock()
+
+
+def _align(n: int) -> int:
+    return (n + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+def is_mmap_checkpoint(path: str) -> bool:
+    """True if `path` starts with this format's magic bytes."""
+    try:
+        with open(path, "rb") as f:
+            return f.read(len(MAGIC)) == MAGIC
+    except OSError:
+        return False
+
+
+def save_mmap_checkpoint(checkpoint: dict, path: str) -> None:
+    """
+    Write a classification checkpoint (the dict `train` saves) as a JSON
+    header plus flat, aligned tensor data. The write is atomic.
+    """
+    state_dict = checkpoint["model_state_dict"]
+    metadata = {k: v for k, v in checkpoint.items() if k != "model_state_dict"}
+    # JSON object keys must be strings; restored to ints on load
+    if "labels_to_songs" in metadata:
+        metadata["labels_to_songs"] = {str(k): v for k, v in metadata["labels_to_songs"].items()}
+
+    tensors, blobs, offset = {}, [], 0
+    for name, tensor in state_dict.items():
+        t = tensor.detach().cpu().contiguous()
+        raw = t.reshape(-1).view(torch.uint8).numpy().tobytes()
+        offset = _align(offset)
+        tensors[name] = {
+            "dtype":  str(t.dtype).replace("torch.", ""),
+            "shape":  list(t.shape),
+            "offset": offset,
+            "nbytes": len(raw),
+        }
+        blobs.append((offset, raw))
+        offset += len(raw)
+
+    header = json.dumps({"metadata": metadata, "tensors": tensors},
+                        ensure_ascii=False).encode("utf-8")
+    data_start = _align(len(MAGIC) + 8 + len(header))
+
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(MAGIC)
+        f.write(struct.pack("<Q", len(header)))
+        f.write(header)
+        for rel_offset, raw in blobs:
+            f.seek(data_start + rel_offset)
+            f.write(raw)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def load_mmap_checkpoint(path: str) -> dict:
+    """
+    Map `path` read-only and return a checkpoint dict whose
+    model_state_dict tensors are zero-copy views into the page cache.
+    Repeated calls for an unchanged file return the same mapping.
+    """
+    mtime = os.path.getmtime(path)
+    with _cache_lock:
+        cached = _cache.get(path)
+        if cached and cached[0] == mtime:
+            return cached[1]
+
+    with open(path, "rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not a memory-mappable checkpoint")
+        (header_len,) = struct.unpack("<Q", f.read(8))
+        header = json.loads(f.read(header_len).decode("utf-8"))
+    data_start = _align(len(MAGIC) + 8 + header_len)
+
+    # shared=False maps MAP_PRIVATE: reads come straight from the page cache
+    # and are shared by every process mapping the file
+    size = os.path.getsize(path)
+    storage = torch.from_file(path, shared=False, size=size, dtype=torch.uint8)
+
+    state_dict = {}
+    for name, info in header["tensors"].items():
+        start = data_start + info["offset"]
+        flat = storage[start:start + info["nbytes"]].view(_DTYPES[info["dtype"]])
+        state_dict[name] = flat.view(info["shape"])
+
+    checkpoint = dict(header["metadata"])
+    if "labels_to_songs" in checkpoint:
+        checkpoint["labels_to_songs"] = {int(k): v for k, v in checkpoint["labels_to_songs"].items()}
+    checkpoint["model_state_dict"] = state_dict
+
+    with _cache_lock:
+        _cache[path] = (mtime, checkpoint)
+    return checkpoint
+
+
+def load_checkpoint(path: str) -> dict:
+    """Load either a memory-mappable or a regular torch.save checkpoint."""
+    if is_mmap_checkpoint(path):
+        return load_mmap_checkpoint(path)
+    return torch.load(path, map_location="cpu")
+
+
+def export_mmap_checkpoint(src_path: str, dst_path: str) -> None:
+    """Convert a torch.save classification checkpoint to the mappable format."""
+    checkpoint = torch.load(src_path, map_location="cpu")
+    save_mmap_checkpoint(checkpoint, dst_path)
+    print(f"Exported {src_path} -> {dst_path}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        print("usage: python -m model.checkpoint_format <src.pt> <dst>")
+        sys.exit(1)
+    export_mmap_checkpoint(sys.argv[1], sys.argv[2])
@@ -0,0 +1,268 @@
+# model/evaluate.py
+
+import os
+import json
+import time
+import argparse
+from collections import Counter, defaultdict
+from typing import Dict, List, Optional
+
+import numpy as np
+import torch
+
+from database.song_database import SongDatabase
+from audio.audio_converter import convert_audio_to_pcm
+from audio.audio_processor import prepare_audio
+from model.model import SongSpectrogramDataset, build_model, N_MELS
+from model.checkpoint_format import load_checkpoint
+from model.predictor import ModelPool, predict_spectrograms, lookup_song_info
+from settings import (
+    MODEL_PATH, SONGS_DB_PATH, GAME_SONGS_DIR, HOLDOUT_EVERY, EVAL_REPORT_DIR
+)
+
+TOP_K = 5
+STAGES = ("decode", "spectrogram", "forward", "metadata_lookup")
+
+
+def _percentiles(samples_ms: List[float]) -> Dict[str, float]:
+    if not samples_ms:
+        return {"count": 0}
+    arr = np.asarray(samples_ms)
+    return {
+        "count": int(arr.size),
+        "mean":  round(float(arr.mean()), 3),
+        "p50":   round(float(np.percentile(arr, 50)), 3),
+        "p95":   round(float(np.percentile(arr, 95)), 3),
+        "p99":   round(float(np.percentile(arr, 99)), 3),
+    }
+
+
+def _holdout_split(trained_holdout: int, holdout_every: Optional[int]):
+    """
+    Pick the holdout_every to evaluate with and say whether its scores
+    mean anything: they only do when the model was trained with that same
+    split, i.e. never saw the held-out parts.
+    """
+    if holdout_every is None:
+        holdout_every = trained_holdout or HOLDOUT_EVERY or 5
+    valid = trained_holdout > 0 and trained_holdout == holdout_every
+    if not valid:
+        if trained_holdout <= 0:
+            print("[WARN] model was trained on every part; held-out accuracy "
+                  "is not valid (train with HOLDOUT_EVERY set to evaluate)")
+        else:
+            print(f"[WARN] model was trained with holdout_every={trained_holdout}; "
+                  f"evaluating with {holdout_every} includes training segments")
+    return holdout_every, valid
+
+
+def evaluate_accuracy(pool: ModelPool, dataset: SongSpectrogramDataset,
+                      labels_to_songs: Dict[int, str],
+                      batch_size: int = 64) -> Dict:
+    """
+    Batched top-1/top-5 over the held-out spectrograms, broken down per
+    augmentation variant, plus a summary of the most frequent confusions.
+    """
+    hits = defaultdict(lambda: {"count": 0, "top1": 0, "top5": 0})
+    confusions = Counter()
+    per_song = defaultdict(lambda: [0, 0])  # label -> [correct, total]
+    forward_ms = []
+
+    for start in range(0, len(dataset), batch_size):
+        end = min(start + batch_size, len(dataset))
+        batch = np.stack([np.load(dataset.data[i]) for i in range(start, end)])
+        t0 = time.perf_counter()
+        topk = predict_spectrograms(batch, k=TOP_K, pool=pool)
+        forward_ms.append((time.perf_counter() - t0) * 1000.0)
+
+        for row, i in enumerate(range(start, end)):
+            label = dataset.labels[i]
+            preds = topk[row].tolist()
+            for variant in (dataset.variants[i], "all"):
+                hits[variant]["count"] += 1
+                hits[variant]["top1"] += int(preds[0] == label)
+                hits[variant]["top5"] += int(label in preds)
+            per_song[label][1] += 1
+            if preds[0] == label:
+                per_song[label][0] += 1
+            else:
+                confusions[(label, preds[0])] += 1
+
+    accuracy = {
+        variant: {
+            "count": h["count"],
+            "top1":  round(h["top1"] / h["count"] * 100.0, 2),
+            "top5":  round(h["top5"] / h["count"] * 100.0, 2),
+        }
+        for variant, h in hits.items()
+    }
+    worst_songs = sorted(
+        ((c / t, label, t) for label, (c, t) in per_song.items()),
+        key=lambda x: x[0]
+    )[:20]
+    return {
+        "accuracy": accuracy,
+        "confusion": {
+            "top_pairs": [
+                {"true": labels_to_songs.get(t, t), "predicted": labels_to_songs.get(p, p),
+                 "count": n}
+                for (t, p), n in confusions.most_common(20)
+            ],
+            "worst_songs": [
+                {"song": labels_to_songs.get(label, label),
+                 "top1": round(acc * 100.0, 2), "count": total}
+                for acc, label, total in worst_songs
+            ],
+        },
+        "batch_forward_ms": _percentiles(forward_ms),
+        "batch_size": batch_size,
+    }
+
+
+def _latency_clips(limit: int) -> List[str]:
+    clips = []
+    for song in sorted(os.listdir(GAME_SONGS_DIR)):
+        song_dir = os.path.join(GAME_SONGS_DIR, song)
+        if not os.path.isdir(song_dir):
+            continue
+        clips.extend(os.path.join(song_dir, f) for f in sorted(os.listdir(song_dir))
+                     if f.endswith((".mp3", ".wav")))
+    return clips[:limit]
+
+
+def measure_latency(pool: ModelPool, labels_to_songs: Dict[int, str],
+                    samples: int = 50) -> Dict:
+    """
+    Time each stage of the single-request predict_from_bytes path on real
+    audio clips: decode, spectrogram, forward and metadata lookup.
+    """
+    timings = {stage: [] for stage in STAGES}
+    for path in _latency_clips(samples):
+        with open(path, "rb") as f:
+            audio_bytes = f.read()
+        fmt = os.path.splitext(path)[1][1:]
+
+        t0 = time.perf_counter()
+        pcm = convert_audio_to_pcm(audio_bytes, fmt)
+        t1 = time.perf_counter()
+        spectrogram = prepare_audio(pcm)
+        t2 = time.perf_counter()
+        idx = predict_spectrograms(spectrogram[np.newaxis], pool=pool)[0, 0].item()
+        t3 = time.perf_counter()
+        try:
+            lookup_song_info(labels_to_songs[idx])
+        except (KeyError, ValueError):
+            pass
+        t4 = time.perf_counter()
+
+        for stage, (a, b) in zip(STAGES, ((t0, t1), (t1, t2), (t2, t3), (t3, t4))):
+            timings[stage].append((b - a) * 1000.0)
+
+    report = {stage: _percentiles(ms) for stage, ms in timings.items()}
+    totals = [sum(parts) for parts in zip(*timings.values())]
+    report["total"] = _percentiles(totals)
+    return report
+
+
+def evaluate(model_path: str = MODEL_PATH,
+             holdout_every: Optional[int] = None,
+             batch_size: int = 64,
+             latency_samples: int = 50,
+             report_path: Optional[str] = None) -> Dict:
+    """
+    Run the offline evaluation for `model_path` and write a JSON report
+    that can be diffed between model versions. Returns the report dict.
+    """
+    checkpoint = load_checkpoint(model_path)
+    labels_to_songs = checkpoint.get("labels_to_songs", {})
+    holdout_every, valid = _holdout_split(checkpoint.get("holdout_every", 0), holdout_every)
+
+    song_db = SongDatabase(SONGS_DB_PATH)
+    dataset = SongSpectrogramDataset(song_db, holdout_every=holdout_every, split="holdout")
+    pool = ModelPool(model_path=model_path, pool_size=1)
+
+    report = {
+        "model_path": model_path,
+        "model_mtime": os.path.getmtime(model_path),
+        "device": "cuda" if torch.cuda.is_available() else "cpu",
+        "holdout_every": holdout_every,
+        "holdout_valid": valid,
+        "num_samples": len(dataset),
+        **evaluate_accuracy(pool, dataset, labels_to_songs, batch_size=batch_size),
+        "latency_ms": measure_latency(pool, labels_to_songs, samples=latency_samples),
+    }
+
+    if report_path is None:
+        name = os.path.splitext(os.path.basename(model_path))[0]
+        report_path = os.path.join(EVAL_REPORT_DIR, f"{name}_{int(time.time())}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(report_path)), exist_ok=True)
+    with open(report_path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, ensure_ascii=False, sort_keys=True)
+    print(f"Saved evaluation report to {report_path}")
+    return report
+
+
+def compare_models(model_paths: List[str],
+                   holdout_every: Optional[int] = None,
+                   latency_runs: int = 100) -> List[Dict]:
+    """
+    Size / single-item CPU latency / held-out accuracy for each checkpoint,
+    e.g. a teacher and its distilled student, printed as a small table.
+    """
+    rows = []
+    for path in model_paths:
+        checkpoint = load_checkpoint(path)
+        model = build_model(checkpoint)
+        model.load_state_dict(checkpoint["model_state_dict"])
+        model.eval()
+        every, valid = _holdout_split(checkpoint.get("holdout_every", 0), holdout_every)
+
+        dummy = torch.zeros(1, 1, N_MELS, 216)
+        with torch.no_grad():
+            for _ in range(5):
+                model(dummy)
+            samples = []
+            for _ in range(latency_runs):
+                t0 = time.perf_counter()
+                model(dummy)
+                samples.append((time.perf_counter() - t0) * 1000.0)
+
+        song_db = SongDatabase(SONGS_DB_PATH)
+        dataset = SongSpectrogramDataset(song_db, holdout_every=every, split="holdout")
+        pool = ModelPool(model_path=path, pool_size=1)
+        result = evaluate_accuracy(pool, dataset, checkpoint.get("labels_to_songs", {}))
+        rows.append({
+            "model_path": path,
+            "model_config": model.config,
+            "parameters": sum(p.numel() for p in model.parameters()),
+            "file_mb": round(os.path.getsize(path) / 2**20, 2),
+            "cpu_forward_ms": _percentiles(samples),
+            "top1": result["accuracy"].get("all", {}).get("top1"),
+            "top5": result["accuracy"].get("all", {}).get("top5"),
+            "holdout_valid": valid,
+        })
+
+    print(f"{'model':<40} {'params':>10} {'MB':>7} {'p50 ms':>8} {'top1':>7} {'top5':>7}")
+    for r in rows:
+        mark = "" if r["holdout_valid"] else "  (not held out)"
+        print(f"{os.path.basename(r['model_path']):<40} {r['parameters']:>10,} "
+              f"{r['file_mb']:>7} {r['cpu_forward_ms']['p50']:>8} "
+              f"{r['top1']:>7} {r['top5']:>7}{mark}")
+    return rows
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Offline model evaluation")
+    parser.add_argument("--model", default=MODEL_PATH)
+    parser.add_argument("--holdout-every", type=int, default=None)
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--latency-samples", type=int, default=50)
+    parser.add_argument("--out", default=None)
+    parser.add_argument("--compare", nargs="+", default=None,
+                        help="print size/latency/accuracy for these checkpoints instead")
+    args = parser.parse_args()
+    if args.compare:
+        compare_models(args.compare, args.holdout_every)
+    else:
+        evaluate(args.model, args.holdout_every, args.batch_size,
+                 args.latency_samples, args.out)
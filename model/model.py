@@ -1,14 +1,19 @@
 # model/model.py
 
 import os
+import random
 import numpy as np
 import torch
 from torch import nn, optim
-from torch.utils.data import Dataset, DataLoader
+from torch.utils.data import Dataset, DataLoader, Sampler
 from torch.cuda.amp import GradScaler, autocast
 
 from database.song_database import SongDatabase
-from settings import MODEL_PATH
+from model.checkpoint_format import load_checkpoint
+from settings import (
+    MODEL_PATH, PRETRAINED_MODEL_PATH, CHECKPOINT_DIR, CHECKPOINT_EVERY,
+    HOLDOUT_EVERY
+)
 
 NUM_CLASSES = 628
 N_MELS = 128
@@ -53,12 +58,29 @@ class SongContrastiveDataset(Dataset):
 # -----------------------------
 # 2) Classification Dataset
 # -----------------------------
+def is_holdout_part(part_id: str, holdout_every: int) -> bool:
+    """
+    Deterministic per-song split on the segment index: with holdout_every=5,
+    parts 5, 10, 15, ... of every song are reserved for evaluation.
+    """
+    if holdout_every <= 0:
+        return False
+    return int(part_id[len("part"):]) % holdout_every == 0
+
+
 class SongSpectrogramDataset(Dataset):
-    def __init__(self, song_db: SongDatabase):
-        self.data   = []
-        self.labels = []
+    def __init__(self, song_db: SongDatabase,
+                 holdout_every: int = 0, split: str = "train"):
+        """
+        split="train" skips the held-out parts, split="holdout" keeps only
+        them; with holdout_every=0 every part belongs to "train".
+        """
+        self.data     = []
+        self.labels   = []
+        self.variants = []  # "clean" | "noisy" | "reverb" per item
         self.labels_to_songs = {}
         self.songs_to_labels = {}
+        self.holdout_every = holdout_every
 
         records = song_db.get_columns("id, spectrograms, song_name")
         for song_id, folder, name in records:
@@ -66,8 +88,13 @@ class SongSpectrogramDataset(Dataset):
             self.songs_to_labels[name] = song_id
             for fn in os.listdir(folder):
                 if fn.endswith(".npy"):
+                    part_id, version = fn[:-4].split("_")
+                    held_out = is_holdout_part(part_id, holdout_every)
+                    if held_out != (split == "holdout"):
+                        continue
                     self.data.append(os.path.join(folder, fn))
                     self.labels.append(song_id)
+                    self.variants.append(version)
 
     def __len__(self):
         return len(self.data)
@@ -85,31 +112,47 @@ class SongSpectrogramDataset(Dataset):
 # -----------------------------
 # 3) CNN Model
 # -----------------------------
+DEFAULT_CHANNELS = (32, 64, 128, 256)
+DEFAULT_HIDDEN   = (1024, 512)
+STUDENT_CHANNELS = (16, 32, 64, 128)
+STUDENT_HIDDEN   = (256,)
+
+
 class SongCNN(nn.Module):
-    def __init__(self, num_classes=NUM_CLASSES):
+    def __init__(self, num_classes=NUM_CLASSES,
+                 channels=DEFAULT_CHANNELS, hidden=DEFAULT_HIDDEN):
+        """
+        `channels` sets the width of the four conv blocks and `hidden` the
+        sizes of the fully-connected layers; the defaults are the full
+        model, smaller values give a distillation student.
+        """
         super().__init__()
+        c1, c2, c3, c4 = channels
+        self.config = {"channels": list(channels), "hidden": list(hidden)}
         self.conv_block1 = nn.Sequential(
-            nn.Conv2d(1,32,3,padding=1), nn.BatchNorm2d(32), nn.ReLU(),
+            nn.Conv2d(1,c1,3,padding=1), nn.BatchNorm2d(c1), nn.ReLU(),
             nn.MaxPool2d(2), nn.Dropout2d(0.2)
         )
         self.conv_block2 = nn.Sequential(
-            nn.Conv2d(32,64,3,padding=1), nn.BatchNorm2d(64), nn.ReLU(),
+            nn.Conv2d(c1,c2,3,padding=1), nn.BatchNorm2d(c2), nn.ReLU(),
             nn.MaxPool2d(2), nn.Dropout2d(0.2)
         )
         self.conv_block3 = nn.Sequential(
-            nn.Conv2d(64,128,3,padding=1), nn.BatchNorm2d(128), nn.ReLU(),
+            nn.Conv2d(c2,c3,3,padding=1), nn.BatchNorm2d(c3), nn.ReLU(),
             nn.MaxPool2d(2), nn.Dropout2d(0.2)
         )
         self.conv_block4 = nn.Sequential(
-            nn.Conv2d(128,256,3,padding=1), nn.BatchNorm2d(256), nn.ReLU(),
+            nn.Conv2d(c3,c4,3,padding=1), nn.BatchNorm2d(c4), nn.ReLU(),
             nn.MaxPool2d(2)
         )
         self.global_avg = nn.AdaptiveAvgPool2d((1,1))
-        self.fc = nn.Sequential(
-            nn.Linear(256,1024), nn.ReLU(), nn.Dropout(0.5),
-            nn.Linear(1024,512), nn.ReLU(), nn.Dropout(0.3),
-            nn.Linear(512,num_classes)
-        )
+        layers, in_features = [], c4
+        for i, width in enumerate(hidden):
+            layers += [nn.Linear(in_features,width), nn.ReLU(),
+                       nn.Dropout(0.5 if i == 0 else 0.3)]
+            in_features = width
+        layers.append(nn.Linear(in_features,num_classes))
+        self.fc = nn.Sequential(*layers)
 
     def extract_features(self, x):
         x = self.conv_block1(x)
@@ -124,6 +167,12 @@ class SongCNN(nn.Module):
         return self.fc(x)
 
 
+def build_model(checkpoint: dict) -> SongCNN:
+    """Instantiate the architecture described by a saved classification checkpoint."""
+    config = checkpoint.get("model_config") or {}
+    return SongCNN(checkpoint.get("num_classes") or NUM_CLASSES, **config)
+
+
 # -----------------------------
 # 4) Contrastive Loss
 # -----------------------------
@@ -141,110 +190,393 @@ class ContrastiveLoss(nn.Module):
 
 
 # -----------------------------
-# 5) Pretrain (Contrastive)
+# 5) Checkpointing
 # -----------------------------
-def pretrain_contrastive(model, dataset, model_path,
-                         batch_size=32, lr=1e-3, epochs=10):
+class ResumableSampler(Sampler):
+    """
+    Shuffling sampler whose order is a pure function of (seed, epoch),
+    so a run can continue mid-epoch by skipping the samples already seen.
+    """
+
+    def __init__(self, data_source, seed: int = 0):
+        self.num_samples = len(data_source)
+        self.seed        = seed
+        self.epoch       = 0
+        self.start_index = 0
+
+    def set_epoch(self, epoch: int, start_index: int = 0) -> None:
+        self.epoch       = epoch
+        self.start_index = start_index
+
+    def __iter__(self):
+        g = torch.Generator()
+        g.manual_seed(self.seed + self.epoch)
+        order = torch.randperm(self.num_samples, generator=g).tolist()
+        return iter(order[self.start_index:])
+
+    def __len__(self):
+        return self.num_samples - self.start_index
+
+    def state_dict(self) -> dict:
+        return {"seed": self.seed, "epoch": self.epoch,
+                "start_index": self.start_index}
+
+
+def _rng_state() -> dict:
+    state = {
+        "python": random.getstate(),
+        "numpy":  np.random.get_state(),
+        "torch":  torch.get_rng_state(),
+    }
+    if torch.cuda.is_available():
+        state["cuda"] = torch.cuda.get_rng_state_all()
+    return state
+
+
+def _set_rng_state(state: dict) -> None:
+    random.setstate(state["python"])
+    np.random.set_state(state["numpy"])
+    torch.set_rng_state(state["torch"])
+    if "cuda" in state and torch.cuda.is_available():
+        torch.cuda.set_rng_state_all(state["cuda"])
+
+
+def atomic_save(obj, path: str) -> None:
+    """
+    torch.save to a temp file next to `path`, fsync it, then rename over
+    `path`, so a crash mid-write never leaves a truncated checkpoint.
+    """
+    folder = os.path.dirname(os.path.abspath(path))
+    os.makedirs(folder, exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        torch.save(obj, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def default_checkpoint_path(stage: str) -> str:
+    return os.path.join(CHECKPOINT_DIR, f"{stage}_checkpoint.pt")
+
+
+def save_training_checkpoint(path: str, stage: str, model, optimizer, scheduler,
+                             scaler, sampler: ResumableSampler,
+                             epoch: int, step: int, totals: dict,
+                             run_args: dict) -> None:
+    """
+    Snapshot everything needed to continue a run exactly where it stopped:
+    weights, optimizer/scheduler/scaler state, sampler position, RNG
+    states and the partial epoch totals.
+    """
+    atomic_save({
+        "stage":                stage,
+        "model_state_dict":     model.state_dict(),
+        "optimizer_state_dict": optimizer.state_dict(),
+        "scheduler_state_dict": scheduler.state_dict(),
+        "scaler_state_dict":    scaler.state_dict(),
+        "sampler_state":        sampler.state_dict(),
+        "rng_state":            _rng_state(),
+        "epoch":                epoch,
+        "step":                 step,
+        "totals":               totals,
+        "run_args":             run_args,
+    }, path)
+
+
+def _restore_training_state(checkpoint: dict, model, optimizer, scheduler,
+                            scaler, sampler: ResumableSampler):
+    """
+    Load a checkpoint written by save_training_checkpoint into the live
+    training objects. Returns (epoch, step, totals) to continue from.
+    """
+    model.load_state_dict(checkpoint["model_state_dict"])
+    optimizer.load_state_dict(checkpoint["optimizer_state_dict"])
+    scheduler.load_state_dict(checkpoint["scheduler_state_dict"])
+    scaler.load_state_dict(checkpoint["scaler_state_dict"])
+    sampler.seed = checkpoint["sampler_state"]["seed"]
+    _set_rng_state(checkpoint["rng_state"])
+    return checkpoint["epoch"], checkpoint["step"], checkpoint["totals"]
+
+
+def _new_totals() -> dict:
+    return {"loss": 0.0, "correct": 0, "total": 0}
+
+
+def _fit(stage: str, model, dataset, batch_loss, batch_size, lr, epochs,
+         patience, checkpoint_path, checkpoint_every, resume_from, seed,
+         run_args: dict) -> None:
+    """
+    Epoch/batch loop shared by pretraining, training and distillation:
+    AdamW with ReduceLROnPlateau and AMP over a ResumableSampler order,
+    a checkpoint every `checkpoint_every` steps and at each epoch end,
+    and resume from a checkpoint dict. `batch_loss(batch, device)` returns
+    (loss, scored), where scored is (outputs, labels) to count accuracy
+    or None; the caller saves the final model.
+    """
     device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
     model.to(device)
-    dataloader = DataLoader(dataset, batch_size=batch_size, shuffle=True,
-                            num_workers=4, pin_memory=True)
+    sampler = ResumableSampler(dataset, seed=seed)
+    # worker seeds come from their own generator: drawing them from the
+    # global RNG at each epoch start would shift dropout after a resume
+    dataloader = DataLoader(dataset, batch_size=batch_size, sampler=sampler,
+                            num_workers=4, pin_memory=True,
+                            generator=torch.Generator().manual_seed(seed))
+    num_batches = (len(dataset) + batch_size - 1) // batch_size
     optimizer = optim.AdamW(model.parameters(), lr=lr, weight_decay=1e-4)
-    scheduler = optim.lr_scheduler.ReduceLROnPlateau(optimizer, 'min', patience=2, factor=0.5)
+    scheduler = optim.lr_scheduler.ReduceLROnPlateau(optimizer, 'min', patience=patience, factor=0.5)
     scaler = GradScaler()
+    name = stage.capitalize()
+
+    checkpoint_path = checkpoint_path or default_checkpoint_path(stage)
+    start_epoch, start_step, totals = 0, 0, _new_totals()
+    if resume_from is not None:
+        start_epoch, start_step, totals = _restore_training_state(
+            resume_from, model, optimizer, scheduler, scaler, sampler)
+        totals = {**_new_totals(), **totals}  # older pretrain checkpoints kept only "loss"
+        print(f"[{name}] Resuming at epoch {start_epoch+1}, step {start_step}")
 
-    for epoch in range(epochs):
+    for epoch in range(start_epoch, epochs):
         model.train()
-        total_loss = 0.0
-        for spec1, spec2 in dataloader:
-            spec1, spec2 = spec1.to(device), spec2.to(device)
+        step = start_step if epoch == start_epoch else 0
+        if epoch != start_epoch:
+            totals = _new_totals()
+        sampler.set_epoch(epoch, start_index=step * batch_size)
+        for batch in dataloader:
             optimizer.zero_grad()
-            with autocast():
-                z1 = model.extract_features(spec1)
-                z2 = model.extract_features(spec2)
-                loss = ContrastiveLoss()(z1, z2)
+            loss, scored = batch_loss(batch, device)
             scaler.scale(loss).backward()
             scaler.step(optimizer)
             scaler.update()
-            total_loss += loss.item()
-        avg = total_loss / len(dataloader)
-        print(f"[Pretrain] Epoch {epoch+1}/{epochs}, Loss={avg:.4f}")
-        scheduler.step(avg)
-    torch.save(model.state_dict(), model_path)
+
+            totals["loss"] += loss.item()
+            if scored is not None:
+                outputs, labels = scored
+                totals["correct"] += (outputs.argmax(dim=1) == labels).sum().item()
+                totals["total"] += labels.size(0)
+            step += 1
+            if checkpoint_every and step % checkpoint_every == 0 and step < num_batches:
+                save_training_checkpoint(checkpoint_path, stage, model, optimizer,
+                                         scheduler, scaler, sampler, epoch, step,
+                                         totals, run_args)
+
+        avg_loss = totals["loss"] / num_batches
+        line = f"[{name}] Epoch {epoch+1}/{epochs}, Loss={avg_loss:.4f}"
+        if totals["total"]:
+            line += f", Acc={totals['correct'] / totals['total'] * 100.0:.2f}%"
+        print(line)
+        scheduler.step(avg_loss)
+        # epoch boundary: resume starts cleanly at the next epoch
+        save_training_checkpoint(checkpoint_path, stage, model, optimizer,
+                                 scheduler, scaler, sampler, epoch + 1, 0,
+                                 _new_totals(), run_args)
+
+
+# -----------------------------
+# 6) Pretrain (Contrastive)
+# -----------------------------
+def pretrain_contrastive(model, dataset, model_path,
+                         batch_size=32, lr=1e-3, epochs=10,
+                         checkpoint_path=None, checkpoint_every=CHECKPOINT_EVERY,
+                         resume_from=None, seed=0):
+    criterion = ContrastiveLoss()
+
+    def batch_loss(batch, device):
+        spec1, spec2 = (t.to(device) for t in batch)
+        with autocast():
+            z1 = model.extract_features(spec1)
+            z2 = model.extract_features(spec2)
+            return criterion(z1, z2), None
+
+    run_args = {"model_path": model_path, "batch_size": batch_size,
+                "lr": lr, "epochs": epochs, "checkpoint_every": checkpoint_every}
+    _fit("pretrain", model, dataset, batch_loss, batch_size, lr, epochs,
+         patience=2, checkpoint_path=checkpoint_path,
+         checkpoint_every=checkpoint_every, resume_from=resume_from,
+         seed=seed, run_args=run_args)
+    atomic_save(model.state_dict(), model_path)
     print(f"Saved pretrained model to {model_path}")
 
 
 # -----------------------------
-# 6) Train Classification
+# 7) Train Classification
 # -----------------------------
 def train(model, dataset, model_path,
-          batch_size=32, lr=1e-3, epochs=10):
-    device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
-    model.to(device)
-    dataloader = DataLoader(dataset, batch_size=batch_size, shuffle=True,
-                            num_workers=4, pin_memory=True)
+          batch_size=32, lr=1e-3, epochs=10,
+          checkpoint_path=None, checkpoint_every=CHECKPOINT_EVERY,
+          resume_from=None, seed=0):
     criterion = nn.CrossEntropyLoss(label_smoothing=0.1)
-    optimizer = optim.AdamW(model.parameters(), lr=lr, weight_decay=1e-4)
-    scheduler = optim.lr_scheduler.ReduceLROnPlateau(optimizer, 'min', patience=3, factor=0.5)
-    scaler = GradScaler()
 
-    for epoch in range(epochs):
-        model.train()
-        running_loss = 0.0
-        correct = total = 0
-        for inputs, labels in dataloader:
-            inputs, labels = inputs.to(device), labels.to(device)
-            optimizer.zero_grad()
-            with autocast():
-                outputs = model(inputs)
-                loss = criterion(outputs, labels)
-            scaler.scale(loss).backward()
-            scaler.step(optimizer)
-            scaler.update()
+    def batch_loss(batch, device):
+        inputs, labels = (t.to(device) for t in batch)
+        with autocast():
+            outputs = model(inputs)
+            return criterion(outputs, labels), (outputs, labels)
+
+    run_args = {"model_path": model_path, "batch_size": batch_size,
+                "lr": lr, "epochs": epochs, "checkpoint_every": checkpoint_every,
+                "holdout_every": dataset.holdout_every}
+    _fit("train", model, dataset, batch_loss, batch_size, lr, epochs,
+         patience=3, checkpoint_path=checkpoint_path,
+         checkpoint_every=checkpoint_every, resume_from=resume_from,
+         seed=seed, run_args=run_args)
+
+    atomic_save({
+        'model_state_dict': model.state_dict(),
+        'num_classes': NUM_CLASSES,
+        'model_config': model.config,
+        'holdout_every': dataset.holdout_every,
+        'labels_to_songs': dataset.labels_to_songs,
+        'songs_to_labels': dataset.songs_to_labels
+    }, model_path)
+    print(f"Saved classification model to {model_path}")
 
-            running_loss += loss.item()
-            preds = outputs.argmax(dim=1)
-            correct += (preds == labels).sum().item()
-            total += labels.size(0)
 
-        avg_loss = running_loss / len(dataloader)
-        acc = correct / total * 100.0
-        print(f"[Train] Epoch {epoch+1}/{epochs}, Loss={avg_loss:.4f}, Acc={acc:.2f}%")
-        scheduler.step(avg_loss)
+# -----------------------------
+# 8) Knowledge Distillation
+# -----------------------------
+class DistillationLoss(nn.Module):
+    """
+    Hinton-style distillation: KL between temperature-softened teacher and
+    student distributions, blended with the usual hard-label cross-entropy.
+    """
 
-    torch.save({
-        'model_state_dict': model.state_dict(),
+    def __init__(self, temperature: float = 4.0, alpha: float = 0.7):
+        super().__init__()
+        self.temperature = temperature
+        self.alpha = alpha
+        self.hard = nn.CrossEntropyLoss(label_smoothing=0.1)
+
+    def forward(self, student_logits, teacher_logits, labels):
+        t = self.temperature
+        soft = nn.functional.kl_div(
+            nn.functional.log_softmax(student_logits / t, dim=1),
+            nn.functional.softmax(teacher_logits / t, dim=1),
+            reduction="batchmean"
+        ) * (t * t)
+        return self.alpha * soft + (1 - self.alpha) * self.hard(student_logits, labels)
+
+
+def distill(teacher, student, dataset, model_path,
+            batch_size=64, lr=1e-3, epochs=15, temperature=4.0, alpha=0.7,
+            checkpoint_path=None, checkpoint_every=CHECKPOINT_EVERY,
+            resume_from=None, seed=0, teacher_path=None):
+    device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+    teacher.to(device).eval()
+    criterion = DistillationLoss(temperature, alpha)
+
+    def batch_loss(batch, device):
+        inputs, labels = (t.to(device) for t in batch)
+        with torch.no_grad():
+            teacher_logits = teacher(inputs)
+        with autocast():
+            outputs = student(inputs)
+            loss = criterion(outputs.float(), teacher_logits.float(), labels)
+        return loss, (outputs, labels)
+
+    run_args = {"model_path": model_path, "batch_size": batch_size, "lr": lr,
+                "epochs": epochs, "temperature": temperature, "alpha": alpha,
+                "checkpoint_every": checkpoint_every, "teacher_path": teacher_path,
+                "holdout_every": dataset.holdout_every,
+                "student_config": student.config}
+    _fit("distill", student, dataset, batch_loss, batch_size, lr, epochs,
+         patience=3, checkpoint_path=checkpoint_path,
+         checkpoint_every=checkpoint_every, resume_from=resume_from,
+         seed=seed, run_args=run_args)
+
+    atomic_save({
+        'model_state_dict': student.state_dict(),
         'num_classes': NUM_CLASSES,
+        'model_config': student.config,
+        'holdout_every': dataset.holdout_every,
+        'distilled_from': teacher_path,
         'labels_to_songs': dataset.labels_to_songs,
         'songs_to_labels': dataset.songs_to_labels
     }, model_path)
-    print(f"Saved classification model to {model_path}")
+    print(f"Saved distilled student model to {model_path}")
 
 
 # -----------------------------
-# 7) Entry Points
+# 9) Entry Points
 # -----------------------------
-def pretrain_model(song_db: SongDatabase):
+def pretrain_model(song_db: SongDatabase, model_path: str = PRETRAINED_MODEL_PATH):
     print("Starting contrastive pretraining...")
     dataset = SongContrastiveDataset(song_db)
     model = SongCNN()
-    pretrain_contrastive(model, dataset, model_path="contrastive_pretrained_model")
+    pretrain_contrastive(model, dataset, model_path=model_path)
 
 
-def create_model(song_db: SongDatabase, model_path: str, pretrained: bool = True):
+def create_model(song_db: SongDatabase, model_path: str, pretrained: bool = True,
+                 pretrained_path: str = PRETRAINED_MODEL_PATH,
+                 holdout_every: int = HOLDOUT_EVERY):
+    # holdout_every > 0 keeps those parts out of training for model/evaluate.py
     print("Preparing classification dataset...")
-    dataset = SongSpectrogramDataset(song_db)
+    dataset = SongSpectrogramDataset(song_db, holdout_every=holdout_every)
     model = SongCNN()
     if pretrained:
         print("Loading pretrained weights...")
-        model.load_state_dict(torch.load("contrastive_pretrained_model", map_location='cpu'))
+        model.load_state_dict(torch.load(pretrained_path, map_location='cpu'))
     train(model, dataset, model_path, batch_size=32, lr=1e-3, epochs=25)
 
 
 def continue_training(old_path: str, new_path: str, song_db: SongDatabase, extra_epochs: int = 10):
     print("Continuing training from", old_path)
-    checkpoint = torch.load(old_path, map_location='cpu')
-    model = SongCNN()
+    checkpoint = load_checkpoint(old_path)
+    model = build_model(checkpoint)
     model.load_state_dict(checkpoint['model_state_dict'])
-    dataset = SongSpectrogramDataset(song_db)
+    dataset = SongSpectrogramDataset(song_db, holdout_every=checkpoint.get('holdout_every', 0))
     train(model, dataset, new_path, batch_size=32, lr=5e-4, epochs=extra_epochs)
+
+
+def resume_training(checkpoint_path: str, song_db: SongDatabase):
+    """
+    Continue an interrupted pretrain or train run from its last checkpoint,
+    with the same hyper-parameters, sample order and final model path.
+    """
+    print("Resuming training from", checkpoint_path)
+    checkpoint = torch.load(checkpoint_path, map_location='cpu', weights_only=False)
+    args = checkpoint["run_args"]
+    if checkpoint["stage"] == "pretrain":
+        dataset = SongContrastiveDataset(song_db)
+        pretrain_contrastive(SongCNN(), dataset, **args,
+                             checkpoint_path=checkpoint_path,
+                             resume_from=checkpoint)
+    elif checkpoint["stage"] == "distill":
+        holdout_every = args.pop("holdout_every", 0)
+        student = SongCNN(**args.pop("student_config"))
+        teacher_checkpoint = load_checkpoint(args["teacher_path"])
+        teacher = build_model(teacher_checkpoint)
+        teacher.load_state_dict(teacher_checkpoint['model_state_dict'])
+        dataset = SongSpectrogramDataset(song_db, holdout_every=holdout_every)
+        distill(teacher, student, dataset, **args,
+                checkpoint_path=checkpoint_path,
+                resume_from=checkpoint)
+    else:
+        holdout_every = args.pop("holdout_every", 0)
+        dataset = SongSpectrogramDataset(song_db, holdout_every=holdout_every)
+        train(SongCNN(), dataset, **args,
+              checkpoint_path=checkpoint_path,
+              resume_from=checkpoint)
+
+
+def create_student_model(song_db: SongDatabase, teacher_path: str, student_path: str,
+                         channels=STUDENT_CHANNELS, hidden=STUDENT_HIDDEN,
+                         epochs: int = 15, temperature: float = 4.0, alpha: float = 0.7):
+    """
+    Distill a trained teacher checkpoint into a smaller SongCNN saved in the
+    same checkpoint format ModelPool loads, then print the size/latency/
+    accuracy comparison between the two.
+    """
+    print("Loading teacher from", teacher_path)
+    checkpoint = load_checkpoint(teacher_path)
+    teacher = build_model(checkpoint)
+    teacher.load_state_dict(checkpoint['model_state_dict'])
+    holdout_every = checkpoint.get('holdout_every', 0)
+    dataset = SongSpectrogramDataset(song_db, holdout_every=holdout_every)
+    student = SongCNN(checkpoint.get('num_classes') or NUM_CLASSES,
+                      channels=channels, hidden=hidden)
+    distill(teacher, student, dataset, student_path, epochs=epochs,
+            temperature=temperature, alpha=alpha, teacher_path=teacher_path)
+
+    from model.evaluate import compare_models  # evaluate imports this module
+    compare_models([teacher_path, student_path])
@@ -3,16 +3,17 @@ import os
 import time
 import torch
 import numpy as np
-import base64
 
 from torch.utils.checkpoint import checkpoint
 
-from model.model import SongCNN
-from settings import MODEL_PATH, SONGS_DB_PATH
-from database.song_database import SongDatabase
+from model.model import SongCNN, build_model
+from model.checkpoint_format import load_checkpoint, is_mmap_checkpoint
+from settings import MODEL_PATH, MODEL_POOL_SIZE
+from database.song_catalogue import get_song_catalogue
 from audio.audio_converter import convert_audio_to_pcm
 from audio.audio_processor import prepare_audio
 from game.song import Song
+from game.album_art import get_album_art
 
 # model/predictor.py
 
@@ -25,17 +26,25 @@ class ModelPool:
         self._lock       = threading.Lock()
         self._mtimes     = None      # start as None so first load always happens
         self._models     = []
+        self._labels_to_songs = {}
         # initial load
         self._reload_if_needed()
 
-    def _load_model(self) -> SongCNN:
+    def _load_model(self, checkpoint: dict = None) -> SongCNN:
         device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
-        checkpoint = torch.load(self.model_path, map_location="cpu")
-        num_classes = checkpoint.get("num_classes")
-        model = SongCNN(num_classes)
-        model.load_state_dict(checkpoint["model_state_dict"])
+        if checkpoint is None:
+            checkpoint = load_checkpoint(self.model_path)
+        model = build_model(checkpoint)
+        state_dict = checkpoint["model_state_dict"]
+        if is_mmap_checkpoint(self.model_path) and device.type == "cpu":
+            # adopt the mapped tensors instead of copying them, so every pool
+            # member (and every server process) shares one page-cache copy
+            model.load_state_dict(state_dict, assign=True)
+        else:
+            model.load_state_dict(state_dict)
         model.to(device)
         model.eval()
+        self._labels_to_songs = checkpoint.get("labels_to_songs") or {}
         return model
 
     def _reload_if_needed(self):
@@ -53,10 +62,11 @@ class ModelPool:
         # if first‐time load (self._mtimes is None) or file changed
         if self._mtimes is None or mtime != self._mtimes:
             with self._lock:
-                # rebuild entire pool
+                # rebuild entire pool from a single read of the checkpoint
+                checkpoint = load_checkpoint(self.model_path)
                 new_models = []
                 for _ in range(self.pool_size):
-                    new_models.append(self._load_model())
+                    new_models.append(self._load_model(checkpoint))
                 self._models = new_models
                 self._mtimes = mtime
 
@@ -79,14 +89,24 @@ class ModelPool:
         return self._models[idx]
 
     def label_to_song(self, label: int):
-        checkpoint = torch.load(self.model_path, map_location="cpu")
-        labels_to_songs = checkpoint.get("labels_to_songs")
-        song = labels_to_songs[label]
-        return song
+        """Map a class index to its song name using the labels cached at load."""
+        if not self._labels_to_songs:
+            self.get()
+        return self._labels_to_songs[label]
 
 
-# Singleton pool for app usage
-model_pool = ModelPool()
+# Singleton pool for app usage, built on first use rather than at import
+_model_pool = None
+_model_pool_lock = threading.Lock()
+
+
+def get_model_pool() -> ModelPool:
+    global _model_pool
+    if _model_pool is None:
+        with _model_pool_lock:
+            if _model_pool is None:
+                _model_pool = ModelPool(pool_size=MODEL_POOL_SIZE)
+    return _model_pool
 
 # Helper to combine conversion + spectrogram prep in one go
 def prepare_audio_bytes(audio_bytes: bytes, fmt: str) -> np.ndarray:
@@ -94,6 +114,33 @@ def prepare_audio_bytes(audio_bytes: bytes, fmt: str) -> np.ndarray:
     return prepare_audio(pcm)
 
 
+def predict_spectrograms(spectrograms: np.ndarray, k: int = 1,
+                         pool: ModelPool = None) -> torch.Tensor:
+    """
+    Batched inference over stacked spectrograms shaped (B, N_MELS, T).
+    Returns the top-k label indices per item as a (B, k) CPU tensor.
+    """
+    pool = pool or get_model_pool()
+    device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+    model = pool.get()
+    input_tensor = torch.as_tensor(spectrograms, dtype=torch.float32).unsqueeze(1)
+    input_tensor = input_tensor.to(device)
+    with torch.no_grad():
+        logits = model(input_tensor)
+        k = min(k, logits.size(1))
+        return torch.topk(logits, k, dim=1).indices.cpu()
+
+
+def lookup_song_info(song_name: str) -> dict:
+    """
+    Load metadata for `song_name`, referencing its album cover by id.
+    """
+    song = Song(song_name, get_song_catalogue())
+    song_info = song.to_dict()
+    song_info.pop("id", None)
+    return get_album_art().attach(song_info)
+
+
 def predict_from_bytes(audio_bytes: bytes,
                        fmt: str = "wav",) -> dict:
     """
@@ -101,30 +148,15 @@ def predict_from_bytes(audio_bytes: bytes,
       1. Convert raw bytes to PCM array
       2. Prepare fixed-length spectrogram
       3. Run inference on pooled SongCNN
-      4. Lookup metadata in SongDatabase
+      4. Lookup metadata in the in-memory song catalogue
       5. Return song info dict
     """
-    device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
     # 1) prepare spectrogram
     spectrogram = prepare_audio_bytes(audio_bytes, fmt)
 
     # 2) inference
-    model = model_pool.get()
-    input_tensor = torch.tensor(spectrogram, dtype=torch.float32).unsqueeze(0).unsqueeze(0)
-    input_tensor = input_tensor.to(device)
-    with torch.no_grad():
-        logits = model(input_tensor)
-        idx = torch.argmax(logits, dim=1).item()
-        song_name = model_pool.label_to_song(idx)
+    idx = predict_spectrograms(spectrogram[np.newaxis])[0, 0].item()
+    song_name = get_model_pool().label_to_song(idx)
 
     # 3) lookup metadata
-    db = SongDatabase(SONGS_DB_PATH)
-    song = Song(song_name, db)
-    song_info = song.to_dict()
-    song_info.pop("id", None)
-    cover_path = song_info['album_cover_image']
-    if cover_path and os.path.isfile(cover_path):
-        with open(cover_path, 'rb') as f:
-            raw_bytes = f.read()
-        song_info['album_cover_image'] = base64.b64encode(raw_bytes).decode('ascii')
-    return song_info
+    return lookup_song_info(song_name)
@@ -1,6 +1,12 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
 import bcrypt
 
-def hash_password(password: str) -> str:
+from settings import BCRYPT_ROUNDS, PASSWORD_WORKERS, PASSWORD_MAX_PENDING
+
+
+def hash_password(password: str, rounds: int = BCRYPT_ROUNDS) -> str:
     """
     Securely hashes a plaintext password using bcrypt.
 
@@ -12,8 +18,8 @@ def hash_password(password: str) -> str:
     Returns:
         A string containing both the salt and hash (e.g. b'$2b$12$...').decode()
     """
-    # 1) Generate a random salt (default cost=12)
-    salt = bcrypt.gensalt()
+    # 1) Generate a random salt embedding the configured cost factor
+    salt = bcrypt.gensalt(rounds=rounds)
 
     # 2) Compute the salted hash
     hashed = bcrypt.hashpw(password.encode('utf-8'), salt)
@@ -34,4 +40,57 @@ def verify_password(password: str, hashed: str) -> bool:
         True if the password matches the hash, False otherwise.
     """
     # bcrypt.checkpw requires both args as bytes
-    return bcrypt.checkpw(password.encode('utf-8'), hashed.encode('utf-8'))
\ No newline at end of file
+    return bcrypt.checkpw(password.encode('utf-8'), hashed.encode('utf-8'))
+
+
+def password_needs_rehash(hashed: str, rounds: int = BCRYPT_ROUNDS) -> bool:
+    """
+    True if `hashed` was made with a different cost factor than `rounds`.
+    bcrypt hashes look like "$2b$12$<salt+hash>", the cost being field 2.
+    """
+    try:
+        return int(hashed.split("$")[2]) != rounds
+    except (IndexError, ValueError):
+        return True
+
+
+class PasswordWorkRejected(Exception):
+    """Raised when the password pool is saturated and new work is shed."""
+
+
+class PasswordHasher:
+    """
+    Runs bcrypt on a bounded thread pool (bcrypt releases the GIL) so
+    signups and logins never block the event loop.  At most `max_pending`
+    operations may be queued or running; beyond that calls raise
+    PasswordWorkRejected immediately instead of piling up.
+    """
+
+    def __init__(self,
+                 workers: int = PASSWORD_WORKERS,
+                 max_pending: int = PASSWORD_MAX_PENDING,
+                 rounds: int = BCRYPT_ROUNDS):
+        self.rounds = rounds
+        self.max_pending = max_pending
+        self._pending = 0   # only touched from the event loop thread
+        self._executor = ThreadPoolExecutor(max_workers=workers,
+                                            thread_name_prefix="bcrypt")
+
+    async def _submit(self, fn, *args):
+        if self._pending >= self.max_pending:
+            raise PasswordWorkRejected()
+        self._pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, fn, *args)
+        finally:
+            self._pending -= 1
+
+    async def hash(self, password: str) -> str:
+        return await self._submit(hash_password, password, self.rounds)
+
+    async def verify(self, password: str, hashed: str) -> bool:
+        return await self._submit(verify_password, password, hashed)
+
+    def needs_rehash(self, hashed: str) -> bool:
+        return password_needs_rehash(hashed, self.rounds)
@@ -2,7 +2,6 @@
 
 import uuid
 import time
-import threading
 from threading import Lock
 
 from settings import SESSION_TIMEOUT  # in seconds
@@ -10,17 +9,24 @@ from settings import SESSION_TIMEOUT  # in seconds
 class SessionManager:
     """
     In‑memory session token manager with expiration.
+
+    Expired tokens are always rejected by validate_session(); with a
+    `scheduler` (game.scheduler.Scheduler) they are also removed when
+    their timeout runs out, instead of by a periodic full scan.  Each
+    session has one pending timer: when it fires on a session that was
+    used since, it is re-armed for the remaining time.  Without a
+    scheduler, create/validate sweep out expired sessions at most once
+    per timeout.
     """
 
-    def __init__(self):
+    def __init__(self, scheduler=None):
         # token -> (user_id, last_access_time)
         self.sessions = {}
         self.session_timeout = SESSION_TIMEOUT
         self._lock = Lock()
-
-        # start background cleanup
-        thread = threading.Thread(target=self._cleanup_loop, daemon=True)
-        thread.start()
+        self.scheduler = scheduler
+        self._timers = {}  # token -> pending expiry timer
+        self._last_sweep = time.time()  # no-scheduler fallback
 
     def create_session(self, user_id: int) -> str:
         """
@@ -29,7 +35,9 @@ class SessionManager:
         token = uuid.uuid4().hex
         now = time.time()
         with self._lock:
+            self._sweep_if_due(now)
             self.sessions[token] = (user_id, now)
+        self._schedule_expiry(token, self.session_timeout)
         return token
 
     def validate_session(self, token: str) -> int | None:
@@ -39,6 +47,7 @@ class SessionManager:
         """
         now = time.time()
         with self._lock:
+            self._sweep_if_due(now)
             data = self.sessions.get(token)
             if not data:
                 return None
@@ -46,10 +55,15 @@ class SessionManager:
             if now - ts > self.session_timeout:
                 # expired
                 del self.sessions[token]
-                return None
-            # update last access time (sliding timeout)
-            self.sessions[token] = (user_id, now)
-            return user_id
+                expired = True
+            else:
+                # update last access time (sliding timeout)
+                self.sessions[token] = (user_id, now)
+                expired = False
+        if expired:
+            self._cancel_expiry(token)
+            return None
+        return user_id
 
     def delete_session(self, token: str) -> None:
         """
@@ -57,16 +71,40 @@ class SessionManager:
         """
         with self._lock:
             self.sessions.pop(token, None)
+        self._cancel_expiry(token)
+
+    def _sweep_if_due(self, now: float) -> None:
+        # caller holds self._lock; timers do this job when there is a scheduler
+        if self.scheduler is not None or now - self._last_sweep < self.session_timeout:
+            return
+        self._last_sweep = now
+        expired = [t for t, (_, ts) in self.sessions.items()
+                   if now - ts > self.session_timeout]
+        for token in expired:
+            del self.sessions[token]
+
+    def _schedule_expiry(self, token: str, delay: float) -> None:
+        if self.scheduler is not None:
+            self._timers[token] = self.scheduler.call_later(delay, self._expire, token)
 
-    def _cleanup_loop(self):
+    def _cancel_expiry(self, token: str) -> None:
+        timer = self._timers.pop(token, None)
+        if timer is not None:
+            timer.cancel()
+
+    def _expire(self, token: str) -> None:
         """
-        Periodically remove expired sessions.
+        Timer callback: drop the session if it has been idle for the
+        full timeout, else re-arm for the time it has left.
         """
-        while True:
-            time.sleep(self.session_timeout)
-            now = time.time()
-            with self._lock:
-                expired = [t for t, (_, ts) in self.sessions.items()
-                           if now - ts > self.session_timeout]
-                for t in expired:
-                    del self.sessions[t]
+        self._timers.pop(token, None)
+        now = time.time()
+        with self._lock:
+            data = self.sessions.get(token)
+            if not data:
+                return
+            remaining = self.session_timeout - (now - data[1])
+            if remaining <= 0:
+                del self.sessions[token]
+                return
+        self._schedule_expiry(token, remaining)
@@ -1,48 +1,86 @@
-import base64
-import os
-from typing import List, Dict
-from database.song_database import SongDatabase
-from database.users_database import UsersDatabase
-from game.song import Song
-from settings import SONGS_DB_PATH, USERS_DB_PATH
+import threading
+from collections import OrderedDict
+from typing import List, Dict, Optional, Set
+from database.song_database import SongDatabase, HISTORY_LIMIT
+from game.album_art import get_album_art, FULL, THUMB
+from settings import SONGS_DB_PATH
 
+MAX_CACHED_USERS = 256
+MAX_PAGE_SIZE = HISTORY_LIMIT  # no user ever has more entries than this
 
-def get_user_history_payload(username: str) -> List[Dict]:
-    """
-    Fetches a user's play history and returns a list of song dicts with their metadata,
-    including base64-encoded album cover images and played_at timestamps.
-    """
+# username -> full (newest→oldest) history payload, LRU; dropped on any history write
+_payload_cache: "OrderedDict[str, List[Dict]]" = OrderedDict()
+# bumped on invalidation so a build racing with a write is never cached
+_generation: Dict[str, int] = {}
+_cache_lock = threading.Lock()
 
-    # 1) Connect to SongDatabase
-    db = SongDatabase(SONGS_DB_PATH)
 
-    # 2) Get raw history entries: [{'song_name':..., 'played_at':...}, ...]
-    raw_history = db.get_user_history(username)
+def invalidate_user_history(usernames: Set[str]) -> None:
+    with _cache_lock:
+        for username in usernames:
+            _payload_cache.pop(username, None)
+            _generation[username] = _generation.get(username, 0) + 1
 
-    payload = []
-    for entry in raw_history:
-        name = entry['song_name']
-        played_at = entry['played_at']
-
-        # 3) Load full song metadata
-        song = Song(name, db)
-        info = song.to_dict()
-
-        # 4) Remove id
-        info.pop('id')
-
-        # 5) Attach played_at
-        info['played_at'] = played_at
-
-        # 6) Read album_cover_image file and base64-encode
-        cover_path = info['album_cover_image']
-        if cover_path and os.path.isfile(cover_path):
-            with open(cover_path, 'rb') as f:
-                raw_bytes = f.read()
-            info['album_cover_image'] = base64.b64encode(raw_bytes).decode('ascii')
-        else:
-            # If no file, leave the original or set empty
-            info['album_cover_image'] = None
-        payload.append(info)
 
+SongDatabase.on_history_change(invalidate_user_history)
+
+
+def _build_history_payload(username: str) -> List[Dict]:
+    # 1) One JOIN returns every entry with its full song metadata
+    db = SongDatabase(SONGS_DB_PATH)
+    rows = db.get_user_history_details(username)
+
+    # 2) Swap each cover path for album-art ids: the list view shows the
+    #    thumbnail, the song detail page fetches the full image on open
+    album_art = get_album_art()
+    payload = []
+    for row in rows:
+        info = dict(row)
+        info['album_cover_full_id'] = album_art.cover_id(info['album_cover_image'], FULL)
+        payload.append(album_art.attach(info, THUMB))
     return payload
+
+
+def get_user_history_payload(username: str,
+                             since: Optional[int] = None,
+                             offset: int = 0,
+                             limit: Optional[int] = None) -> Dict:
+    """
+    Returns a page of the user's play history, newest first:
+      {'history': [song dicts with metadata, album_cover_id (thumbnail),
+                   album_cover_full_id, played_at,
+                   history_id], 'latest_id': ..., 'has_more': ...}
+
+    `since` is the highest history_id the client already has; only newer
+    entries are returned.  `offset`/`limit` page through the result;
+    offset is clamped to >= 0 and limit to 1..MAX_PAGE_SIZE.
+    The full payload is cached per user until their history changes.
+    """
+    with _cache_lock:
+        full = _payload_cache.get(username)
+        if full is not None:
+            _payload_cache.move_to_end(username)
+        generation = _generation.get(username, 0)
+    if full is None:
+        full = _build_history_payload(username)
+        with _cache_lock:
+            if _generation.get(username, 0) == generation:
+                _payload_cache[username] = full
+                if len(_payload_cache) > MAX_CACHED_USERS:
+                    _payload_cache.popitem(last=False)
+
+    offset = max(offset, 0)
+    if limit is not None:
+        limit = min(max(limit, 1), MAX_PAGE_SIZE)
+
+    entries = full
+    if since is not None:
+        entries = [e for e in entries if e['history_id'] > since]
+    end = None if limit is None else offset + limit
+    page = entries[offset:end]
+
+    return {
+        'history': page,
+        'latest_id': full[0]['history_id'] if full else since,
+        'has_more': end is not None and end < len(entries),
+    }
@@ -1,5 +1,8 @@
 # server.py
 
+import time
+_PROCESS_T0 = time.perf_counter()
+
 import os
 import asyncio
 import json
@@ -13,7 +16,8 @@ from websockets.legacy.server import WebSocketServerProtocol
 from settings                import (
     SERVER_HOST, SERVER_PORT, USE_SSL, USERS_DB_PATH, SONGS_DB_PATH,
     MAX_FAILED_LOGIN, BRUTE_FORCE_WINDOW, RATE_LIMIT, RATE_LIMIT_WINDOW,
-    SESSION_TIMEOUT, SSL_CERT_PATH, SSL_KEY_PATH
+    SESSION_TIMEOUT, SSL_CERT_PATH, SSL_KEY_PATH, DB_WORKERS, DB_STATS_INTERVAL,
+    HISTORY_FLUSH_INTERVAL, GAME_STATS_INTERVAL, CATALOGUE_CHECK_INTERVAL
 )
 from security.brute_force      import BruteForceProtector
 from security.rate_limiter     import RateLimiter
@@ -21,11 +25,20 @@ from security.session_manager  import SessionManager
 from security.ssl_context      import create_ssl_context
 from database.users_database   import UsersDatabase
 from database.song_database    import SongDatabase
-from model.predictor           import predict_from_bytes
+from database.song_catalogue   import get_song_catalogue
+from database.async_database   import AsyncDatabase
+from database.history_writer   import HistoryWriteBuffer
 from game.player               import Player
 from game.game_hub             import GameHub
-from security.crypto_utils     import verify_password, hash_password
+from game.game_server          import GAME_MODES
+from game.album_art            import get_album_art
+from game.clip_catalogue       import get_clip_catalogue
+from game.scheduler            import get_scheduler
+from security.crypto_utils     import PasswordHasher, PasswordWorkRejected
 from history_utils             import get_user_history_payload
+from warmup                    import ModelWarmup
+
+STARTUP_TIMINGS_MS = {"imports": round((time.perf_counter() - _PROCESS_T0) * 1000.0, 1)}
 
 MAX_WS_MSG_SIZE  = 1_000_000 # 1MB
 USERNAME_REGEX   = re.compile(r'^[A-Za-z0-9]{3,12}$')
@@ -33,12 +46,40 @@ PASSWORD_REGEX   = re.compile(r'(?=.*[A-Za-z])(?=.*\d)(?=.*[^A-Za-z0-9]).{6,12}'
 
 #r'(?=.*[A-Za-z])(?=.*\d)(?=.*[^A-Za-z0-9]).{6,12}'
 # Shared state:
-sessions     = SessionManager()
+SCHEDULER    = get_scheduler()   # round ends, lobby timeouts, pruning, session expiry
+sessions     = SessionManager(scheduler=SCHEDULER)
 brute_force  = BruteForceProtector(MAX_FAILED_LOGIN, BRUTE_FORCE_WINDOW)
 rate_limiter = RateLimiter(RATE_LIMIT, RATE_LIMIT_WINDOW)
 USERS_DB     = UsersDatabase(db_path=USERS_DB_PATH)
 SONGS_DB     = SongDatabase(db_path=SONGS_DB_PATH)
-game_hub     = GameHub(songs_db=SONGS_DB)
+# Handlers await DB work through these so sqlite I/O stays off the event loop
+USERS_DB_ASYNC = AsyncDatabase(USERS_DB, name="users", workers=DB_WORKERS)
+SONGS_DB_ASYNC = AsyncDatabase(SONGS_DB, name="songs", workers=DB_WORKERS)
+SONG_CATALOGUE = get_song_catalogue()
+HISTORY_WRITER = HistoryWriteBuffer(SONGS_DB, SONG_CATALOGUE,
+                                    flush_interval=HISTORY_FLUSH_INTERVAL)
+CLIP_CATALOGUE = get_clip_catalogue()  # scanned once, not per round
+game_hub     = GameHub(songs_db=SONG_CATALOGUE)
+PASSWORD_HASHER = PasswordHasher()
+ALBUM_ART    = get_album_art()
+model_warmup = ModelWarmup()
+# Fire-and-forget tasks; the loop only holds weak references to tasks
+BACKGROUND_TASKS = set()
+
+def run_in_background(coro) -> asyncio.Task:
+    """Start `coro` as a task that stays referenced until it finishes."""
+    task = asyncio.create_task(coro)
+    BACKGROUND_TASKS.add(task)
+    task.add_done_callback(BACKGROUND_TASKS.discard)
+    return task
+
+async def rehash_password(username: str, password: str):
+    """Upgrade a stored hash to the configured bcrypt cost after a good login."""
+    try:
+        new_hash = await PASSWORD_HASHER.hash(password)
+    except PasswordWorkRejected:
+        return  # try again on a later login
+    await USERS_DB_ASYNC.update_password_hash(username, new_hash)
 
 async def handler(ws):
     """
@@ -81,7 +122,7 @@ async def handler(ws):
                 continue
 
             # 2) Enforce uniqueness
-            if USERS_DB.get_user_by_username(uname):
+            if await USERS_DB_ASYNC.get_user_by_username(uname):
                 await ws.send(json.dumps({
                     "status": "error", "reason": "user_exists"
                 }))
@@ -90,8 +131,14 @@ async def handler(ws):
             # 3) Re‑hash the client hash and store
             created = False
             if USERNAME_REGEX.fullmatch(uname) and PASSWORD_REGEX.fullmatch(pwd):
-                hashed_pwd = hash_password(pwd)
-                created = USERS_DB.add_user(uname, hashed_pwd)
+                try:
+                    hashed_pwd = await PASSWORD_HASHER.hash(pwd)
+                except PasswordWorkRejected:
+                    await ws.send(json.dumps({
+                        "status": "error", "reason": "server_busy"
+                    }))
+                    continue
+                created = await USERS_DB_ASYNC.add_user(uname, hashed_pwd)
             if not created:
                 await ws.send(json.dumps({
                     "status": "error", "reason": "couldn't_create_user"
@@ -116,14 +163,24 @@ async def handler(ws):
 
             uname_in = data.get("username", "").strip()
             pwd_in = data.get("password", "")
-            row = USERS_DB.get_user_by_username(uname_in)
+            row = await USERS_DB_ASYNC.get_user_by_username(uname_in)
             if not USERNAME_REGEX.fullmatch(uname_in) and PASSWORD_REGEX.fullmatch(pwd_in):
                 await ws.send(json.dumps({
                     "status": "error", "reason": "invalid_credentials"
                 }))
                 continue
-            if row and verify_password(pwd_in, row[2]):
+            try:
+                verified = bool(row) and await PASSWORD_HASHER.verify(pwd_in, row[2])
+            except PasswordWorkRejected:
+                # shed load rather than queue; not counted as a failed attempt
+                await ws.send(json.dumps({
+                    "status": "error", "reason": "server_busy"
+                }))
+                continue
+            if verified:
                 uname = row[1]
+                if PASSWORD_HASHER.needs_rehash(row[2]):
+                    run_in_background(rehash_password(uname, pwd_in))
                 token = sessions.create_session(uname)
                 user  = uname
                 await ws.send(json.dumps({
@@ -146,197 +203,275 @@ async def handler(ws):
         await ws.close()
         return
 
-    # 3) Main loop
-    async for raw in ws:
-        # rate‑limit per request
-        if not rate_limiter.allow(peer):
-            await ws.send(json.dumps({
-                "status": "error", "reason": "rate_limit_exceeded"
-            }))
-            break
+    # 3) Main loop (leaves any game when the connection ends)
+    try:
+        async for raw in ws:
+            # rate‑limit per request
+            if not rate_limiter.allow(peer):
+                await ws.send(json.dumps({
+                    "status": "error", "reason": "rate_limit_exceeded"
+                }))
+                break
 
-        try:
-            msg = json.loads(raw)
-        except json.JSONDecodeError:
-            continue
+            try:
+                msg = json.loads(raw)
+            except json.JSONDecodeError:
+                continue
 
-        action = msg.get("action")
-        data   = msg.get("data", {})
+            action = msg.get("action")
+            data   = msg.get("data", {})
 
-        # ping/pong
-        if action == "ping":
-            await ws.send(json.dumps({"action": "pong"}))
-            continue
+            # ping/pong
+            if action == "ping":
+                await ws.send(json.dumps({
+                    "action": "pong", "models": model_warmup.status()
+                }))
+                continue
 
-        # validate session
-        t = data.get("token")
-        if t != token or sessions.validate_session(t) != user:
-            await ws.send(json.dumps({
-                "status": "error", "reason": "session_invalid"
-            }))
-            break
+            # validate session
+            t = data.get("token")
+            if t != token or sessions.validate_session(t) != user:
+                await ws.send(json.dumps({
+                    "status": "error", "reason": "session_invalid"
+                }))
+                break
 
-        # — HISTORY —
-        if action == "get_history":
-            # Fetch and send user history
-            history_payload = get_user_history_payload(user)
-            await ws.send(json.dumps({
-                'status': 'ok',
-                'history': history_payload
-            }))
-            continue
+            # — HISTORY —
+            if action == "get_history":
+                # Optional range: only entries newer than `since`, paged by
+                # offset/limit (clamped by get_user_history_payload)
+                since, limit = data.get("since"), data.get("limit")
+                try:
+                    since  = int(since) if since is not None else None
+                    offset = int(data.get("offset", 0))
+                    limit  = int(limit) if limit is not None else None
+                except (TypeError, ValueError):
+                    await ws.send(json.dumps({
+                        "status": "error", "reason": "invalid_history_range"
+                    }))
+                    continue
+                # Make the user's own buffered plays visible before reading
+                if HISTORY_WRITER.has_pending(user):
+                    await SONGS_DB_ASYNC.run("history_flush", HISTORY_WRITER.flush)
+                history_page = await SONGS_DB_ASYNC.run(
+                    "get_user_history_payload", get_user_history_payload, user,
+                    since=since, offset=offset, limit=limit)
+                await ws.send(json.dumps({
+                    'status': 'ok',
+                    **history_page
+                }))
+                continue
 
-        # — PREDICT —
-        if action == "predict":
-            audio_b64 = data.get("audio")
-            fmt       = data.get("format", "wav")
-            if not audio_b64:
+            # — ALBUM COVERS —
+            if action == "get_cover":
+                # Bodies for the cover ids the client does not hold yet; ids
+                # are content hashes, so anything already cached client-side
+                # is still valid and is never asked for again
+                cover_ids = data.get("cover_ids") or []
+                if not isinstance(cover_ids, list):
+                    cover_ids = [cover_ids]
+                covers = await asyncio.to_thread(ALBUM_ART.get_covers, cover_ids)
                 await ws.send(json.dumps({
-                    "status": "error", "reason": "audio_required"
+                    "type": "covers", "data": {"covers": covers}
                 }))
                 continue
 
-            try:
-                pcm = base64.b64decode(audio_b64)
-            except Exception:
+            # — PREDICT —
+            if action == "predict":
+                audio_b64 = data.get("audio")
+                fmt       = data.get("format", "wav")
+                if not audio_b64:
+                    await ws.send(json.dumps({
+                        "status": "error", "reason": "audio_required"
+                    }))
+                    continue
+
+                try:
+                    pcm = base64.b64decode(audio_b64)
+                except Exception:
+                    await ws.send(json.dumps({
+                        "status": "error", "reason": "invalid_audio_format"
+                    }))
+                    continue
+
+                if model_warmup.failed:
+                    await ws.send(json.dumps({
+                        "status": "error", "reason": "model_unavailable"
+                    }))
+                    continue
+                if not model_warmup.ready:
+                    await ws.send(json.dumps({
+                        "status": "warming_up", "reason": "model_loading"
+                    }))
+                    continue
+
+                info = model_warmup.predict_from_bytes(pcm, fmt=fmt)
                 await ws.send(json.dumps({
-                    "status": "error", "reason": "invalid_audio_format"
+                    "status": "ok", "song": info
                 }))
+                # ask client to confirm
+                await ws.send(json.dumps({"action": "confirm"}))
                 continue
 
-            info = predict_from_bytes(pcm, fmt=fmt)
-            await ws.send(json.dumps({
-                "status": "ok", "song": info
-            }))
-            # ask client to confirm
-            await ws.send(json.dumps({"action": "confirm"}))
-            continue
+            # — FEEDBACK —
+            if action == "prediction_feedback":
+                song_name = data.get("song_name")
+                correct   = data.get("correct", False)
+                if song_name and correct:
+                    # buffered; written in the next batched history transaction
+                    HISTORY_WRITER.add(user, song_name)
+                await ws.send(json.dumps({
+                    "status": "ok", "action": "feedback_received"
+                }))
+                continue
 
-        # — FEEDBACK —
-        if action == "prediction_feedback":
-            song_name = data.get("song_name")
-            correct   = data.get("correct", False)
-            if song_name and correct:
-                SONGS_DB.update_song_history(user, song_name)
-            await ws.send(json.dumps({
-                "status": "ok", "action": "feedback_received"
-            }))
-            continue
+            # — CREATE GAME —
+            if action == "create_game":
+                mode = data.get("mode", "classic")
+                if mode not in GAME_MODES:
+                    await ws.send(json.dumps({
+                        "status": "error", "reason": "invalid_mode"
+                    }))
+                    continue
+                host_player = Player(user, ws)
+                server = await game_hub.create_game(host_player, mode)
+                if not server:
+                    await ws.send(json.dumps({
+                        "status": "error", "reason": "max_games_reached"
+                    }))
+                else:
+                    # Tell the client that creation succeeded; the lobby
+                    # page pulls the full state itself with resync
+                    await ws.send(json.dumps({
+                        "status": "ok", "game_id": server.game_id
+                    }))
+                continue
 
-        # — CREATE GAME —
-        if action == "create_game":
-            host_player = Player(user, ws)
-            server = await game_hub.create_game(host_player)
-            if not server:
+            # — JOIN GAME —
+            if action == "join_game":
+                p = Player(user, ws)
+                success, reason = await game_hub.join_game(p, data.get("game_id",""))
                 await ws.send(json.dumps({
-                    "status": "error", "reason": "max_games_reached"
+                    "status": "ok" if success else "error",
+                    **({"reason": reason} if not success else {})
                 }))
-            else:
-                # 1) Tell the client that creation succeeded
+                continue
+
+            if action == "get_players":
+                await game_hub.get_players(ws)
+                continue
+
+            # — RESYNC (versioned game state) —
+            if action == "resync":
+                try:
+                    version = int(data.get("version", -1))
+                except (TypeError, ValueError):
+                    version = -1
+                ok, reason = await game_hub.resync(ws, version)
+                if not ok:
+                    await ws.send(json.dumps({"status": "error", "reason": reason}))
+                continue
+
+            # — GUESS —
+            if action == "guess":
+                # Look up the GameServer for this user
+                success, reason = await game_hub.handle_guess(ws, {
+                    "guess": data.get("guess", ""),
+                    "guess_time": data.get("guess_time", 0.0),
+                })
                 await ws.send(json.dumps({
-                    "status": "ok", "game_id": server.game_id
+                    "status": "ok" if success else "error",
+                    **({"reason": reason} if not success else {})
                 }))
+                continue
 
-                # 2) Immediately send the full lobby state
+            # — NEXT ROUND (host only) —
+            if action == "next_round":
+                success, reason = await game_hub.handle_next_round(ws)
                 await ws.send(json.dumps({
-                    "type": "game_state",
-                    "data": {
-                        "game_id": server.game_id,
-                        "host": server.host.username,
-                        "state": server.state,
-                        "settings": server.settings,
-                        "players": [
-                            {"id": p.id, "username": p.username}
-                            for p in server.players
-                        ]
-                    }
+                    "status": "ok" if success else "error",
+                    **({"reason": reason} if not success else {})
                 }))
-            continue
-
-        # — JOIN GAME —
-        if action == "join_game":
-            p = Player(user, ws)
-            success, reason = await game_hub.join_game(p, data.get("game_id",""))
-            await ws.send(json.dumps({
-                "status": "ok" if success else "error",
-                **({"reason": reason} if not success else {})
-            }))
-            continue
-
-        if action == "get_players":
-            await game_hub.get_players(ws)
-            continue
+                continue
 
-        # — GUESS —
-        if action == "guess":
-            # Look up the GameServer for this user
-            success, reason = await game_hub.handle_guess(ws, {
-                "guess": data.get("guess", ""),
-                "guess_time": data.get("guess_time", 0.0),
-            })
-            await ws.send(json.dumps({
-                "status": "ok" if success else "error",
-                **({"reason": reason} if not success else {})
-            }))
-            continue
+            # — KICK PLAYER —
+            if action == "kick_player":
+                success, reason = await game_hub.kick_player_by_username(ws, data.get("username",""))
+                await ws.send(json.dumps({
+                    "status": "ok" if success else "error",
+                    **({"reason":reason} if not success else {})
+                }))
+                continue
 
-        # — NEXT ROUND (host only) —
-        if action == "next_round":
-            success, reason = await game_hub.handle_next_round(ws)
-            await ws.send(json.dumps({
-                "status": "ok" if success else "error",
-                **({"reason": reason} if not success else {})
-            }))
-            continue
+            # — UPDATE SETTINGS —
+            if action == "update_settings":
+                ok, reason = await game_hub.update_lobby_settings(ws, data)
+                await ws.send(json.dumps({
+                    "status": "ok" if ok else "error",
+                    **({"reason":reason} if not ok else {})
+                }))
+                continue
 
-        # — KICK PLAYER —
-        if action == "kick_player":
-            success, reason = await game_hub.kick_player_by_username(ws, data.get("username",""))
-            await ws.send(json.dumps({
-                "status": "ok" if success else "error",
-                **({"reason":reason} if not success else {})
-            }))
-            continue
+            # — START GAME —
+            if action == "start_game":
+                ok, reason = await game_hub.start_game(ws)
+                await ws.send(json.dumps({
+                    "status": "ok" if ok else "error",
+                    **({"reason": reason} if not ok else {})
+                }))
+                continue
 
-        # — UPDATE SETTINGS —
-        if action == "update_settings":
-            ok, reason = await game_hub.update_lobby_settings(ws, data)
-            await ws.send(json.dumps({
-                "status": "ok" if ok else "error",
-                **({"reason":reason} if not ok else {})
-            }))
-            continue
+            # — LOGOUT —
+            if action == "logout":
+                # Remove their session server‐side
+                sessions.delete_session(token)
+                # Acknowledge back to the client
+                await ws.send(json.dumps({"status": "ok"}))
+                # Break out of the loop to close the socket
+                break
 
-        # — START GAME —
-        if action == "start_game":
-            ok, reason = await game_hub.start_game(ws)
+            # unknown
             await ws.send(json.dumps({
-                "status": "ok" if ok else "error",
-                **({"reason": reason} if not ok else {})
+                "status": "error", "reason": "unknown_action"
             }))
-            continue
-
-        # — LOGOUT —
-        if action == "logout":
-            # Remove their session server‐side
-            sessions.sessions.pop(token, None)
-            # Acknowledge back to the client
-            await ws.send(json.dumps({"status": "ok"}))
-            # Break out of the loop to close the socket
-            break
-
-        # unknown
-        await ws.send(json.dumps({
-            "status": "error", "reason": "unknown_action"
-        }))
+    finally:
+        await game_hub.disconnect(ws)
 
     await ws.close()
 
+async def log_db_stats(interval: int):
+    """Periodically print per-query DB latency, separate from handler time."""
+    while True:
+        await asyncio.sleep(interval)
+        print(f"[DB] users: {USERS_DB_ASYNC.latency_report()}")
+        print(f"[DB] songs: {SONGS_DB_ASYNC.latency_report()}")
+
+async def refresh_song_catalogue(interval: float):
+    """Periodically pick up songs written by another process (e.g. the setup worker)."""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            if await SONGS_DB_ASYNC.run("catalogue_refresh", SONG_CATALOGUE.refresh):
+                print(f"Song catalogue reloaded: {len(SONG_CATALOGUE)} songs")
+        except Exception as e:
+            print(f"[ERROR] Song catalogue refresh failed: {e}")
+
+async def log_game_stats(interval: int):
+    """Periodically print per-game outbound queue depth and send lag, and live timers."""
+    while True:
+        await asyncio.sleep(interval)
+        for gid, stats in game_hub.outbound_stats().items():
+            print(f"[GAME] {gid}: {stats}")
+        print(f"[TIMERS] {SCHEDULER.stats()}")
+
 async def main():
+    t0 = time.perf_counter()
     # 1) Build SSLContext if needed
     ssl_ctx = create_ssl_context() if USE_SSL else None
+    STARTUP_TIMINGS_MS["ssl_context"] = round((time.perf_counter() - t0) * 1000.0, 1)
 
     # 2) Start the WebSocket server (this now runs inside a running loop)
+    t1 = time.perf_counter()
     server = await websockets.serve(
         handler,
         host='0.0.0.0',
@@ -345,13 +480,30 @@ async def main():
         ping_interval=None,
         max_size=MAX_WS_MSG_SIZE
     )
-    print(f"WebSocket server listening on {SERVER_HOST}:{SERVER_PORT}...")
-
-    # 3) Schedule your background prune task
-    asyncio.create_task(game_hub.prune_finished())
+    STARTUP_TIMINGS_MS["bind"] = round((time.perf_counter() - t1) * 1000.0, 1)
+    STARTUP_TIMINGS_MS["since_process_start"] = round((time.perf_counter() - _PROCESS_T0) * 1000.0, 1)
+    print(f"WebSocket server listening on {SERVER_HOST}:{SERVER_PORT}... "
+          f"startup: {STARTUP_TIMINGS_MS}")
+
+    # Load torch and the model pool in the background; predict answers
+    # "warming_up" until this completes
+    model_warmup.start()
+
+    # 3) Background stats and catalogue refresh (finished games and
+    #    expired sessions are dropped by SCHEDULER timers, not polled)
+    if DB_STATS_INTERVAL > 0:
+        run_in_background(log_db_stats(DB_STATS_INTERVAL))
+    if GAME_STATS_INTERVAL > 0:
+        run_in_background(log_game_stats(GAME_STATS_INTERVAL))
+    if CATALOGUE_CHECK_INTERVAL > 0:
+        run_in_background(refresh_song_catalogue(CATALOGUE_CHECK_INTERVAL))
 
     # 4) Keep the server alive forever
     await server.wait_closed()
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    try:
+        asyncio.run(main())
+    finally:
+        # don't lose plays still sitting in the write-behind buffer
+        HISTORY_WRITER.close()
\ No newline at end of file
@@ -0,0 +1,80 @@
+# server/warmup.py
+
+import time
+import asyncio
+import threading
+from typing import Callable, Dict, Optional
+
+
+class ModelWarmup:
+    """
+    Loads the ML stack (torch/torchaudio, model.predictor, the model pool)
+    on a background thread so the WebSocket server can bind and serve
+    auth/lobby traffic immediately. Records how long each phase took.
+    """
+
+    def __init__(self):
+        self.phases_ms: Dict[str, float] = {}
+        self.error: Optional[str] = None
+        self._ready = threading.Event()
+        self._predict: Optional[Callable] = None
+        self._started_at: Optional[float] = None
+
+    @property
+    def ready(self) -> bool:
+        return self._ready.is_set()
+
+    @property
+    def failed(self) -> bool:
+        """True once loading has given up; the server cannot predict."""
+        return self.error is not None
+
+    def _timed(self, phase: str, fn: Callable):
+        t0 = time.perf_counter()
+        result = fn()
+        self.phases_ms[phase] = round((time.perf_counter() - t0) * 1000.0, 1)
+        return result
+
+    @staticmethod
+    def _import_ml():
+        import torch       # noqa: F401
+        import torchaudio  # noqa: F401
+
+    @staticmethod
+    def _import_predictor():
+        from model import predictor
+        return predictor
+
+    def _load(self) -> None:
+        try:
+            self._timed("import_ml", self._import_ml)
+            predictor = self._timed("import_predictor", self._import_predictor)
+            pool = self._timed("load_models", predictor.get_model_pool)
+            # one throwaway forward pass so the first real request
+            # does not pay for lazy kernel/allocator initialisation
+            import numpy as np
+            dummy = np.zeros((1, 128, 216), dtype=np.float32)
+            self._timed("first_inference",
+                        lambda: predictor.predict_spectrograms(dummy, pool=pool))
+            self._predict = predictor.predict_from_bytes
+            self._ready.set()
+        except Exception as e:
+            self.error = repr(e)
+            print(f"[ERROR] Model warm-up failed: {e}")
+        finally:
+            self.phases_ms["total"] = round((time.perf_counter() - self._started_at) * 1000.0, 1)
+            print(f"Model warm-up {'ready' if self.ready else 'failed'}: {self.phases_ms}")
+
+    def start(self) -> asyncio.Future:
+        """Kick off loading on the default executor; returns its future."""
+        self._started_at = time.perf_counter()
+        loop = asyncio.get_running_loop()
+        return loop.run_in_executor(None, self._load)
+
+    def predict_from_bytes(self, audio_bytes: bytes, fmt: str = "wav") -> dict:
+        """Only valid once `ready` is True."""
+        return self._predict(audio_bytes, fmt=fmt)
+
+    def status(self) -> Dict:
+        """Readiness, the failure (if any) and per-phase timings, for health checks."""
+        return {"ready": self.ready, "error": self.error, "phases_ms": dict(self.phases_ms)}
@@ -73,4 +73,77 @@ SPECTROGRAM_DIR       = _get_env("SPECTROGRAM_DIR")
 SPOTIFY_CLIENT_ID     = _get_env("SPOTIFY_CLIENT_ID")
 SPOTIFY_CLIENT_SECRET = _get_env("SPOTIFY_CLIENT_SECRET")
 SPOTIFY_REDIRECT_URI  = _get_env("SPOTIFY_REDIRECT_URI")
-SPOTIFY_SCOPE         = _get_env("SPOTIFY_SCOPE")
\ No newline at end of file
+SPOTIFY_SCOPE         = _get_env("SPOTIFY_SCOPE")
+
+# 12) Training checkpoints
+PRETRAINED_MODEL_PATH = os.path.join(
+    _BASE_DIR,
+    _get_env("PRETRAINED_MODEL_PATH", "contrastive_pretrained_model")
+)
+CHECKPOINT_DIR   = os.path.join(
+    _BASE_DIR,
+    _get_env("CHECKPOINT_DIR", "checkpoints")
+)
+CHECKPOINT_EVERY = int(_get_env("CHECKPOINT_EVERY", "500"))  # optimizer steps
+
+# 13) Evaluation
+HOLDOUT_EVERY = int(_get_env("HOLDOUT_EVERY", "0"))  # e.g. 5: hold out every 5th part for evaluation; 0 = train on all
+EVAL_REPORT_DIR = os.path.join(
+    _BASE_DIR,
+    _get_env("EVAL_REPORT_DIR", "eval_reports")
+)
+
+# 14) Database access from the async server
+DB_WORKERS        = int(_get_env("DB_WORKERS", "2"))
+DB_STATS_INTERVAL = int(_get_env("DB_STATS_INTERVAL", "0"))  # seconds, 0 = off
+HISTORY_FLUSH_INTERVAL = float(_get_env("HISTORY_FLUSH_INTERVAL", "0.25"))  # seconds
+CATALOGUE_CHECK_INTERVAL = float(_get_env("CATALOGUE_CHECK_INTERVAL", "10"))  # seconds, 0 = off; for writes by other processes
+
+# 15) Password hashing
+BCRYPT_ROUNDS        = int(_get_env("BCRYPT_ROUNDS", "12"))
+PASSWORD_WORKERS     = int(_get_env("PASSWORD_WORKERS", "2"))
+PASSWORD_MAX_PENDING = int(_get_env("PASSWORD_MAX_PENDING", "16"))  # queued + running
+
+# 16) Album art
+ALBUM_IMAGES_DIR = os.path.join(
+    _BASE_DIR,
+    _get_env("ALBUM_IMAGES_DIR", "album_images")
+)
+ALBUM_ART_CACHE_BYTES = int(_get_env("ALBUM_ART_CACHE_MB", "32")) * 1024 * 1024
+
+# 17) Outbound game messages (per-player send queues)
+OUTBOUND_QUEUE_SIZE = int(_get_env("OUTBOUND_QUEUE_SIZE", "64"))       # messages
+OUTBOUND_MAX_LAG    = float(_get_env("OUTBOUND_MAX_LAG", "10"))        # seconds, 0 = never disconnect
+GAME_STATS_INTERVAL = int(_get_env("GAME_STATS_INTERVAL", "0"))        # seconds, 0 = off
+
+# 18) Game clips (transcoded copies + in-memory cache)
+GAME_CLIPS_DIR   = os.path.join(
+    _BASE_DIR,
+    _get_env("GAME_CLIPS_DIR", os.path.join("game", "game_clips"))
+)
+CLIP_BITRATE     = _get_env("CLIP_BITRATE", "48k")
+CLIP_SAMPLE_RATE = int(_get_env("CLIP_SAMPLE_RATE", "22050"))
+CLIP_TARGET_DBFS = float(_get_env("CLIP_TARGET_DBFS", "-16"))
+CLIP_CACHE_BYTES = int(_get_env("CLIP_CACHE_MB", "64")) * 1024 * 1024
+
+# 19) Clip engine (game clips cut from full tracks)
+AUDIO_FOLDER_PATH      = os.path.join(
+    _BASE_DIR,
+    _get_env("AUDIO_FOLDER_PATH", "songs_audio")
+)
+CLIP_SECONDS           = float(_get_env("CLIP_SECONDS", "3"))
+CLIP_ENGINE_CANDIDATES = int(_get_env("CLIP_ENGINE_CANDIDATES", "5"))  # offsets kept per song
+
+# 20) Timers (one scheduler for rounds, lobbies, pruning and sessions)
+LOBBY_IDLE_TIMEOUT = int(_get_env("LOBBY_IDLE_TIMEOUT", "900"))  # seconds without lobby activity
+GAME_PRUNE_DELAY   = int(_get_env("GAME_PRUNE_DELAY", "60"))     # seconds before a finished game is dropped
+
+# 21) Room sizes (classic games vs large arena rooms)
+GAME_MAX_PLAYERS  = int(_get_env("GAME_MAX_PLAYERS", "8"))
+ARENA_MAX_PLAYERS = int(_get_env("ARENA_MAX_PLAYERS", "500"))
+ARENA_TOP_N       = int(_get_env("ARENA_TOP_N", "10"))         # standings rows sent in arena results
+RESULT_BATCH_SIZE = int(_get_env("RESULT_BATCH_SIZE", "100"))  # personal results queued per loop turn
+
+# 22) Versioned game state (delta updates)
+DELTA_LOG_SIZE       = int(_get_env("DELTA_LOG_SIZE", "256"))           # ops kept for resync
+DELTA_FLUSH_INTERVAL = float(_get_env("DELTA_FLUSH_INTERVAL", "0.05"))  # seconds ops are batched
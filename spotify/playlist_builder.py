@@ -90,6 +90,7 @@ def download_album_image(album_name: str, size: tuple[int, int] = (150, 150)) ->
     """
     Download & resize album art (via spotify_api.get_album_image_url),
     saving under ALBUM_IMAGES_DIR and returning the file path.
+    Thumbnail variants are generated alongside (see game.album_art).
     """
     url = get_album_image_url(album_name)
     if not url:
@@ -99,7 +100,9 @@ def download_album_image(album_name: str, size: tuple[int, int] = (150, 150)) ->
     os.makedirs(ALBUM_IMAGES_DIR, exist_ok=True)
     safe = sanitize_filename(album_name)
     dest = os.path.join(ALBUM_IMAGES_DIR, f"{safe}.jpg")
+    from game.album_art import build_cover_variants
     if os.path.exists(dest):
+        build_cover_variants(dest)  # no-op once every variant exists
         return dest
 
     try:
@@ -108,6 +111,8 @@ def download_album_image(album_name: str, size: tuple[int, int] = (150, 150)) ->
         img = Image.open(BytesIO(resp.content)).convert("RGB")
         img = img.resize(size, Image.LANCZOS)
         img.save(dest, format="JPEG", quality=75, optimize=True)
+        # smaller renditions for option tiles / history lists
+        build_cover_variants(dest)
         return dest
     except Exception:
         return None
@@ -0,0 +1,71 @@
+# tests/conftest.py
+
+import os
+import sys
+import json
+
+import pytest
+
+# 1) Import project modules from the repo root
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# 2) settings.py needs these; point them somewhere harmless
+os.environ.setdefault("MODEL_PATH", "model/model.mmap")
+os.environ.setdefault("USE_SSL", "false")
+os.environ.setdefault("GAME_SONGS_DIR", "game/game_songs")
+os.environ.setdefault("AUDIO_BACKGROUND_NOISES", "audio/background_noises")
+
+
+class FakeSocket:
+    """Stands in for a websockets connection; keeps every frame sent."""
+
+    def __init__(self):
+        self.frames = []
+        self.closed = None  # close reason once closed
+
+    async def send(self, frame: str) -> None:
+        self.frames.append(json.loads(frame))
+
+    async def close(self, code: int = 1000, reason: str = "") -> None:
+        self.closed = reason
+
+    def of_type(self, message_type: str):
+        return [f["data"] for f in self.frames if f.get("type") == message_type]
+
+
+@pytest.fixture(autouse=True)
+def fresh_scheduler(monkeypatch):
+    # the process-wide scheduler binds to the first loop it sees, and each
+    # test runs its own loop
+    from game import scheduler
+    monkeypatch.setattr(scheduler, "_scheduler", None)
+
+
+@pytest.fixture
+def game_songs(tmp_path, monkeypatch):
+    """
+    A songs DB with twelve songs, one clip folder each, and the clip
+    catalogue the game modules use pointed at it. Returns the SongCatalogue.
+    """
+    from database.song_database import SongDatabase
+    from database.song_catalogue import SongCatalogue
+    from game import clip_catalogue, game_round, game_server
+
+    db = SongDatabase(str(tmp_path / "songs.db"))
+    names = [f"Song {i}" for i in range(12)]
+    db.upsert_songs([{
+        "song_name": name, "artist_name": "Artist", "album_name": None,
+        "album_cover_image": None, "album_type": "single", "release_date": None,
+        "spotify_url": None, "spectrograms": "[]",
+    } for name in names])
+    songs = SongCatalogue(db)
+
+    songs_dir = tmp_path / "game_songs"
+    for name in names:
+        (songs_dir / name).mkdir(parents=True)
+        (songs_dir / name / "clip.mp3").write_bytes(name.encode())
+    clips = clip_catalogue.ClipCatalogue(str(songs_dir), songs, str(tmp_path / "clips"))
+    for module in (game_round, game_server):
+        monkeypatch.setattr(module, "get_clip_catalogue", lambda: clips)
+    return songs
@@ -0,0 +1,105 @@
+# tests/test_album_art.py
+
+import base64
+
+import pytest
+
+from game import album_art
+from game.album_art import FULL, AlbumArtCache
+
+
+@pytest.fixture
+def covers(tmp_path, monkeypatch):
+    monkeypatch.setattr(album_art, "ALBUM_IMAGES_DIR", str(tmp_path))
+    for name, body in (("a.jpg", b"cover a"), ("b.jpg", b"cover b"), ("c.jpg", b"cover a")):
+        (tmp_path / name).write_bytes(body)
+    return tmp_path
+
+
+def test_ids_are_content_hashes(covers):
+    cache = AlbumArtCache()
+    a = cache.cover_id(str(covers / "a.jpg"))
+    assert a == cache.cover_id(str(covers / "c.jpg"))  # same bytes, same id
+    assert a != cache.cover_id(str(covers / "b.jpg"))
+    assert base64.b64decode(cache.get_b64(a)) == b"cover a"
+    assert cache.cover_id(None) is None and cache.cover_id("missing.jpg") is None
+
+
+def test_foreign_paths_resolve_by_file_name(covers):
+    cache = AlbumArtCache()
+    assert cache.cover_id(r"C:\Users\me\album_images\b.jpg") == cache.cover_id(str(covers / "b.jpg"))
+
+
+def test_evicted_cover_is_reread(covers):
+    cache = AlbumArtCache(max_bytes=12)
+    a = cache.cover_id(str(covers / "a.jpg"))
+    b = cache.cover_id(str(covers / "b.jpg"))
+    assert cache.stats()["cached"] == 1
+    assert base64.b64decode(cache.get_b64(a)) == b"cover a"
+    assert base64.b64decode(cache.get_b64(b)) == b"cover b"
+
+
+def test_replaced_file_invalidates_old_id(covers):
+    cache = AlbumArtCache(max_bytes=1)
+    a = cache.cover_id(str(covers / "a.jpg"))
+    cache.cover_id(str(covers / "b.jpg"))  # evicts a
+    (covers / "a.jpg").write_bytes(b"new art")
+    assert cache.get_b64(a) is None
+
+
+def test_replaced_file_gets_a_new_id(covers):
+    cache = AlbumArtCache()
+    path = str(covers / "a.jpg")
+    old = cache.cover_id(path)
+    (covers / "a.jpg").write_bytes(b"new cover art")
+    new = cache.cover_id(path)
+    assert new != old
+    assert base64.b64decode(cache.get_b64(new)) == b"new cover art"
+
+
+def test_unchanged_file_is_not_reread(covers, monkeypatch):
+    cache = AlbumArtCache()
+    reads = []
+    real_read = cache._read
+    monkeypatch.setattr(cache, "_read", lambda path: reads.append(path) or real_read(path))
+    path = str(covers / "b.jpg")
+    assert cache.cover_id(path) == cache.cover_id(path)
+    assert len(reads) == 1
+
+
+def test_get_covers_maps_unknown_ids_to_none(covers):
+    cache = AlbumArtCache()
+    a = cache.cover_id(str(covers / "a.jpg"))
+    assert set(cache.get_covers([a, "unknown", 7])) == {a, "unknown"}
+    assert cache.get_covers(["unknown"]) == {"unknown": None}
+
+
+def test_attach_swaps_path_for_id(covers):
+    cache = AlbumArtCache()
+    info = cache.attach({"song_name": "x", "album_cover_image": str(covers / "a.jpg")})
+    assert "album_cover_image" not in info
+    assert info["album_cover_id"] == cache.cover_id(str(covers / "a.jpg"), FULL)
+
+
+def test_variants_are_built_and_preferred(covers):
+    from PIL import Image
+
+    full = covers / "art.jpg"
+    Image.new("RGB", (150, 150), (200, 30, 30)).save(full, format="JPEG")
+    written = album_art.build_cover_variants(str(full))
+    assert written == [album_art.variant_file(str(full), album_art.THUMB)]
+    with Image.open(written[0]) as thumb:
+        assert thumb.size == album_art.COVER_VARIANTS[album_art.THUMB][0]
+    assert album_art.build_cover_variants(str(full)) == []  # already there
+
+    cache = AlbumArtCache()
+    thumb_id = cache.cover_id(str(full), album_art.THUMB)
+    assert thumb_id != cache.cover_id(str(full), FULL)
+    with open(written[0], "rb") as f:
+        assert base64.b64decode(cache.get_b64(thumb_id)) == f.read()
+
+
+def test_missing_variant_falls_back_to_full(covers):
+    cache = AlbumArtCache()
+    path = str(covers / "a.jpg")
+    assert cache.cover_id(path, album_art.THUMB) == cache.cover_id(path, FULL)
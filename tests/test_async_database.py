@@ -0,0 +1,41 @@
+# tests/test_async_database.py
+
+import asyncio
+import threading
+
+import pytest
+
+from database.async_database import AsyncDatabase
+
+
+class _FakeDb:
+    def lookup(self, key):
+        return key, threading.current_thread().name
+
+    def fail(self):
+        raise ValueError("boom")
+
+
+def test_methods_run_on_the_db_thread_and_are_timed():
+    db = AsyncDatabase(_FakeDb(), name="t")
+
+    async def main():
+        return await db.lookup("bob")
+
+    value, thread_name = asyncio.run(main())
+    assert value == "bob"
+    assert thread_name.startswith("db-t")
+    assert db.latency_report()["lookup"]["count"] == 1
+    db.shutdown()
+
+
+def test_errors_propagate_and_are_still_recorded():
+    db = AsyncDatabase(_FakeDb())
+
+    async def main():
+        await db.run("failing", db._db.fail)
+
+    with pytest.raises(ValueError):
+        asyncio.run(main())
+    assert db.latency_report()["failing"]["count"] == 1
+    db.shutdown()
@@ -0,0 +1,84 @@
+# tests/test_base_database.py
+
+import sqlite3
+import threading
+
+import pytest
+
+from database.base_database import BaseDatabase
+
+
+def _db(tmp_path, table="items"):
+    db = BaseDatabase(str(tmp_path / "test.db"), table)
+    db.create_table("CREATE TABLE IF NOT EXISTS {table_name} (id INTEGER PRIMARY KEY, name TEXT)")
+    return db
+
+
+def test_instances_on_one_thread_share_a_connection(tmp_path):
+    a, b = _db(tmp_path), _db(tmp_path, "other")
+    assert a._connect() is b._connect()
+    mode = a._connect().execute("PRAGMA journal_mode").fetchone()[0]
+    assert mode.lower() == "wal"
+    a.close()
+
+
+def test_each_thread_gets_its_own_connection(tmp_path):
+    db = _db(tmp_path)
+    main_conn = db._connect()
+    seen = []
+    thread = threading.Thread(target=lambda: seen.append(db._connect()))
+    thread.start()
+    thread.join()
+    assert seen[0] is not main_conn
+    db.close()
+
+
+def test_close_reopens_on_next_use(tmp_path):
+    db = _db(tmp_path)
+    first = db._connect()
+    db.close()
+    assert db._connect() is not first
+    db.close()
+
+
+def test_upsert_many_inserts_and_updates_in_place(tmp_path):
+    db = BaseDatabase(str(tmp_path / "test.db"), "items")
+    db.create_table("CREATE TABLE IF NOT EXISTS {table_name} "
+                    "(id INTEGER PRIMARY KEY, name TEXT UNIQUE, size INTEGER)")
+    assert db.upsert_many([{"name": "a", "size": 1}, {"name": "b", "size": 2}], "name") == 2
+    first_id = db.get_row("name", "a")["id"]
+
+    assert db.upsert_many([{"name": "a", "size": 10}, {"name": "c", "size": 3}], "name") == 2
+    rows = {r["name"]: (r["id"], r["size"]) for r in db.get_all()}
+    assert rows["a"] == (first_id, 10)
+    assert set(rows) == {"a", "b", "c"}
+    assert db.upsert_many([], "name") == 0
+    db.close()
+
+
+def test_upsert_many_is_one_transaction(tmp_path):
+    db = BaseDatabase(str(tmp_path / "test.db"), "items")
+    db.create_table("CREATE TABLE IF NOT EXISTS {table_name} "
+                    "(id INTEGER PRIMARY KEY, name TEXT UNIQUE, size INTEGER NOT NULL)")
+    bad = [{"name": "a", "size": 1}, {"name": "b", "size": None}]
+    with pytest.raises(sqlite3.IntegrityError):
+        db.upsert_many(bad, "name")
+    assert db.get_all() == []
+    db.close()
+
+
+def test_executescript_runs_schema_once(tmp_path):
+    db = _db(tmp_path)
+    script = """
+        CREATE TABLE IF NOT EXISTS counts (n INTEGER);
+        INSERT INTO counts (n) VALUES (1);
+        CREATE TRIGGER IF NOT EXISTS count_items AFTER INSERT ON {table_name}
+        BEGIN
+            UPDATE counts SET n = n + 1;
+        END;
+    """
+    db.executescript(script)
+    db.executescript(script)  # already run in this process: skipped
+    db.insert({"name": "a"})
+    with db._connect() as conn:
+        assert [tuple(r) for r in conn.execute("SELECT n FROM counts")] == [(2,)]
@@ -0,0 +1,55 @@
+# tests/test_checkpoint_format.py
+
+import torch
+
+from model.checkpoint_format import (
+    is_mmap_checkpoint, load_checkpoint, save_mmap_checkpoint
+)
+
+
+def _checkpoint():
+    return {
+        "model_state_dict": {
+            "conv.weight": torch.randn(4, 1, 3, 3),
+            "conv.bias":   torch.randn(4),
+            "bn.num_batches_tracked": torch.tensor(7, dtype=torch.int64),
+        },
+        "labels_to_songs": {0: "song_a.mp3", 12: "song_b.mp3"},
+        "holdout_every": 5,
+    }
+
+
+def test_round_trip(tmp_path):
+    path = str(tmp_path / "model.mmap")
+    original = _checkpoint()
+    save_mmap_checkpoint(original, path)
+
+    assert is_mmap_checkpoint(path)
+    loaded = load_checkpoint(path)
+    assert loaded["holdout_every"] == 5
+    # JSON keys come back as the int labels the predictor indexes with
+    assert loaded["labels_to_songs"] == {0: "song_a.mp3", 12: "song_b.mp3"}
+    for name, tensor in original["model_state_dict"].items():
+        restored = loaded["model_state_dict"][name]
+        assert restored.dtype == tensor.dtype
+        assert torch.equal(restored, tensor)
+
+
+def test_tensors_are_aligned_views(tmp_path):
+    path = str(tmp_path / "model.mmap")
+    save_mmap_checkpoint(_checkpoint(), path)
+    state = load_checkpoint(path)["model_state_dict"]
+    assert all(t.data_ptr() % 64 == 0 for t in state.values())
+
+
+def test_unchanged_file_reuses_mapping(tmp_path):
+    path = str(tmp_path / "model.mmap")
+    save_mmap_checkpoint(_checkpoint(), path)
+    assert load_checkpoint(path) is load_checkpoint(path)
+
+
+def test_torch_save_checkpoint_still_loads(tmp_path):
+    path = str(tmp_path / "model.pt")
+    torch.save(_checkpoint(), path)
+    assert not is_mmap_checkpoint(path)
+    assert load_checkpoint(path)["labels_to_songs"][12] == "song_b.mp3"
@@ -0,0 +1,54 @@
+# tests/test_clip_cache.py
+
+import base64
+import os
+
+from game.clip_cache import ClipCache
+
+
+def _clip(tmp_path, name, body):
+    path = tmp_path / name
+    path.write_bytes(body)
+    return str(path)
+
+
+def test_file_clips_are_cached_until_the_file_changes(tmp_path):
+    cache = ClipCache(max_bytes=1024)
+    path = _clip(tmp_path, "a.mp3", b"first")
+    assert base64.b64decode(cache.get_b64(path)) == b"first"
+    cache.get_b64(path)
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    _clip(tmp_path, "a.mp3", b"second")
+    os.utime(path, (1, 1))  # a re-transcoded file has a new mtime
+    assert base64.b64decode(cache.get_b64(path)) == b"second"
+    assert cache.stats()["clips"] == 1
+
+
+def test_size_bound_evicts_least_recently_used(tmp_path):
+    cache = ClipCache(max_bytes=20)  # room for two 8-byte bodies
+    a, b, c = (_clip(tmp_path, f"{n}.mp3", n.encode() * 6) for n in "abc")
+    cache.get_b64(a)
+    cache.get_b64(b)
+    cache.get_b64(a)  # a is now the most recent
+    cache.get_b64(c)  # evicts b
+    assert cache.stats()["bytes"] <= 20
+    cache.get_b64(a)
+    cache.get_b64(b)
+    assert cache.misses == 4
+
+
+def test_get_or_build_and_oversized_entries(tmp_path):
+    cache = ClipCache(max_bytes=10)
+    calls = []
+
+    def build():
+        calls.append(1)
+        return "QUJD"
+    assert cache.get_or_build(("engine", "song", 1.0), build) == "QUJD"
+    assert cache.get_or_build(("engine", "song", 1.0), build) == "QUJD"
+    assert len(calls) == 1
+
+    # bigger than the whole budget: returned but never kept
+    assert cache.get_or_build("huge", lambda: "x" * 50) == "x" * 50
+    assert "huge" not in cache._entries and cache.stats()["bytes"] <= 10
@@ -0,0 +1,91 @@
+# tests/test_clip_catalogue.py
+
+import os
+
+import pytest
+
+from audio import clip_transcoder
+from game.clip_catalogue import ClipCatalogue
+
+
+class _Songs:
+    """Stands in for the SongCatalogue: only knows a fixed set of names."""
+
+    def __init__(self, names):
+        self.names = set(names)
+
+    def get_song_by_name(self, name):
+        return {"song_name": name} if name in self.names else None
+
+    def list_all_songs(self):
+        return [{"song_name": n} for n in sorted(self.names)]
+
+
+def _clip(root, song, name):
+    os.makedirs(root / song, exist_ok=True)
+    (root / song / name).write_bytes(b"audio")
+    return str(root / song / name)
+
+
+@pytest.fixture
+def dirs(tmp_path, monkeypatch):
+    songs_dir, clips_dir = tmp_path / "songs", tmp_path / "clips"
+    songs_dir.mkdir()
+    clips_dir.mkdir()
+    monkeypatch.setattr(clip_transcoder, "GAME_CLIPS_DIR", str(clips_dir))
+    return songs_dir, clips_dir
+
+
+def test_index_skips_empty_and_unknown_folders(dirs):
+    songs_dir, clips_dir = dirs
+    a1, a2 = _clip(songs_dir, "A", "1.mp3"), _clip(songs_dir, "A", "2.wav")
+    _clip(songs_dir, "A", "notes.txt")
+    _clip(songs_dir, "B", "1.mp3")
+    _clip(songs_dir, "Unknown", "1.mp3")
+    os.makedirs(songs_dir / "Empty")
+
+    catalogue = ClipCatalogue(str(songs_dir), _Songs({"A", "B", "Empty"}), str(clips_dir))
+    assert sorted(catalogue.song_names()) == ["A", "B"]
+    assert catalogue.clips_for("A") == (a1, a2)
+    assert catalogue.random_clip("A") in (a1, a2)
+    assert "Unknown" not in catalogue
+
+
+def test_random_song_respects_exclude(dirs):
+    songs_dir, clips_dir = dirs
+    names = [f"S{i}" for i in range(6)]
+    for name in names:
+        _clip(songs_dir, name, "1.mp3")
+    catalogue = ClipCatalogue(str(songs_dir), None, str(clips_dir))
+
+    assert catalogue.random_song(exclude={"S0", "S1"}) not in {"S0", "S1"}
+    assert catalogue.random_song(exclude=set(names[1:])) == "S0"
+    assert catalogue.random_song(exclude=set(names)) is None
+
+    picked = catalogue.distractors("S0", k=3)
+    assert len(set(picked)) == 3 and "S0" not in picked
+    assert len(catalogue.distractors("S0", k=10)) == 5
+
+
+def test_refresh_only_rescans_on_change(dirs):
+    songs_dir, clips_dir = dirs
+    _clip(songs_dir, "A", "1.mp3")
+    catalogue = ClipCatalogue(str(songs_dir), None, str(clips_dir))
+    assert catalogue.refresh_if_changed(force=True) is False
+    assert catalogue.refresh_if_changed() is False  # throttled
+
+    _clip(songs_dir, "B", "1.mp3")
+    os.utime(songs_dir, (1, 1))  # make sure the mtime moves
+    assert catalogue.refresh_if_changed(force=True) is True
+    assert "B" in catalogue
+
+
+def test_up_to_date_transcoded_copy_is_preferred(dirs):
+    songs_dir, clips_dir = dirs
+    original = _clip(songs_dir, "A", "1.wav")
+    copy = _clip(clips_dir, "A", "1.mp3")
+    _clip(songs_dir, "B", "1.wav")  # no copy yet
+    catalogue = ClipCatalogue(str(songs_dir), None, str(clips_dir))
+    assert catalogue.clips_for("A") == (copy,)
+    assert catalogue.clips_for("B") == (str(songs_dir / "B" / "1.wav"),)
+    assert original not in catalogue.clips_for("A")
@@ -0,0 +1,128 @@
+# tests/test_clip_engine.py
+
+import base64
+import os
+
+import numpy as np
+import pytest
+
+from audio.clip_engine import (
+    FRAME_SECONDS, SEGMENT_HOP_SECONDS, ClipEngine, best_offsets, frame_scores
+)
+from game.clip_catalogue import ClipCatalogue
+
+SONG = "Fake Song"
+
+
+def _write_parts(spec_dir, hot=(19.0, 23.0), parts=23, seed=0):
+    """Quiet noise everywhere except a loud, busy stretch between `hot` seconds."""
+    rng = np.random.default_rng(seed)
+    os.makedirs(spec_dir, exist_ok=True)
+    for idx in range(1, parts + 1):
+        t = (idx - 1) * SEGMENT_HOP_SECONDS + np.arange(216) * FRAME_SECONDS
+        spec = np.full((128, 216), -60.0) + rng.normal(0, 1, (128, 216))
+        mask = (t >= hot[0]) & (t < hot[1])
+        spec[:, mask] = -10 + rng.normal(0, 8, (128, mask.sum()))
+        np.save(os.path.join(spec_dir, f"part{idx}_clean.npy"), spec.astype(np.float32))
+
+
+class _Songs:
+    def __init__(self, spectrograms):
+        self.spectrograms = spectrograms
+
+    def get_song_by_name(self, name):
+        return {"song_name": name, "spectrograms": self.spectrograms} if name == SONG else None
+
+    def list_all_songs(self):
+        return [{"song_name": SONG}, {"song_name": "No Audio"}]
+
+
+@pytest.fixture
+def engine(tmp_path):
+    spec_root, audio_dir = tmp_path / "spec", tmp_path / "audio"
+    _write_parts(str(spec_root / f"{SONG}.spectrograms"))
+    audio_dir.mkdir()
+    (audio_dir / f"{SONG}.mp3").write_bytes(b"mp3")
+    # songs.db paths come from the machine that built it
+    songs = _Songs(rf"C:\data\spectrograms\{SONG}.spectrograms")
+    return ClipEngine(songs, audio_dir=str(audio_dir), spectrogram_dir=str(spec_root),
+                      clip_seconds=3.0, candidates=3)
+
+
+def test_frames_tile_the_track_in_order(tmp_path):
+    _write_parts(str(tmp_path))
+    times, scores = frame_scores(str(tmp_path))
+    assert len(times) == len(scores) > 0
+    assert np.all(np.diff(times) > 0)
+    assert frame_scores(str(tmp_path / "empty"))[0].size == 0
+
+
+def test_best_window_is_the_loud_stretch(tmp_path):
+    _write_parts(str(tmp_path))
+    offsets = best_offsets(*frame_scores(str(tmp_path)), clip_seconds=3.0, count=3)
+    assert 19.0 <= offsets[0] <= 20.0
+    # candidates never overlap
+    assert all(abs(a - b) >= 3.0 - FRAME_SECONDS for i, a in enumerate(offsets)
+               for b in offsets[i + 1:])
+
+
+def test_short_tracks_and_no_frames():
+    times = np.arange(10) * FRAME_SECONDS
+    assert best_offsets(times, np.ones(10), clip_seconds=3.0, count=3) == [0.0]
+    assert best_offsets(np.zeros(0), np.zeros(0), 3.0, 3) == []
+
+
+def test_sources_resolve_foreign_paths(engine):
+    spec_dir, audio_path = engine.sources(SONG)
+    assert os.path.isdir(spec_dir) and audio_path.endswith(f"{SONG}.mp3")
+    assert engine.can_play(SONG) and not engine.can_play("No Audio")
+
+
+def test_offsets_are_computed_once(engine, monkeypatch):
+    first = engine.offsets(SONG)
+    monkeypatch.setattr("audio.clip_engine.frame_scores", None)  # would fail if called
+    assert engine.offsets(SONG) is first
+    with pytest.raises(FileNotFoundError):
+        engine.offsets("No Audio")
+
+
+def test_clips_are_cut_once_per_offset(engine, monkeypatch):
+    cuts = []
+
+    def cut(song, offset, seconds):
+        cuts.append((song, offset, seconds))
+        return f"{song}@{offset}".encode()
+    monkeypatch.setattr(engine, "cut", cut)
+
+    offset = engine.offsets(SONG)[0]
+    clip = engine.get_clip_b64(SONG, offset=offset)
+    assert base64.b64decode(clip) == f"{SONG}@{offset}".encode()
+    assert engine.get_clip_b64(SONG, offset=offset) == clip
+    assert cuts == [(SONG, offset, 3.0)]
+    assert engine.get_clip_b64(SONG) in {
+        base64.b64encode(f"{SONG}@{o}".encode()).decode() for o in engine.offsets(SONG)}
+
+
+def test_catalogue_lists_engine_songs_without_clip_files(engine, tmp_path):
+    songs_dir = tmp_path / "game_songs"
+    songs_dir.mkdir()
+    catalogue = ClipCatalogue(str(songs_dir), engine.songs_db, str(tmp_path / "clips"),
+                              engine=engine)
+    assert catalogue.song_names() == [SONG]
+    assert catalogue.clips_for(SONG) == ()
+    assert catalogue.random_clip(SONG) is None
+
+
+def test_round_without_a_clip_file_uses_the_engine(game_songs, monkeypatch):
+    from types import SimpleNamespace
+    from game import game_round
+    from game.game_round import GameRound
+
+    monkeypatch.setattr(game_round, "get_clip_engine", lambda: SimpleNamespace(
+        get_clip_b64=lambda song: f"engine:{song}"))
+    rnd = GameRound(1, [], game_songs, round_time=30)
+    rnd.correct_song_name, rnd.clip_path = "Song 3", None
+    rnd.options = ["Song 1", "Song 2", "Song 3", "Song 4"]
+    payload = rnd._build_start_payload()
+    assert payload["clip_b64"] == "engine:Song 3"
+    assert [o["song_name"] for o in payload["options"]] == rnd.options
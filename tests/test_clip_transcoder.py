@@ -0,0 +1,52 @@
+# tests/test_clip_transcoder.py
+
+import os
+
+from pydub import AudioSegment
+from pydub.generators import Sine
+
+from audio import clip_transcoder
+from audio.clip_transcoder import (
+    PEAK_CEILING_DBFS, is_transcoded, normalize_clip, transcoded_path
+)
+from settings import CLIP_SAMPLE_RATE, CLIP_TARGET_DBFS
+
+
+def test_normalize_downmixes_resamples_and_levels():
+    quiet = Sine(440, sample_rate=44100).to_audio_segment(duration=500, volume=-35)
+    stereo = quiet.set_channels(2)
+    out = normalize_clip(stereo)
+    assert out.channels == 1 and out.frame_rate == CLIP_SAMPLE_RATE
+    assert abs(out.dBFS - CLIP_TARGET_DBFS) < 0.5
+
+
+def test_peaks_are_kept_under_the_ceiling():
+    # mostly silence with one loud blip: full gain would clip the blip
+    blip = Sine(440, sample_rate=CLIP_SAMPLE_RATE).to_audio_segment(duration=20, volume=-3)
+    audio = AudioSegment.silent(duration=2000, frame_rate=CLIP_SAMPLE_RATE) + blip
+    out = normalize_clip(audio)
+    assert out.max_dBFS <= PEAK_CEILING_DBFS + 0.1
+    assert out.dBFS < CLIP_TARGET_DBFS
+
+
+def test_silence_is_left_alone():
+    silent = AudioSegment.silent(duration=100).set_channels(2)
+    out = normalize_clip(silent)
+    assert out.channels == 1 and out.dBFS == float("-inf")
+
+
+def test_transcoded_copy_mirrors_the_song_folder(tmp_path, monkeypatch):
+    monkeypatch.setattr(clip_transcoder, "GAME_CLIPS_DIR", str(tmp_path / "clips"))
+    src = tmp_path / "songs" / "Song A" / "clip1.wav"
+    src.parent.mkdir(parents=True)
+    src.write_bytes(b"wav")
+    dest = transcoded_path(str(src))
+    assert dest == os.path.join(str(tmp_path / "clips"), "Song A", "clip1.mp3")
+    assert not is_transcoded(str(src))
+
+    os.makedirs(os.path.dirname(dest))
+    with open(dest, "wb") as f:
+        f.write(b"mp3")
+    assert is_transcoded(str(src))
+    os.utime(str(src), (os.path.getmtime(dest) + 10,) * 2)  # source edited later
+    assert not is_transcoded(str(src))
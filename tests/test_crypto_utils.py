@@ -0,0 +1,39 @@
+# tests/test_crypto_utils.py
+
+import asyncio
+
+from security.crypto_utils import (
+    PasswordHasher, PasswordWorkRejected, hash_password, password_needs_rehash
+)
+
+
+def test_hash_and_verify_off_the_loop():
+    hasher = PasswordHasher(workers=2, max_pending=4, rounds=4)
+
+    async def main():
+        hashed = await hasher.hash("s3cret!")
+        return hashed, await hasher.verify("s3cret!", hashed), await hasher.verify("wrong", hashed)
+
+    hashed, good, bad = asyncio.run(main())
+    assert good is True and bad is False
+    assert not hasher.needs_rehash(hashed)
+
+
+def test_needs_rehash_on_cost_change():
+    assert password_needs_rehash(hash_password("pw", rounds=4), rounds=5)
+    assert not password_needs_rehash(hash_password("pw", rounds=4), rounds=4)
+    assert password_needs_rehash("not a bcrypt hash")
+
+
+def test_work_beyond_max_pending_is_shed():
+    hasher = PasswordHasher(workers=1, max_pending=2, rounds=10)
+
+    async def main():
+        results = await asyncio.gather(*(hasher.hash("pw") for _ in range(4)),
+                                       return_exceptions=True)
+        return results, hasher._pending
+
+    results, pending = asyncio.run(main())
+    rejected = [r for r in results if isinstance(r, PasswordWorkRejected)]
+    assert len(rejected) == 2
+    assert pending == 0
@@ -0,0 +1,67 @@
+# tests/test_distill.py
+
+import torch
+from torch.utils.data import Dataset
+
+from model.checkpoint_format import load_checkpoint
+from model.model import DistillationLoss, SongCNN, build_model, distill
+
+TINY = dict(channels=(2, 2, 2, 2), hidden=(4,))
+
+
+class TinyDataset(Dataset):
+    """A few 16x16 'spectrograms' in the shape SongSpectrogramDataset yields."""
+
+    def __init__(self, count=8, num_classes=3):
+        g = torch.Generator().manual_seed(0)
+        self.items = torch.randn(count, 1, 16, 16, generator=g)
+        self.labels = [i % num_classes for i in range(count)]
+        self.holdout_every = 0
+        self.labels_to_songs = {i: f"Song {i}" for i in range(num_classes)}
+        self.songs_to_labels = {v: k for k, v in self.labels_to_songs.items()}
+
+    def __len__(self):
+        return len(self.labels)
+
+    def __getitem__(self, idx):
+        return self.items[idx], self.labels[idx]
+
+
+def test_loss_matches_the_teacher_at_alpha_one():
+    loss = DistillationLoss(temperature=2.0, alpha=1.0)
+    logits = torch.tensor([[2.0, 0.5, -1.0]])
+    labels = torch.tensor([0])
+    # KL(p || p) is zero, whatever the hard label says
+    assert loss(logits, logits.clone(), labels).item() < 1e-6
+    assert loss(logits, torch.tensor([[-1.0, 0.5, 2.0]]), labels).item() > 0
+
+
+def test_loss_is_cross_entropy_at_alpha_zero():
+    loss = DistillationLoss(temperature=4.0, alpha=0.0)
+    student = torch.tensor([[1.0, 0.0, -1.0], [0.0, 2.0, 0.0]])
+    teacher = torch.randn(2, 3)
+    labels = torch.tensor([0, 1])
+    expected = torch.nn.CrossEntropyLoss(label_smoothing=0.1)(student, labels)
+    assert torch.isclose(loss(student, teacher, labels), expected)
+
+
+def test_one_epoch_distill_saves_a_loadable_student(tmp_path):
+    torch.manual_seed(0)
+    teacher = SongCNN(3, **TINY)
+    student = SongCNN(3, channels=(1, 1, 1, 1), hidden=(2,))
+    model_path = str(tmp_path / "student.pt")
+    distill(teacher, student, TinyDataset(), model_path, batch_size=4, epochs=1,
+            checkpoint_path=str(tmp_path / "distill_checkpoint.pt"),
+            teacher_path="teacher.pt")
+
+    saved = load_checkpoint(model_path)
+    assert saved["distilled_from"] == "teacher.pt"
+    assert saved["model_config"] == {"channels": [1, 1, 1, 1], "hidden": [2]}
+    rebuilt = build_model({**saved, "num_classes": 3})
+    rebuilt.load_state_dict(saved["model_state_dict"])
+    # the teacher is only read from
+    assert not teacher.training
+
+    progress = torch.load(tmp_path / "distill_checkpoint.pt", weights_only=False)
+    assert progress["stage"] == "distill" and progress["epoch"] == 1
+    assert progress["run_args"]["student_config"] == saved["model_config"]
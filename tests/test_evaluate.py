@@ -0,0 +1,60 @@
+# tests/test_evaluate.py
+
+from model.evaluate import _holdout_split
+
+
+def test_uses_training_split_by_default():
+    assert _holdout_split(5, None) == (5, True)
+
+
+def test_model_trained_on_every_part_is_not_valid():
+    every, valid = _holdout_split(0, None)
+    assert every > 0
+    assert valid is False
+
+
+def test_mismatched_split_is_not_valid():
+    assert _holdout_split(5, 4) == (4, False)
+
+
+def test_holdout_parts():
+    from model.model import is_holdout_part
+    assert [n for n in range(1, 12) if is_holdout_part(f"part{n}", 5)] == [5, 10]
+    assert not any(is_holdout_part(f"part{n}", 0) for n in range(1, 12))
+
+
+class _SongDB:
+    def __init__(self, folder):
+        self.folder = folder
+
+    def get_columns(self, columns):
+        return [(1, self.folder, "Song 1")]
+
+
+def _dataset(tmp_path, holdout_every, split):
+    import numpy as np
+    from model.model import SongSpectrogramDataset
+    for n in range(1, 7):
+        for variant in ("clean", "noisy"):
+            np.save(tmp_path / f"part{n}_{variant}.npy", np.zeros((2, 2)))
+    return SongSpectrogramDataset(_SongDB(str(tmp_path)),
+                                  holdout_every=holdout_every, split=split)
+
+
+def _parts(dataset):
+    import os
+    return sorted(os.path.basename(p) for p in dataset.data)
+
+
+def test_dataset_splits_are_disjoint(tmp_path):
+    train = _dataset(tmp_path, 3, "train")
+    holdout = _dataset(tmp_path, 3, "holdout")
+    assert _parts(holdout) == ["part3_clean.npy", "part3_noisy.npy",
+                               "part6_clean.npy", "part6_noisy.npy"]
+    assert len(train) == 8 and not set(_parts(train)) & set(_parts(holdout))
+    assert holdout.labels == [1] * 4 and sorted(holdout.variants) == ["clean", "clean", "noisy", "noisy"]
+
+
+def test_dataset_without_holdout_trains_on_everything(tmp_path):
+    assert len(_dataset(tmp_path, 0, "train")) == 12
+    assert len(_dataset(tmp_path, 0, "holdout")) == 0
@@ -0,0 +1,83 @@
+# tests/test_game_hub.py
+
+import asyncio
+
+from conftest import FakeSocket
+from game.game_hub import GameHub
+from game.player import Player
+
+
+def _player(name):
+    return Player(name, FakeSocket())
+
+
+def test_players_are_indexed_on_the_actor(game_songs):
+    async def main():
+        hub = GameHub(game_songs)
+        host = _player("host")
+        gs = await hub.create_game(host)
+        # the index is updated inside add_player, while the actor runs it
+        seen = []
+        original = gs.add_player
+
+        async def add_and_check(player):
+            ok = await original(player)
+            seen.append(hub.lookup(player.websocket))
+            return ok
+        gs.add_player = add_and_check
+
+        guest = _player("guest")
+        assert await hub.join_game(guest, gs.game_id) == (True, "")
+        return hub, gs, host, guest, seen
+
+    hub, gs, host, guest, seen = asyncio.run(main())
+    assert seen == [(gs, guest)]
+    assert hub.lookup(host.websocket) == (gs, host)
+    assert hub.lookup_player(guest.id) == (gs, guest)
+
+
+def test_leaving_drops_the_index(game_songs):
+    async def main():
+        hub = GameHub(game_songs)
+        host, guest, other = _player("host"), _player("guest"), _player("other")
+        gs = await hub.create_game(host)
+        await hub.join_game(guest, gs.game_id)
+        await hub.join_game(other, gs.game_id)
+        kicked = await hub.kick_player_by_username(host.websocket, "guest")
+        await hub.disconnect(other.websocket)
+        return hub, gs, host, guest, other, kicked
+
+    hub, gs, host, guest, other, kicked = asyncio.run(main())
+    assert kicked == (True, "")
+    assert hub.lookup(guest.websocket) is None and hub.lookup_player(guest.id) is None
+    assert hub.lookup(other.websocket) is None
+    assert gs.players == [host]
+
+
+def test_creating_a_game_leaves_the_previous_one(game_songs):
+    async def main():
+        hub = GameHub(game_songs)
+        host, guest = _player("host"), _player("guest")
+        first = await hub.create_game(host)
+        await hub.join_game(guest, first.game_id)
+        second = await hub.create_game(Player("host", host.websocket))
+        return hub, first, second, host, guest
+
+    hub, first, second, host, guest = asyncio.run(main())
+    assert hub.lookup(host.websocket)[0] is second
+    assert first.players == [guest] and first.host is guest
+
+
+def test_join_rejections(game_songs):
+    async def main():
+        hub = GameHub(game_songs)
+        gs = await hub.create_game(_player("host"))
+        gs.max_players = 1
+        full = await hub.join_game(_player("late"), gs.game_id)
+        missing = await hub.join_game(_player("lost"), "nope")
+        return hub, full, missing
+
+    hub, full, missing = asyncio.run(main())
+    assert full == (False, "game_full")
+    assert missing == (False, "game_not_found")
+    assert len(hub._by_ws) == 1
@@ -0,0 +1,411 @@
+# tests/test_game_server.py
+
+import asyncio
+import base64
+import json
+import threading
+from collections import deque
+
+from conftest import FakeSocket
+from game.game_server import GameServer
+from game.player import Player
+
+
+async def _lobby(songs, players=1, mode="classic"):
+    members = [Player(f"p{i}", FakeSocket()) for i in range(players)]
+    gs = GameServer("g1", members[0], songs, mode=mode)
+    for p in members:
+        await gs.call(gs.add_player, p)
+    return gs, members
+
+
+async def _settle(players, delay=0.05):
+    await asyncio.sleep(delay)
+    for p in players:
+        await p.drain()
+
+
+def _stop(gs):
+    # leave no round timer or prefetch running past the test
+    if gs.current_round is not None:
+        gs.current_round.cancel_timers()
+    for task in gs._prepared.values():
+        task.cancel()
+
+
+def test_rounds_are_planned_up_front_with_distinct_songs(game_songs):
+    async def main():
+        gs, _ = await _lobby(game_songs)
+        gs.settings["num_rounds"] = 10
+        return await gs._plan_rounds()
+
+    schedule = asyncio.run(main())
+    assert [r.round_number for r in schedule] == list(range(1, 11))
+    assert len({r.correct_song_name for r in schedule}) == 10
+    for rnd in schedule:
+        assert len(set(rnd.options)) == 4 and rnd.correct_song_name in rnd.options
+        assert rnd.clip_path.endswith("clip.mp3")
+
+
+def test_next_round_is_prefetched_while_one_is_played(game_songs):
+    async def main():
+        gs, players = await _lobby(game_songs, players=2)
+        assert await gs.call(gs.start_game)
+        await _settle(players)
+        await gs._prepared[2]
+        _stop(gs)
+        return gs, players
+
+    gs, players = asyncio.run(main())
+    assert gs.round_number == 1 and 1 not in gs._prepared
+    assert gs._schedule[1].start_payload is not None
+    (start,) = players[0].websocket.of_type("round_start")
+    correct = gs._schedule[0].correct_song_name
+    assert base64.b64decode(start["clip_b64"]) == correct.encode()
+    assert {o["song_name"] for o in start["options"]} == set(gs._schedule[0].options)
+    # the payload is sent once and then released
+    assert gs._schedule[0].start_payload is None
+
+
+def test_broadcast_encodes_once_and_drops_closed_players(game_songs, monkeypatch):
+    import json
+
+    dumps = []
+    real_dumps = json.dumps
+    monkeypatch.setattr(json, "dumps",
+                        lambda obj, **kw: dumps.append(obj) or real_dumps(obj, **kw))
+
+    async def main():
+        gs, players = await _lobby(game_songs, players=3)
+        await gs.flush_deltas()
+        dumps.clear()
+        players[2].connected = False
+        await gs.broadcast({"type": "chat", "data": {"text": "hi"}})
+        await _settle(players)
+        return gs, players
+
+    gs, players = asyncio.run(main())
+    assert len([d for d in dumps if d["type"] == "chat"]) == 1
+    assert [p.websocket.of_type("chat") for p in players[:2]] == [[{"text": "hi"}]] * 2
+    assert players[2] not in gs.players
+
+
+def test_actor_runs_commands_one_at_a_time_in_order(game_songs):
+    async def main():
+        gs, _ = await _lobby(game_songs)
+        log = []
+
+        async def command(name, pause):
+            log.append(f"start {name}")
+            await asyncio.sleep(pause)
+            log.append(f"end {name}")
+            return name
+
+        results = await asyncio.gather(gs.call(command, "a", 0.02),
+                                       gs.call(command, "b", 0),
+                                       gs.call(command, "c", 0.01))
+        return gs, log, results
+
+    gs, log, results = asyncio.run(main())
+    assert results == ["a", "b", "c"]
+    assert log == ["start a", "end a", "start b", "end b", "start c", "end c"]
+    assert gs.idle
+
+
+def test_actor_reentrant_call_and_errors(game_songs):
+    async def main():
+        gs, _ = await _lobby(game_songs)
+
+        async def inner():
+            return "inner"
+
+        async def outer():
+            # calling back into the actor from the actor must not deadlock
+            return await gs.call(inner)
+
+        async def broken():
+            raise ValueError("bad command")
+
+        nested = await asyncio.wait_for(gs.call(outer), 1)
+        try:
+            await gs.call(broken)
+        except ValueError as e:
+            error = str(e)
+        after = await gs.call(inner)
+        return nested, error, after
+
+    assert asyncio.run(main()) == ("inner", "bad command", "inner")
+
+
+def test_idle_lobby_is_closed(game_songs, monkeypatch):
+    import game.game_server as game_server_module
+    monkeypatch.setattr(game_server_module, "LOBBY_IDLE_TIMEOUT", 0.03)
+
+    async def main():
+        finished = []
+        gs, players = await _lobby(game_songs, players=2)
+        gs.on_finished = finished.append
+        await gs.call(gs.resync, players[1], -1)
+        await asyncio.sleep(0.02)
+        await gs.call(gs.update_settings, {"num_rounds": 8})  # activity restarts the timer
+        await asyncio.sleep(0.02)
+        still_open = gs.state
+        await _settle(players, delay=0.03)
+        return gs, players, finished, still_open
+
+    gs, players, finished, still_open = asyncio.run(main())
+    assert still_open == "lobby"
+    assert gs.state == "ended" and gs.players == [] and finished == [gs]
+    assert all(p.websocket.of_type("kicked") == [{"reason": "lobby_idle"}] for p in players)
+    # the state change reaches clients ahead of the kick
+    frames = [f["type"] for f in players[1].websocket.frames]
+    assert frames.index("state_delta") < frames.index("kicked")
+    closed = [op for f in players[1].websocket.of_type("state_delta") for op in f["ops"]]
+    assert {"op": "state_changed", "state": "ended"} in [
+        {k: v for k, v in op.items() if k != "v"} for op in closed]
+
+
+def test_advancing_early_cancels_the_old_round_timer(game_songs):
+    async def main():
+        gs, players = await _lobby(game_songs, players=2)
+        gs.settings["round_time"] = 0.05
+        assert await gs.call(gs.start_game)
+        await asyncio.sleep(0.02)
+        first = gs.current_round
+        gs._schedule[1].round_time = 10
+        await gs.call(gs._next_round)  # host moves on before round 1 times out
+        await _settle(players, delay=0.1)  # well past round 1's deadline
+        _stop(gs)
+        return gs, players, first
+
+    gs, players, first = asyncio.run(main())
+    assert gs.round_number == 2 and gs.current_round is not first
+    assert not getattr(gs.current_round, "_ended", False)
+    assert not getattr(first, "_ended", False)
+    assert players[0].websocket.of_type("your_result") == []
+
+
+def test_round_one_kickoff_is_kept_and_its_errors_logged(game_songs, capsys):
+    async def main():
+        gs, _ = await _lobby(game_songs)
+
+        async def broken():
+            raise RuntimeError("no clip")
+
+        gs._next_round = broken
+        assert await gs.call(gs.start_game)
+        kickoff = gs._kickoff
+        await asyncio.wait({kickoff})
+        return gs, kickoff
+
+    gs, kickoff = asyncio.run(main())
+    assert kickoff is not None and gs._kickoff is None
+    assert "[ERROR] Starting round 1 of game g1 failed: no clip" in capsys.readouterr().out
+
+
+def test_clip_catalogue_is_refreshed_off_the_event_loop(game_songs, monkeypatch):
+    import game.game_server as game_server_module
+    threads = []
+    clips = game_server_module.get_clip_catalogue()
+    monkeypatch.setattr(clips, "refresh_if_changed",
+                        lambda: threads.append(threading.get_ident()))
+
+    async def main():
+        gs, _ = await _lobby(game_songs)
+        assert await gs.call(gs.start_game)
+        _stop(gs)
+
+    asyncio.run(main())
+    assert len(threads) == 1 and threads[0] != threading.get_ident()
+
+
+def test_answer_cover_is_read_when_the_round_is_prepared(game_songs, monkeypatch):
+    from game.album_art import AlbumArtCache
+    threads = []
+    real_cover_id = AlbumArtCache.cover_id
+
+    def cover_id(self, *args):
+        threads.append(threading.get_ident())
+        return real_cover_id(self, *args)
+
+    monkeypatch.setattr(AlbumArtCache, "cover_id", cover_id)
+
+    async def main():
+        gs, players = await _lobby(game_songs)
+        assert await gs.call(gs.start_game)
+        await asyncio.sleep(0.02)
+        answer = gs.current_round.answer_info
+        threads.clear()
+        await gs.call(gs.current_round.end)
+        await _settle(players)
+        _stop(gs)
+        return players, answer
+
+    players, answer = asyncio.run(main())
+    assert answer is not None and "album_cover_id" in answer
+    # round 2 is prepared on a worker; nothing is read on the loop at round end
+    assert threading.get_ident() not in threads
+    (result,) = players[0].websocket.of_type("your_result")
+    assert result["correct_answer"] == answer
+
+
+def test_round_end_pause_does_not_block_the_actor(game_songs, monkeypatch):
+    import game.game_round as game_round_module
+    monkeypatch.setattr(game_round_module, "RESULTS_PAUSE", 0.1)
+
+    async def main():
+        gs, players = await _lobby(game_songs, players=2)
+        assert await gs.call(gs.start_game)
+        await asyncio.sleep(0.02)
+        await gs.call(gs.current_round.end)
+        # the actor is free during the pause
+        await gs.call(gs.resync, players[1], -1)
+        await _settle(players, delay=0.02)
+        during = [p.websocket.of_type("round_end") for p in players]
+        await _settle(players, delay=0.15)
+        _stop(gs)
+        return players, during
+
+    players, during = asyncio.run(main())
+    assert during == [[], []]
+    assert players[1].websocket.of_type("game_state") != []
+    assert all(len(p.websocket.of_type("round_end")) == 1 for p in players)
+
+
+def test_moving_on_drops_the_old_rounds_standings(game_songs, monkeypatch):
+    import game.game_round as game_round_module
+    monkeypatch.setattr(game_round_module, "RESULTS_PAUSE", 0.05)
+
+    async def main():
+        gs, players = await _lobby(game_songs, players=1)
+        assert await gs.call(gs.start_game)
+        await asyncio.sleep(0.02)
+        await gs.call(gs.current_round.end)
+        await gs.call(gs._next_round)  # host moves on within the pause
+        await _settle(players, delay=0.1)
+        _stop(gs)
+        return players
+
+    players = asyncio.run(main())
+    assert players[0].websocket.of_type("round_end") == []
+
+
+def test_send_personal_merges_each_players_fields(game_songs, monkeypatch):
+    import game.game_server as game_server_module
+    monkeypatch.setattr(game_server_module, "RESULT_BATCH_SIZE", 2)
+
+    async def main():
+        gs, players = await _lobby(game_songs, players=5, mode="arena")
+        for i, p in enumerate(players):
+            p.score = i * 10
+            gs.leaderboard.update(p)
+        await gs.send_personal("your_result", {"answer": "Song 1"},
+                               lambda p: {"rank": gs.leaderboard.rank(p)})
+        await gs.send_personal("empty", {}, lambda p: {"id": p.username})
+        await gs.send_personal("shared_only", {"round": 1}, lambda p: {})
+        await gs.send_personal("override", {"rank": 0}, lambda p: {"rank": 1})
+        await _settle(players)
+        return gs, players
+
+    gs, players = asyncio.run(main())
+    assert gs.max_players > 8 and gs.standings_size < gs.max_players
+    for i, p in enumerate(players):
+        assert p.websocket.of_type("your_result") == [{"answer": "Song 1", "rank": 5 - i}]
+        assert p.websocket.of_type("empty") == [{"id": p.username}]
+        assert p.websocket.of_type("shared_only") == [{"round": 1}]
+        assert p.websocket.of_type("override") == [{"rank": 1}]
+
+
+def test_arena_standings_are_top_n(game_songs, monkeypatch):
+    import game.game_server as game_server_module
+    monkeypatch.setattr(game_server_module, "ARENA_TOP_N", 3)
+
+    async def main():
+        arena, _ = await _lobby(game_songs, players=6, mode="arena")
+        classic, _ = await _lobby(game_songs, players=6)
+        return arena, classic
+
+    arena, classic = asyncio.run(main())
+    assert arena.standings_size == 3 and len(arena.leaderboard.top(arena.standings_size)) == 3
+    assert classic.standings_size == 6
+
+
+def test_deltas_are_batched_and_skip_unsynced_players(game_songs):
+    async def main():
+        gs, players = await _lobby(game_songs, players=3)
+        await _settle(players, delay=0.1)  # joins go out before anyone syncs
+        await gs.call(gs.resync, players[0], -1)
+        await gs.call(gs.resync, players[1], -1)
+        await gs.call(gs.update_settings, {"num_rounds": 8, "round_time": 20})
+        await _settle(players, delay=0.1)
+        return gs, players
+
+    gs, players = asyncio.run(main())
+    deltas = players[0].websocket.of_type("state_delta")
+    assert len(deltas) == 1
+    assert deltas[0]["from_version"] == 3 and deltas[0]["version"] == gs.version == 5
+    assert [op["op"] for op in deltas[0]["ops"]] == ["setting_changed", "setting_changed"]
+    assert players[1].websocket.of_type("state_delta") == deltas
+    # never resynced, so it has no state to apply deltas to
+    assert players[2].websocket.of_type("state_delta") == []
+
+
+def test_resync_sends_missed_ops_from_the_log(game_songs):
+    async def main():
+        gs, players = await _lobby(game_songs, players=2)
+        await gs.call(gs.update_settings, {"num_rounds": 8})
+        await gs.call(gs.resync, players[1], 1)
+        await _settle(players)
+        return gs, players
+
+    gs, players = asyncio.run(main())
+    (delta,) = players[1].websocket.of_type("state_delta")
+    assert delta["from_version"] == 1 and delta["version"] == gs.version == 3
+    assert [op["v"] for op in delta["ops"]] == [2, 3]
+    assert players[1].websocket.of_type("game_state") == []
+
+
+def test_resync_falls_back_to_a_shared_snapshot(game_songs, monkeypatch):
+    import game.game_server as game_server_module
+
+    async def main():
+        gs, players = await _lobby(game_songs, players=2)
+        gs._deltas = deque(gs._deltas, maxlen=1)  # version 1 falls out of the log
+        monkeypatch.setattr(game_server_module.json, "dumps", counting_dumps)
+        await gs.call(gs.resync, players[0], -1)
+        await gs.call(gs.resync, players[1], 0)
+        await _settle(players)
+        return gs, players
+
+    encoded = []
+    real_dumps = json.dumps
+
+    def counting_dumps(obj, *args, **kwargs):
+        if obj.get("type") == "game_state":
+            encoded.append(obj)
+        return real_dumps(obj, *args, **kwargs)
+
+    gs, players = asyncio.run(main())
+    states = [p.websocket.of_type("game_state") for p in players]
+    assert states[0] == states[1] and len(states[0]) == 1
+    state = states[0][0]
+    assert state["version"] == gs.version == 2
+    assert state["host_id"] == players[0].id and state["state"] == "lobby"
+    assert len(encoded) == 1  # encoded once for both
+
+
+def test_host_and_state_changes_are_recorded(game_songs):
+    async def main():
+        gs, players = await _lobby(game_songs, players=3)
+        await gs.call(gs.remove_player, players[0])
+        new_host = gs.host
+        assert await gs.call(gs.start_game)
+        _stop(gs)
+        return gs, new_host
+
+    gs, new_host = asyncio.run(main())
+    ops = [{k: v for k, v in d.items() if k != "v"} for d in gs._deltas]
+    assert {"op": "host_changed", "host_id": new_host.id,
+            "host_username": new_host.username} in ops
+    assert {"op": "state_changed", "state": "playing"} in ops
+    assert gs.snapshot()["host_id"] == new_host.id
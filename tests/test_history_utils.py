@@ -0,0 +1,53 @@
+# tests/test_history_utils.py
+
+import pytest
+
+from server import history_utils
+from server.history_utils import (
+    MAX_PAGE_SIZE, get_user_history_payload, invalidate_user_history
+)
+
+
+@pytest.fixture
+def history(monkeypatch):
+    """alice has history ids 10 (newest) down to 1; counts payload builds."""
+    builds = []
+
+    def build(username):
+        builds.append(username)
+        return [{"history_id": i, "song_name": f"song {i}"} for i in range(10, 0, -1)]
+
+    monkeypatch.setattr(history_utils, "_build_history_payload", build)
+    invalidate_user_history({"alice"})
+    return builds
+
+
+def _ids(page):
+    return [e["history_id"] for e in page["history"]]
+
+
+def test_full_list_by_default(history):
+    page = get_user_history_payload("alice")
+    assert _ids(page) == list(range(10, 0, -1))
+    assert page["latest_id"] == 10 and page["has_more"] is False
+
+
+def test_since_and_paging(history):
+    page = get_user_history_payload("alice", since=6, offset=1, limit=2)
+    assert _ids(page) == [9, 8]
+    assert page["has_more"] is True
+
+
+def test_out_of_range_arguments_are_clamped(history):
+    assert _ids(get_user_history_payload("alice", offset=-5, limit=3)) == [10, 9, 8]
+    assert _ids(get_user_history_payload("alice", limit=0)) == [10]
+    assert len(get_user_history_payload("alice", limit=10**9)["history"]) <= MAX_PAGE_SIZE
+
+
+def test_payload_is_cached_until_invalidated(history):
+    get_user_history_payload("alice")
+    get_user_history_payload("alice", limit=1)
+    assert history == ["alice"]
+    invalidate_user_history({"alice"})
+    get_user_history_payload("alice")
+    assert history == ["alice", "alice"]
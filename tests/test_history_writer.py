@@ -0,0 +1,103 @@
+# tests/test_history_writer.py
+
+from database.history_writer import HistoryWriteBuffer
+from database.song_catalogue import SongCatalogue
+from database.song_database import HISTORY_LIMIT, SongDatabase
+
+
+def _setup(tmp_path, monkeypatch, songs=3):
+    # listeners are class-wide; keep the ones registered here local to the test
+    monkeypatch.setattr(SongDatabase, "_history_listeners", [])
+    db = SongDatabase(str(tmp_path / "songs.db"))
+    db.upsert_songs([{
+        "song_name": f"song {i}", "artist_name": "a", "album_name": None,
+        "album_cover_image": None, "album_type": "single", "release_date": None,
+        "spotify_url": None, "spectrograms": "[]",
+    } for i in range(songs)])
+    # a long interval so only explicit flush() calls write
+    buffer = HistoryWriteBuffer(db, SongCatalogue(db), flush_interval=60)
+    return db, buffer
+
+
+def test_add_is_buffered_until_flush(tmp_path, monkeypatch):
+    db, buffer = _setup(tmp_path, monkeypatch)
+    assert buffer.add("alice", "song 1")
+    assert not buffer.add("alice", "no such song")
+    assert buffer.has_pending("alice") and not buffer.has_pending("bob")
+    assert db.get_user_history("alice") == []
+
+    assert buffer.flush() == 1
+    assert not buffer.has_pending("alice")
+    assert [h["song_name"] for h in db.get_user_history("alice")] == ["song 1"]
+    buffer.close()
+
+
+def test_flush_trims_each_user_to_the_limit(tmp_path, monkeypatch):
+    db, buffer = _setup(tmp_path, monkeypatch)
+    for _ in range(HISTORY_LIMIT + 5):
+        buffer.add("alice", "song 0")
+    buffer.add("bob", "song 2")
+    buffer.flush()
+    assert len(db.get_user_history("alice")) == HISTORY_LIMIT
+    assert len(db.get_user_history("bob")) == 1
+    buffer.close()
+
+
+def test_history_change_listeners_get_the_affected_users(tmp_path, monkeypatch):
+    db, buffer = _setup(tmp_path, monkeypatch)
+    seen = []
+    SongDatabase.on_history_change(seen.append)
+    buffer.add("alice", "song 0")
+    buffer.add("bob", "song 1")
+    buffer.flush()
+    db.update_song_history("carol", "song 2")
+    assert seen == [{"alice", "bob"}, {"carol"}]
+    buffer.close()
+
+
+def test_failed_flush_keeps_plays_queued(tmp_path, monkeypatch):
+    db, buffer = _setup(tmp_path, monkeypatch)
+    buffer.add("alice", "song 0")
+    working = db.add_history_batch
+
+    def broken(entries):
+        raise RuntimeError("disk full")
+    monkeypatch.setattr(db, "add_history_batch", broken)
+    assert buffer.flush() == 0
+    assert buffer.has_pending("alice")
+
+    monkeypatch.setattr(db, "add_history_batch", working)
+    assert buffer.flush() == 1
+    buffer.close()
+
+
+def test_plays_are_dropped_after_repeated_failures(tmp_path, monkeypatch, capsys):
+    db, buffer = _setup(tmp_path, monkeypatch)
+    buffer.max_attempts = 3
+    buffer.add("alice", "song 0")
+
+    def broken(entries):
+        raise RuntimeError("disk full")
+    monkeypatch.setattr(db, "add_history_batch", broken)
+    for _ in range(2):
+        assert buffer.flush() == 0
+        assert buffer.has_pending("alice")
+    assert buffer.flush() == 0
+    assert not buffer.has_pending("alice")
+    assert "failed 3 times; dropping 1 plays" in capsys.readouterr().out
+    buffer.close()
+
+
+def test_history_queries_use_the_covering_index(tmp_path, monkeypatch):
+    db, buffer = _setup(tmp_path, monkeypatch)
+    buffer.close()
+    with db.history._connect() as conn:
+        plan = " ".join(r["detail"] for r in conn.execute("""
+            EXPLAIN QUERY PLAN
+            SELECT id FROM song_history
+             WHERE username = ? ORDER BY played_at DESC, id DESC
+        """, ("alice",)))
+        indexes = {r["name"] for r in conn.execute("PRAGMA index_list(song_history)")}
+    assert "idx_song_history_user_played_id" in plan
+    assert "TEMP B-TREE" not in plan
+    assert indexes == {"idx_song_history_user_played_id"}
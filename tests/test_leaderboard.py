@@ -0,0 +1,63 @@
+# tests/test_leaderboard.py
+
+from types import SimpleNamespace
+
+from game.leaderboard import Leaderboard
+
+
+def _player(pid, score=0):
+    return SimpleNamespace(id=pid, username=pid, score=score)
+
+
+def _board(*players):
+    board = Leaderboard()
+    for p in players:
+        board.add(p)
+    return board
+
+
+def test_ties_share_a_rank_and_skip_the_next():
+    a, b, c, d = _player("a", 30), _player("b", 20), _player("c", 20), _player("d", 10)
+    board = _board(a, b, c, d)
+    assert [board.rank(p) for p in (a, b, c, d)] == [1, 2, 2, 4]
+    assert [(rank, p.id) for rank, p in board.top(4)] == [(1, "a"), (2, "b"), (2, "c"), (4, "d")]
+
+
+def test_tied_players_keep_join_order():
+    late, early = _player("late"), _player("early")
+    board = _board(early, late)
+    assert [p.id for _, p in board.top(2)] == ["early", "late"]
+    assert board.rank(early) == board.rank(late) == 1
+
+
+def test_update_moves_a_player():
+    a, b, c = _player("a"), _player("b"), _player("c")
+    board = _board(a, b, c)
+    c.score = 50
+    board.update(c)
+    b.score = 50
+    board.update(b)
+    assert [(rank, p.id) for rank, p in board.top(3)] == [(1, "b"), (1, "c"), (3, "a")]
+    board.update(_player("stranger", 99))  # not on the board: ignored
+    assert len(board) == 3
+
+
+def test_top_n_is_cut_at_n_even_inside_a_tie():
+    players = [_player(str(i), 10) for i in range(5)]
+    board = _board(*players)
+    top = board.top(3)
+    assert len(top) == 3 and all(rank == 1 for rank, _ in top)
+    assert board.top(10)[-1][1].id == "4"
+
+
+def test_remove_and_reset():
+    a, b = _player("a", 5), _player("b", 1)
+    board = _board(a, b)
+    board.add(a)  # already there: no duplicate
+    board.remove(a)
+    board.remove(a)
+    assert len(board) == 1 and board.rank(a) == 0 and board.rank(b) == 1
+
+    a.score, b.score = 0, 0
+    board.reset([b, a])
+    assert [p.id for _, p in board.top(2)] == ["b", "a"]
@@ -0,0 +1,126 @@
+# tests/test_player.py
+
+import asyncio
+
+from conftest import FakeSocket
+from game.player import Player
+
+
+class _StalledSocket(FakeSocket):
+    """A connection whose sends never complete until released."""
+
+    def __init__(self):
+        super().__init__()
+        self.release = asyncio.Event()
+
+    async def send(self, frame: str) -> None:
+        await self.release.wait()
+        await super().send(frame)
+
+
+def test_messages_are_sent_in_order():
+    async def main():
+        player = Player("p", FakeSocket())
+        for i in range(3):
+            assert await player.send_message("round_start", {"n": i})
+        await player.drain()
+        return player
+
+    player = asyncio.run(main())
+    assert [d["n"] for d in player.websocket.of_type("round_start")] == [0, 1, 2]
+    assert player.stats["sent"] == 3 and player.queue_depth == 0
+
+
+def test_queued_snapshots_are_coalesced():
+    async def main():
+        socket = _StalledSocket()
+        player = Player("p", socket, max_queue=10, max_lag=0)
+        await player.send_message("round_start", {"n": 0})  # in flight
+        await asyncio.sleep(0)
+        await player.send_message("players", {"n": 1})
+        await player.send_message("chat", {"n": 2})
+        await player.send_message("players", {"n": 3})
+        socket.release.set()
+        await player.drain()
+        return player
+
+    player = asyncio.run(main())
+    frames = [(f["type"], f["data"]["n"]) for f in player.websocket.frames]
+    # the newer 'players' replaced the queued one and went to the back
+    assert frames == [("round_start", 0), ("chat", 2), ("players", 3)]
+    assert player.stats["coalesced"] == 1
+
+
+def test_coalesced_snapshot_follows_queued_deltas():
+    async def main():
+        socket = _StalledSocket()
+        player = Player("p", socket, max_queue=10, max_lag=0)
+        await player.send_message("round_start")  # in flight
+        await asyncio.sleep(0)
+        await player.send_message("game_state", {"version": 1})
+        await player.send_message("state_delta", {"version": 2})
+        await player.send_message("game_state", {"version": 2})
+        socket.release.set()
+        await player.drain()
+        return player
+
+    player = asyncio.run(main())
+    frames = [(f["type"], f["data"].get("version")) for f in player.websocket.frames]
+    # the client never applies an old delta on top of the newer snapshot
+    assert frames == [("round_start", None), ("state_delta", 2), ("game_state", 2)]
+
+
+def test_full_queue_drops_deltas_before_disconnecting():
+    async def main():
+        socket = _StalledSocket()
+        player = Player("p", socket, max_queue=2, max_lag=0)
+        await player.send_message("round_start")  # in flight
+        await asyncio.sleep(0)
+        await player.send_message("state_delta", {"v": 1})
+        await player.send_message("chat")
+        # full: an incoming delta is dropped, an important message evicts a delta
+        assert await player.send_message("state_delta", {"v": 2})
+        assert await player.send_message("round_end")
+        assert player.stats["dropped"] == 2 and player.connected
+        # full of messages that cannot be dropped: the player is cut off
+        assert not await player.send_message("game_ended")
+        await asyncio.sleep(0)
+        return player
+
+    player = asyncio.run(main())
+    assert not player.connected and player.websocket.closed == "queue_full"
+
+
+def test_slow_consumer_is_disconnected():
+    async def main():
+        player = Player("p", _StalledSocket(), max_queue=10, max_lag=0.01)
+        await player.send_message("round_start")
+        await asyncio.sleep(0)
+        await player.send_message("chat")
+        await asyncio.sleep(0.02)
+        assert not await player.send_message("chat")
+        await asyncio.sleep(0)
+        return player
+
+    player = asyncio.run(main())
+    assert player.websocket.closed == "send_lag" and player._closing is None
+
+
+def test_failed_close_is_logged(capsys):
+    class _BrokenClose(_StalledSocket):
+        async def close(self, code=1000, reason=""):
+            raise ConnectionError("reset")
+
+    async def main():
+        player = Player("p", _BrokenClose(), max_queue=1, max_lag=0)
+        await player.send_message("round_start")  # in flight
+        await asyncio.sleep(0)
+        await player.send_message("chat")
+        assert not await player.send_message("chat")  # full: disconnected
+        assert player._closing is not None
+        await asyncio.sleep(0.01)
+        return player
+
+    player = asyncio.run(main())
+    assert player._closing is None
+    assert "[ERROR] Closing connection of p failed: reset" in capsys.readouterr().out
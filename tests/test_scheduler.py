@@ -0,0 +1,124 @@
+# tests/test_scheduler.py
+
+import asyncio
+
+from game.scheduler import Scheduler
+
+
+def test_timers_fire_in_deadline_order():
+    async def main():
+        scheduler, fired = Scheduler(), []
+        scheduler.call_later(0.03, fired.append, "c")
+        scheduler.call_later(0.01, fired.append, "a")
+        scheduler.call_later(0.02, fired.append, "b")
+        now = scheduler.time()
+        # same deadline: first scheduled fires first
+        scheduler.call_at(now + 0.04, fired.append, "d1")
+        scheduler.call_at(now + 0.04, fired.append, "d2")
+        await asyncio.sleep(0.08)
+        return scheduler, fired
+
+    scheduler, fired = asyncio.run(main())
+    assert fired == ["a", "b", "c", "d1", "d2"]
+    assert scheduler.live == 0 and scheduler.fired == 5
+
+
+def test_cancelled_timers_never_fire():
+    async def main():
+        scheduler, fired = Scheduler(), []
+        first = scheduler.call_later(0.01, fired.append, "first")
+        scheduler.call_later(0.02, fired.append, "second")
+        first.cancel()
+        first.cancel()  # idempotent
+        assert scheduler.live == 1
+        await asyncio.sleep(0.04)
+        late = scheduler.call_later(0, fired.append, "late")
+        await asyncio.sleep(0.01)
+        late.cancel()  # already fired: no effect
+        return scheduler, fired
+
+    scheduler, fired = asyncio.run(main())
+    assert fired == ["second", "late"]
+    assert scheduler.cancelled == 1
+
+
+def test_coroutine_callbacks_run_as_tracked_tasks():
+    async def main():
+        scheduler, done = Scheduler(), []
+
+        async def slow(tag):
+            await asyncio.sleep(0.02)
+            done.append(tag)
+
+        scheduler.call_later(0, slow, "slow")
+        scheduler.call_later(0.005, done.append, "quick")
+        await asyncio.sleep(0.01)
+        running = scheduler.stats()["running"]
+        await asyncio.sleep(0.03)
+        return scheduler, done, running
+
+    scheduler, done, running = asyncio.run(main())
+    # a slow callback does not hold up the next deadline
+    assert done == ["quick", "slow"]
+    assert running == 1 and scheduler.stats()["running"] == 0
+
+
+def test_failing_callback_does_not_stop_the_heap():
+    async def main():
+        scheduler, fired = Scheduler(), []
+        scheduler.call_later(0, lambda: 1 / 0)
+        scheduler.call_later(0.001, fired.append, "after")
+        await asyncio.sleep(0.02)
+        return fired
+
+    assert asyncio.run(main()) == ["after"]
+
+
+def test_mass_cancel_compacts_the_heap():
+    async def main():
+        scheduler = Scheduler()
+        timers = [scheduler.call_later(60 + i, print) for i in range(200)]
+        for t in timers[:150]:
+            t.cancel()
+        return scheduler
+
+    scheduler = asyncio.run(main())
+    assert scheduler.live == 50
+    assert len(scheduler._heap) < 200
+
+
+def test_sessions_expire_from_timers_and_slide_on_use():
+    from security.session_manager import SessionManager
+
+    async def main():
+        sessions = SessionManager(scheduler=Scheduler())
+        sessions.session_timeout = 0.05
+        idle = sessions.create_session("idle")
+        busy = sessions.create_session("busy")
+        for _ in range(4):
+            await asyncio.sleep(0.02)
+            assert sessions.validate_session(busy) == "busy"
+        return sessions, idle, busy
+
+    sessions, idle, busy = asyncio.run(main())
+    assert idle not in sessions.sessions
+    assert busy in sessions.sessions and len(sessions._timers) == 1
+
+
+def test_sessions_expire_without_a_scheduler(monkeypatch):
+    import security.session_manager as session_module
+    from security.session_manager import SessionManager
+
+    clock = [1000.0]
+    monkeypatch.setattr(session_module.time, "time", lambda: clock[0])
+    sessions = SessionManager()
+    sessions.session_timeout = 60
+    idle = sessions.create_session("idle")
+    busy = sessions.create_session("busy")
+    clock[0] += 40
+    assert sessions.validate_session(busy) == "busy"
+    clock[0] += 40  # idle is past its timeout, busy is not
+    assert idle in sessions.sessions  # nothing swept within one timeout
+    sessions.create_session("new")
+    assert idle not in sessions.sessions and busy in sessions.sessions
+    assert sessions._timers == {}
@@ -0,0 +1,70 @@
+# tests/test_song_catalogue.py
+
+import sqlite3
+
+from database.song_catalogue import SongCatalogue
+from database.song_database import SongDatabase
+
+
+def _song(name, artist="Artist A", album="Album"):
+    return {
+        "song_name": name, "artist_name": artist, "album_name": album,
+        "album_cover_image": None, "album_type": "album", "release_date": "2020",
+        "spotify_url": None, "spectrograms": "[]",
+    }
+
+
+def test_lookups(tmp_path):
+    db = SongDatabase(str(tmp_path / "songs.db"))
+    db.upsert_songs([_song("one"), _song("two", artist="Artist A, Artist B")])
+    catalogue = SongCatalogue(db)
+
+    assert len(catalogue) == 2 and "one" in catalogue
+    two = catalogue.get_song_by_name("two")
+    assert catalogue.get_song_by_id(two.id)["song_name"] == "two"
+    assert catalogue.get_song_ids_by_artist("Artist B") == [two.id]
+    assert len(catalogue.get_song_ids_by_artist("Artist A")) == 2
+
+
+def test_songs_written_in_process_reload_it_right_away(tmp_path):
+    path = str(tmp_path / "songs.db")
+    catalogue = SongCatalogue(SongDatabase(path))
+    other = SongCatalogue(SongDatabase(str(tmp_path / "other.db")))
+
+    writer = SongDatabase(path)
+    writer.add_song(_song("new"))
+    assert "new" in catalogue and "new" not in other
+
+    writer.upsert_songs([_song("new", album="Remaster")])
+    assert catalogue.get_song_by_name("new").album_name == "Remaster"
+    assert catalogue.refresh() is False
+
+
+def test_refresh_picks_up_writes_from_another_process(tmp_path):
+    path = str(tmp_path / "songs.db")
+    catalogue = SongCatalogue(SongDatabase(path))
+    assert catalogue.refresh() is False
+
+    # a bare connection stands in for the setup worker's process
+    conn = sqlite3.connect(path)
+    with conn:
+        conn.execute("INSERT INTO songs (song_name, artist_name, album_type, spectrograms) "
+                     "VALUES ('new', 'Artist A', 'album', '[]')")
+    assert "new" not in catalogue
+    assert catalogue.refresh() is True
+    assert "new" in catalogue
+
+    with conn:
+        conn.execute("UPDATE songs SET album_name = 'Remaster' WHERE song_name = 'new'")
+    conn.close()
+    assert catalogue.refresh() is True
+    assert catalogue.get_song_by_name("new").album_name == "Remaster"
+    assert catalogue.refresh() is False
+
+
+def test_history_writes_do_not_trigger_reload(tmp_path):
+    db = SongDatabase(str(tmp_path / "songs.db"))
+    song_id = db.add_song(_song("one"))
+    catalogue = SongCatalogue(db)
+    db.add_history_batch([("alice", song_id, None)])
+    assert catalogue.refresh() is False
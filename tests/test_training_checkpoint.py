@@ -0,0 +1,103 @@
+# tests/test_training_checkpoint.py
+
+import os
+
+import pytest
+import torch
+from torch.utils.data import Dataset
+
+import model.model as model_module
+from model.model import ResumableSampler, SongCNN, atomic_save, train
+
+
+class TinyDataset(Dataset):
+    def __init__(self, count=12, num_classes=3):
+        g = torch.Generator().manual_seed(0)
+        self.items = torch.randn(count, 1, 16, 16, generator=g)
+        self.labels = [i % num_classes for i in range(count)]
+        self.holdout_every = 0
+        self.labels_to_songs = {i: f"Song {i}" for i in range(num_classes)}
+        self.songs_to_labels = {v: k for k, v in self.labels_to_songs.items()}
+
+    def __len__(self):
+        return len(self.labels)
+
+    def __getitem__(self, idx):
+        return self.items[idx], self.labels[idx]
+
+
+class Interrupted(Exception):
+    pass
+
+
+def _tiny_model():
+    torch.manual_seed(0)
+    return SongCNN(3, channels=(2, 2, 2, 2), hidden=(4,))
+
+
+def test_sampler_resumes_at_the_saved_position():
+    sampler = ResumableSampler(range(10), seed=3)
+    sampler.set_epoch(2)
+    full = list(sampler)
+    assert sorted(full) == list(range(10))
+
+    resumed = ResumableSampler(range(10), seed=sampler.state_dict()["seed"])
+    resumed.set_epoch(2, start_index=4)
+    assert list(resumed) == full[4:] and len(resumed) == 6
+    # each epoch has its own order
+    sampler.set_epoch(3)
+    assert list(sampler) != full
+
+
+def test_atomic_save_leaves_no_partial_file(tmp_path, monkeypatch):
+    path = str(tmp_path / "ckpt" / "run.pt")
+    atomic_save({"step": 1}, path)
+    assert torch.load(path)["step"] == 1
+    assert os.listdir(tmp_path / "ckpt") == ["run.pt"]
+
+    def crash(obj, f):
+        f.write(b"half a checkpoint")
+        raise OSError("disk full")
+
+    monkeypatch.setattr(model_module.torch, "save", crash)
+    with pytest.raises(OSError):
+        atomic_save({"step": 2}, path)
+    # the last good checkpoint is untouched
+    monkeypatch.undo()
+    assert torch.load(path)["step"] == 1
+
+
+def test_interrupted_run_resumes_to_the_same_weights(tmp_path, monkeypatch):
+    dataset = TinyDataset()
+    kwargs = dict(batch_size=4, epochs=2, lr=1e-2, checkpoint_every=1)
+
+    reference = _tiny_model()
+    train(reference, dataset, str(tmp_path / "reference.pt"),
+          checkpoint_path=str(tmp_path / "reference_checkpoint.pt"), **kwargs)
+
+    # stop right after the mid-epoch checkpoint at epoch 2, step 1
+    real_save = model_module.save_training_checkpoint
+    saves = []
+
+    def save_then_stop(*args):
+        real_save(*args)
+        saves.append(args[7:9])
+        if args[7:9] == (1, 1):
+            raise Interrupted()
+
+    checkpoint_path = str(tmp_path / "train_checkpoint.pt")
+    monkeypatch.setattr(model_module, "save_training_checkpoint", save_then_stop)
+    with pytest.raises(Interrupted):
+        train(_tiny_model(), dataset, str(tmp_path / "resumed.pt"),
+              checkpoint_path=checkpoint_path, **kwargs)
+    monkeypatch.undo()
+
+    checkpoint = torch.load(checkpoint_path, weights_only=False)
+    assert (checkpoint["epoch"], checkpoint["step"]) == (1, 1)
+    torch.manual_seed(123)  # whatever the process did since, resume restores it
+    resumed = SongCNN(3, channels=(2, 2, 2, 2), hidden=(4,))
+    train(resumed, dataset, str(tmp_path / "resumed.pt"),
+          checkpoint_path=checkpoint_path, resume_from=checkpoint, **kwargs)
+
+    for name, value in reference.state_dict().items():
+        assert torch.allclose(value.float(), resumed.state_dict()[name].float()), name
@@ -0,0 +1,45 @@
+# tests/test_warmup.py
+
+import asyncio
+from types import SimpleNamespace
+
+from server.warmup import ModelWarmup
+
+
+def _run(warmup):
+    async def main():
+        await warmup.start()
+    asyncio.run(main())
+
+
+def _fake_predictor():
+    return SimpleNamespace(
+        get_model_pool=lambda: "pool",
+        predict_spectrograms=lambda x, pool=None: None,
+        predict_from_bytes=lambda audio, fmt="wav": {"song_name": "x", "fmt": fmt},
+    )
+
+
+def test_ready_after_successful_load(monkeypatch):
+    monkeypatch.setattr(ModelWarmup, "_import_ml", staticmethod(lambda: None))
+    monkeypatch.setattr(ModelWarmup, "_import_predictor", staticmethod(_fake_predictor))
+    warmup = ModelWarmup()
+    _run(warmup)
+
+    assert warmup.ready and not warmup.failed
+    assert warmup.predict_from_bytes(b"", fmt="m4a")["fmt"] == "m4a"
+    status = warmup.status()
+    assert status["ready"] is True and status["error"] is None
+    assert {"load_models", "first_inference", "total"} <= set(status["phases_ms"])
+
+
+def test_failed_load_is_reported(monkeypatch):
+    def broken():
+        raise RuntimeError("no model file")
+    monkeypatch.setattr(ModelWarmup, "_import_ml", staticmethod(lambda: None))
+    monkeypatch.setattr(ModelWarmup, "_import_predictor", staticmethod(broken))
+    warmup = ModelWarmup()
+    _run(warmup)
+
+    assert warmup.failed and not warmup.ready
+    assert "no model file" in warmup.status()["error"]